@@ -1,21 +1,103 @@
 """Generic Fan Coil Thermostat with Fan Speed Control."""
 
 import logging
-from homeassistant.config_entries import ConfigEntry
+
+import voluptuous as vol
+
+from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
+from homeassistant.const import CONF_NAME
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN, PLATFORMS
+from .const import (
+    CONF_COOLING_SWITCHES,
+    CONF_CURRENT_TEMPERATURE_ENTITY_ID,
+    CONF_FAN_ENTITY_ID,
+    CONF_HEATING_SWITCHES,
+    CONF_MAX_TEMP,
+    CONF_MIN_TEMP,
+    CONF_SCHEDULE,
+    CONF_TARGET_TEMP,
+    CONF_TEMP_STEP,
+    CONF_TEMPERATURE_SENSORS,
+    CONF_ZONES,
+    DATA_THERMOSTATS,
+    DOMAIN,
+    OPTION_DEFAULTS,
+    PLATFORMS,
+)
+from .schedule import SCHEDULE_SCHEMA
 
 _LOGGER = logging.getLogger(__name__)
 
-# This integration is only configurable via config flow
-CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+def _unique_fans(zones):
+    """Reject a zone list that uses the same fan twice."""
+    fans = [zone[CONF_FAN_ENTITY_ID] for zone in zones]
+    if len(fans) != len(set(fans)):
+        raise vol.Invalid("each zone needs its own fan")
+    return zones
+
+
+ZONE_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): cv.string,
+        vol.Required(CONF_CURRENT_TEMPERATURE_ENTITY_ID): cv.entity_id,
+        vol.Optional(CONF_TEMPERATURE_SENSORS, default=[]): cv.entity_ids,
+        vol.Required(CONF_FAN_ENTITY_ID): cv.entity_id,
+        vol.Optional(CONF_COOLING_SWITCHES, default=[]): cv.entity_ids,
+        vol.Optional(CONF_HEATING_SWITCHES, default=[]): cv.entity_ids,
+        vol.Optional(CONF_MIN_TEMP): vol.Coerce(float),
+        vol.Optional(CONF_MAX_TEMP): vol.Coerce(float),
+        vol.Optional(CONF_TARGET_TEMP): vol.Coerce(float),
+        vol.Optional(CONF_TEMP_STEP): vol.Coerce(float),
+        vol.Optional(CONF_SCHEDULE): SCHEDULE_SCHEMA,
+    }
+)
+
+# Single zones are set up in the UI; a fleet of zones can be listed in YAML
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Required(CONF_ZONES): vol.All(
+                    cv.ensure_list, [ZONE_SCHEMA], _unique_fans
+                )
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+def zone_configs(data):
+    """Return the configuration of each zone of an entry's merged data.
+
+    A fleet entry's settings and options are shared by its zones, with the
+    settings given for a zone taking precedence.
+    """
+    if CONF_ZONES not in data:
+        return [data]
+
+    shared = {
+        key: value
+        for key, value in data.items()
+        if key not in (CONF_ZONES, DATA_THERMOSTATS)
+    }
+    return [{**shared, **zone} for zone in data[CONF_ZONES]]
 
 
 async def async_setup(hass: HomeAssistant, config):
     """Set up the Generic Fan Coil component."""
     hass.data.setdefault(DOMAIN, {})
+
+    if DOMAIN in config:
+        # Create or update the fleet entry holding the YAML zones
+        hass.async_create_task(
+            hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": SOURCE_IMPORT}, data=config[DOMAIN]
+            )
+        )
     return True
 
 
@@ -31,7 +113,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     hass.data[DOMAIN][entry.entry_id] = data
 
     # Set up platforms
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    for platform in PLATFORMS:
+        await hass.config_entries.async_forward_entry_setups(entry, [platform])
 
     # Set up options update listener
     entry.async_on_unload(entry.add_update_listener(async_update_options))
@@ -40,8 +123,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
 
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry):
-    """Update options."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Update options, in place when the running thermostats allow it."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    options = {**entry.data, **entry.options}
+    changed = {
+        key
+        for key, value in options.items()
+        if data.get(key, OPTION_DEFAULTS.get(key)) != value
+    }
+    if not changed:
+        return
+
+    thermostats = data.get(DATA_THERMOSTATS)
+    configs = zone_configs(options)
+    if not thermostats or any(
+        thermostat.options_need_reload(changed, config)
+        for thermostat, config in zip(thermostats, configs)
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    _LOGGER.debug("Applying %s without reloading", sorted(changed))
+    data.update(options)
+    for thermostat, config in zip(thermostats, configs):
+        thermostat.async_apply_options(config)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
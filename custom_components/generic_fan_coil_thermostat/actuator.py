@@ -0,0 +1,313 @@
+"""Serialized actuator command queue for Generic Fan Coil Thermostat."""
+
+import asyncio
+import logging
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    BREAKER_BASE_BACKOFF,
+    BREAKER_MAX_BACKOFF,
+    DATA_BATCHER,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class ActuatorQueue:
+    """Run actuator commands for one thermostat, one at a time per key.
+
+    Each command is submitted under a key (the fan, a switch group). Commands
+    for the same key run in order, while different keys run concurrently, so
+    a fan speed change and a switch group change go out at the same time.
+    Only one pending command is kept per key: a newer target replaces the
+    stale one, and a target that returns to the last applied value drops the
+    pending command altogether, so an ON/OFF flip-flop inside the queue
+    window sends nothing.
+    """
+
+    def __init__(self, hass: HomeAssistant, name, on_idle=None):
+        """Initialize the queue."""
+        self.hass = hass
+        self._name = name
+        self._on_idle = on_idle
+        self._pending = {}
+        self._applied = {}
+        self._in_flight = {}
+        self._workers = {}
+        self.superseded = 0
+
+    @property
+    def depth(self):
+        """Return the number of commands waiting to run."""
+        return len(self._pending)
+
+    @property
+    def pending_tasks(self):
+        """Return the number of commands waiting or running."""
+        return len(self._pending) + len(self._in_flight)
+
+    def is_busy(self, key):
+        """Return True if a command for key is waiting or running."""
+        return key in self._pending or key in self._in_flight
+
+    @callback
+    def async_submit(self, key, target, action):
+        """Queue action(target) for key, replacing any stale pending command."""
+        if key in self._pending:
+            del self._pending[key]
+            self.superseded += 1
+            if self._baseline(key) == target:
+                # The pending command would have been undone by this one
+                _LOGGER.debug("%s: %s back to %s, dropping", self._name, key, target)
+                return
+
+        self._pending[key] = (target, action)
+
+        if key not in self._workers:
+            # Start on the next loop iteration so commands submitted by the
+            # same control run are queued (and coalesced) before any is sent
+            self._workers[key] = self.hass.async_create_task(
+                self._async_run(key),
+                f"{self._name} {key} actuator queue",
+                eager_start=False,
+            )
+
+    def _baseline(self, key):
+        """Return the target key will be at once the running command finishes."""
+        if key in self._in_flight:
+            return self._in_flight[key]
+        return self._applied.get(key, _UNSET)
+
+    async def async_wait(self):
+        """Wait until all queued commands have run."""
+        while self._workers:
+            await asyncio.shield(asyncio.gather(*self._workers.values()))
+
+    @callback
+    def async_shutdown(self):
+        """Drop pending commands and stop the workers."""
+        self._pending.clear()
+        workers, self._workers = self._workers, {}
+        for worker in workers.values():
+            worker.cancel()
+
+    async def _async_run(self, key):
+        """Run the pending commands for key in submission order."""
+        try:
+            while key in self._pending:
+                target, action = self._pending.pop(key)
+                self._in_flight[key] = target
+                try:
+                    await action(target)
+                    self._applied[key] = target
+                except Exception as ex:
+                    self._applied.pop(key, None)
+                    _LOGGER.error(
+                        "%s: error applying %s to %s: %s", self._name, target, key, ex
+                    )
+                finally:
+                    self._in_flight.pop(key, None)
+        finally:
+            if self._workers.get(key) is asyncio.current_task():
+                del self._workers[key]
+
+        if not self._workers and self._on_idle is not None:
+            self._on_idle()
+
+
+class CircuitBreaker:
+    """Skip entities that keep failing until their retry window comes round.
+
+    Every failure doubles the time before the entity is tried again, from
+    the base backoff up to the maximum. One success closes the circuit.
+    """
+
+    def __init__(self, base=BREAKER_BASE_BACKOFF, maximum=BREAKER_MAX_BACKOFF):
+        """Initialize the breaker."""
+        self._base = base
+        self._maximum = maximum
+        self._open = {}
+
+    def allows(self, entity_id, now):
+        """Return True if entity_id may be called at now."""
+        circuit = self._open.get(entity_id)
+        return circuit is None or now >= circuit[1]
+
+    def record_success(self, entity_id):
+        """Close the circuit for entity_id."""
+        self._open.pop(entity_id, None)
+
+    def record_failure(self, entity_id, now):
+        """Open (or re-open) the circuit for entity_id and return its backoff."""
+        failures = self._open.get(entity_id, (0, None))[0] + 1
+        backoff = min(self._base * 2 ** (failures - 1), self._maximum)
+        self._open[entity_id] = (failures, now + backoff)
+        return backoff
+
+    @property
+    def tripped(self):
+        """Return the entities whose circuit is open."""
+        return sorted(self._open)
+
+    def as_dict(self):
+        """Return the open circuits as plain data."""
+        return {
+            entity_id: {"failures": failures, "retry_at": retry_at.isoformat()}
+            for entity_id, (failures, retry_at) in sorted(self._open.items())
+        }
+
+
+class ReadbackTracker:
+    """Compare what each actuator reports with the target it was sent.
+
+    After a command, an entity is converging until its readback first
+    matches the target; the time that took is kept. Once converged, a
+    readback that leaves the target counts as one drift, and the entity
+    stays drifted until it matches again or is sent a new target.
+    """
+
+    def __init__(self):
+        """Initialize the tracker."""
+        self._targets = {}
+        self._drifted = set()
+        self.drift_events = 0
+        self.convergence_time = None
+
+    def target(self, entity_id):
+        """Return the target last sent to entity_id, None if there is none."""
+        entry = self._targets.get(entity_id)
+        return entry[0] if entry is not None else None
+
+    def command(self, entity_id, target, now):
+        """Record that target was sent to entity_id at now."""
+        self._targets[entity_id] = [target, now]
+        self._drifted.discard(entity_id)
+
+    def assume(self, entity_id, target):
+        """Record that entity_id is already at target."""
+        self._targets[entity_id] = [target, None]
+        self._drifted.discard(entity_id)
+
+    def observe(self, entity_id, matches, now):
+        """Record a readback and return True if entity_id just drifted."""
+        entry = self._targets.get(entity_id)
+        if entry is None:
+            return False
+
+        commanded_at = entry[1]
+        if matches:
+            self._drifted.discard(entity_id)
+            if commanded_at is not None:
+                self.convergence_time = (now - commanded_at).total_seconds()
+                entry[1] = None
+            return False
+
+        if commanded_at is not None or entity_id in self._drifted:
+            # Still converging, or already counted
+            return False
+
+        self._drifted.add(entity_id)
+        self.drift_events += 1
+        return True
+
+    def forget(self, entity_id):
+        """Stop tracking entity_id."""
+        self._targets.pop(entity_id, None)
+        self._drifted.discard(entity_id)
+
+    @property
+    def drifted(self):
+        """Return the entities whose readback has left their target."""
+        return sorted(self._drifted)
+
+
+@callback
+def async_get_batcher(hass: HomeAssistant):
+    """Return the service call batcher shared by all thermostats."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_BATCHER not in domain_data:
+        domain_data[DATA_BATCHER] = ServiceCallBatcher(hass)
+    return domain_data[DATA_BATCHER]
+
+
+class ServiceCallBatcher:
+    """Merge identical service calls from many thermostats into one.
+
+    Calls that arrive within the batching window and share a domain, service
+    and parameters are sent as a single call targeting all of their entities.
+    If a merged call fails, each caller's call is retried on its own so one
+    bad entity does not fail the others.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the batcher."""
+        self.hass = hass
+        self._pending = {}
+        self._flush_handle = None
+        self.merged_calls = 0
+
+    async def async_call(self, domain, service, entity_ids, data, window):
+        """Call a service for entity_ids, merged with matching calls in window."""
+        key = (domain, service, tuple(sorted(data.items())))
+        future = self.hass.loop.create_future()
+        self._pending.setdefault(key, []).append((list(entity_ids), future))
+
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(window, self._async_flush)
+
+        await future
+
+    @callback
+    def _async_flush(self):
+        """Send every pending batch."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for (domain, service, data), callers in pending.items():
+            self.merged_calls += len(callers) - 1
+            self.hass.async_create_task(
+                self._async_send(domain, service, dict(data), callers),
+                f"{DOMAIN} batched {domain}.{service}",
+            )
+
+    async def _async_send(self, domain, service, data, callers):
+        """Send one merged call, falling back to per-caller calls on failure."""
+        entity_ids = []
+        for caller_entity_ids, _future in callers:
+            entity_ids.extend(e for e in caller_entity_ids if e not in entity_ids)
+
+        try:
+            await self.hass.services.async_call(
+                domain, service, {**data, ATTR_ENTITY_ID: entity_ids}, blocking=True
+            )
+        except Exception as ex:
+            if len(callers) == 1:
+                _set_future(callers[0][1], ex)
+                return
+            _LOGGER.debug(
+                "Batched %s.%s failed (%s), retrying per caller", domain, service, ex
+            )
+            await asyncio.gather(
+                *(
+                    self._async_send(domain, service, data, [caller])
+                    for caller in callers
+                )
+            )
+            return
+
+        for _caller_entity_ids, future in callers:
+            _set_future(future, None)
+
+
+def _set_future(future, result):
+    """Resolve future with result, or fail it if result is an exception."""
+    if future.done():
+        return
+    if isinstance(result, Exception):
+        future.set_exception(result)
+    else:
+        future.set_result(result)
@@ -0,0 +1,72 @@
+"""Incremental aggregation of several temperature sensors."""
+
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from .const import AGGREGATE_MAX, AGGREGATE_MEAN, AGGREGATE_MIN
+
+
+class SensorAggregate:
+    """Combine the latest reading of each sensor into one temperature.
+
+    Each report replaces that sensor's reading in a running sum and a
+    sorted list, so the mean, min, max and median are updated without
+    re-reading the other sensors. Readings are kept in report order, so
+    sensors that stopped reporting are dropped from the front.
+    """
+
+    def __init__(self, mode, stale_after=None):
+        """Initialize the aggregate; stale_after is a timedelta or None."""
+        self.mode = mode
+        self.stale_after = stale_after
+        self._readings = OrderedDict()
+        self._sorted = []
+        self._sum = 0.0
+
+    def __len__(self):
+        """Return the number of sensors with a current reading."""
+        return len(self._readings)
+
+    def update(self, entity_id, value, now):
+        """Store a sensor's reading, drop stale ones and return the aggregate."""
+        self._remove(entity_id)
+        self._readings[entity_id] = (value, now)
+        insort(self._sorted, value)
+        self._sum += value
+        return self.expire(now)
+
+    def expire(self, now):
+        """Drop readings older than the staleness timeout and return the aggregate."""
+        if self.stale_after is not None:
+            while self._readings:
+                entity_id, (_value, reported) = next(iter(self._readings.items()))
+                if now - reported <= self.stale_after:
+                    break
+                self._remove(entity_id)
+        return self.value
+
+    def _remove(self, entity_id):
+        """Remove a sensor's reading if it has one."""
+        reading = self._readings.pop(entity_id, None)
+        if reading is None:
+            return
+        value = reading[0]
+        del self._sorted[bisect_left(self._sorted, value)]
+        self._sum -= value
+
+    @property
+    def value(self):
+        """Return the aggregate temperature, or None without readings."""
+        if not self._sorted:
+            return None
+        if self.mode == AGGREGATE_MEAN:
+            return self._sum / len(self._sorted)
+        if self.mode == AGGREGATE_MIN:
+            return self._sorted[0]
+        if self.mode == AGGREGATE_MAX:
+            return self._sorted[-1]
+
+        middle = len(self._sorted) // 2
+        if len(self._sorted) % 2:
+            return self._sorted[middle]
+        return (self._sorted[middle - 1] + self._sorted[middle]) / 2
@@ -1,5 +1,8 @@
 """Climate platform for Generic Fan Coil Thermostat integration."""
 
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
 import logging
 
 
@@ -9,44 +12,147 @@ from homeassistant.components.climate.const import (
     HVACAction,
     HVACMode,
 )
+from homeassistant.components.fan import ATTR_PERCENTAGE
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     ATTR_TEMPERATURE,
+    CONF_NAME,
     STATE_OFF,
+    STATE_ON,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfTemperature,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_time,
+    async_track_time_interval,
+)
+from homeassistant.helpers.restore_state import RestoredExtraData, RestoreEntity
+from homeassistant.helpers.start import async_at_started
+from homeassistant.util import dt as dt_util
 
+from . import zone_configs
+from .actuator import (
+    ActuatorQueue,
+    CircuitBreaker,
+    ReadbackTracker,
+    async_get_batcher,
+)
+from .aggregate import SensorAggregate
 from .const import (
+    ACTUATOR_FAN,
+    ATTR_COMMAND_QUEUE_DEPTH,
+    ATTR_CONTROL_OUTPUT,
+    ATTR_CONVERGENCE_TIME,
+    ATTR_DRIFT_EVENTS,
+    ATTR_DRIFTED_ACTUATORS,
+    ATTR_PENDING_COMMANDS,
+    ATTR_RAW_TEMPERATURE,
+    ATTR_SKIPPED_COMMANDS,
+    ATTR_SUPERSEDED_COMMANDS,
+    ATTR_TRIPPED_SWITCHES,
+    CONF_BAND_THRESHOLDS,
+    CONF_BATCH_WINDOW,
+    CONF_CONTROL_MODE,
     CONF_CURRENT_TEMPERATURE_ENTITY_ID,
+    CONF_DEBOUNCE_INTERVAL,
+    CONF_DEBOUNCE_MODE,
     CONF_FAN_ENTITY_ID,
+    CONF_FILTER_ALPHA,
+    CONF_FILTER_WINDOW,
+    CONF_FLEET_ENGINE,
     CONF_COOLING_SWITCHES,
     CONF_HEATING_SWITCHES,
+    CONF_HYSTERESIS,
     CONF_MAX_TEMP,
+    CONF_MIN_OFF_TIME,
+    CONF_MIN_ON_TIME,
     CONF_MIN_TEMP,
+    CONF_PID_KD,
+    CONF_PID_KI,
+    CONF_PID_KP,
+    CONF_PID_SAMPLE_INTERVAL,
+    CONF_RESYNC_INTERVAL,
+    CONF_SCHEDULE,
+    CONF_SENSOR_AGGREGATION,
+    CONF_SENSOR_STALE_TIMEOUT,
+    CONF_SPEED_PERCENTAGES,
     CONF_TARGET_TEMP,
+    CONF_TEMP_FILTER,
     CONF_TEMP_STEP,
+    CONF_TEMPERATURE_SENSORS,
+    CONF_ZONES,
+    CONTROL_PID,
+    COUNTER_ATTRIBUTES,
+    DATA_THERMOSTATS,
+    DEBOUNCE_LEADING,
+    DECISION_TRACE_SIZE,
+    DEBOUNCE_OFF,
+    DEFAULT_BAND_THRESHOLDS,
+    DEFAULT_BATCH_WINDOW,
+    DEFAULT_CONTROL_MODE,
+    DEFAULT_DEBOUNCE_INTERVAL,
+    DEFAULT_DEBOUNCE_MODE,
+    DEFAULT_FILTER_ALPHA,
+    DEFAULT_FILTER_WINDOW,
+    DEFAULT_FLEET_ENGINE,
+    DEFAULT_HYSTERESIS,
+    DEFAULT_MIN_OFF_TIME,
+    DEFAULT_MIN_ON_TIME,
     DEFAULT_MAX_TEMP,
     DEFAULT_MIN_TEMP,
+    DEFAULT_PID_KD,
+    DEFAULT_PID_KI,
+    DEFAULT_PID_KP,
+    DEFAULT_PID_SAMPLE_INTERVAL,
+    DEFAULT_RESYNC_INTERVAL,
+    DEFAULT_SENSOR_AGGREGATION,
+    DEFAULT_SENSOR_STALE_TIMEOUT,
+    DEFAULT_SPEED_PERCENTAGES,
     DEFAULT_TARGET_TEMP,
+    DEFAULT_TEMP_FILTER,
     DEFAULT_TEMP_STEP,
     DOMAIN,
-    FAN_HIGH,
-    FAN_LOW,
+    FALLBACK_CONCURRENCY,
     FAN_OFF,
-    FAN_MED,
-    THRESHOLD_HIGH,
-    THRESHOLD_LOW,
-    THRESHOLD_MEDIUM,
+    PID_DERIVATIVE_ALPHA,
+    SERVICE_CALL_TIMEOUT,
+    UNRECORDED_ATTRIBUTES,
 )
+from .control import BandStateMachine, DwellTimer, PidController, SpeedTable
+from .coordinator import async_get_coordinator, parse_temperature
+from .decisions import DecisionTrace
+from .engine import async_get_engine, numpy_available
+from .filters import create_filter
+from .runtime import RuntimeMeter
+from .schedule import SetpointSchedule
+from .scheduling import async_get_stagger, phase_offset, seconds_until_slot
 
 _LOGGER = logging.getLogger(__name__)
 
+# Options a running thermostat picks up without reloading its config entry
+LIVE_OPTIONS = frozenset(
+    {
+        CONF_MIN_TEMP,
+        CONF_MAX_TEMP,
+        CONF_TARGET_TEMP,
+        CONF_TEMP_STEP,
+        CONF_COOLING_SWITCHES,
+        CONF_HEATING_SWITCHES,
+        CONF_HYSTERESIS,
+        CONF_MIN_ON_TIME,
+        CONF_MIN_OFF_TIME,
+        CONF_BAND_THRESHOLDS,
+        CONF_SPEED_PERCENTAGES,
+        CONF_RESYNC_INTERVAL,
+        CONF_SCHEDULE,
+    }
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -56,30 +162,92 @@ async def async_setup_entry(
     """Set up the Generic Fan Coil Thermostat climate platform."""
     data = hass.data[DOMAIN][config_entry.entry_id]
 
-    async_add_entities(
-        [
-            GenericFanCoilThermostat(
+    if CONF_ZONES in data:
+        # Zones are keyed by their sensor and fan, like single-zone entries
+        thermostats = [
+            _create_thermostat(
                 hass,
-                config_entry.entry_id,
-                data.get(CONF_CURRENT_TEMPERATURE_ENTITY_ID),
-                data.get(CONF_FAN_ENTITY_ID),
-                data.get(CONF_COOLING_SWITCHES, []),
-                data.get(CONF_HEATING_SWITCHES, []),
-                data.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP),
-                data.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP),
-                data.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP),
-                data.get(CONF_TEMP_STEP, DEFAULT_TEMP_STEP),
+                f"{config[CONF_CURRENT_TEMPERATURE_ENTITY_ID]}_"
+                f"{config[CONF_FAN_ENTITY_ID]}",
+                config,
             )
+            for config in zone_configs(data)
         ]
+    else:
+        thermostats = [_create_thermostat(hass, config_entry.entry_id, data)]
+    data[DATA_THERMOSTATS] = thermostats
+    async_add_entities(thermostats)
+
+
+def _create_thermostat(hass, unique_id, data):
+    """Create the thermostat for one zone's configuration."""
+    return GenericFanCoilThermostat(
+        hass,
+        unique_id,
+        data.get(CONF_CURRENT_TEMPERATURE_ENTITY_ID),
+        data.get(CONF_FAN_ENTITY_ID),
+        data.get(CONF_COOLING_SWITCHES, []),
+        data.get(CONF_HEATING_SWITCHES, []),
+        data.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP),
+        data.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP),
+        data.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP),
+        data.get(CONF_TEMP_STEP, DEFAULT_TEMP_STEP),
+        debounce_mode=data.get(CONF_DEBOUNCE_MODE, DEFAULT_DEBOUNCE_MODE),
+        debounce_interval=data.get(CONF_DEBOUNCE_INTERVAL, DEFAULT_DEBOUNCE_INTERVAL),
+        batch_window=data.get(CONF_BATCH_WINDOW, DEFAULT_BATCH_WINDOW),
+        fleet_engine=data.get(CONF_FLEET_ENGINE, DEFAULT_FLEET_ENGINE),
+        hysteresis=data.get(CONF_HYSTERESIS, DEFAULT_HYSTERESIS),
+        min_on_time=data.get(CONF_MIN_ON_TIME, DEFAULT_MIN_ON_TIME),
+        min_off_time=data.get(CONF_MIN_OFF_TIME, DEFAULT_MIN_OFF_TIME),
+        speed_table=SpeedTable(
+            data.get(CONF_BAND_THRESHOLDS, DEFAULT_BAND_THRESHOLDS),
+            data.get(CONF_SPEED_PERCENTAGES, DEFAULT_SPEED_PERCENTAGES),
+        ),
+        temperature_filter=data.get(CONF_TEMP_FILTER, DEFAULT_TEMP_FILTER),
+        filter_alpha=data.get(CONF_FILTER_ALPHA, DEFAULT_FILTER_ALPHA),
+        filter_window=data.get(CONF_FILTER_WINDOW, DEFAULT_FILTER_WINDOW),
+        temperature_sensors=data.get(CONF_TEMPERATURE_SENSORS, []),
+        sensor_aggregation=data.get(
+            CONF_SENSOR_AGGREGATION, DEFAULT_SENSOR_AGGREGATION
+        ),
+        sensor_stale_timeout=data.get(
+            CONF_SENSOR_STALE_TIMEOUT, DEFAULT_SENSOR_STALE_TIMEOUT
+        ),
+        control_mode=data.get(CONF_CONTROL_MODE, DEFAULT_CONTROL_MODE),
+        pid_gains=(
+            data.get(CONF_PID_KP, DEFAULT_PID_KP),
+            data.get(CONF_PID_KI, DEFAULT_PID_KI),
+            data.get(CONF_PID_KD, DEFAULT_PID_KD),
+        ),
+        pid_sample_interval=data.get(
+            CONF_PID_SAMPLE_INTERVAL, DEFAULT_PID_SAMPLE_INTERVAL
+        ),
+        resync_interval=data.get(CONF_RESYNC_INTERVAL, DEFAULT_RESYNC_INTERVAL),
+        schedule=SetpointSchedule.from_config(data.get(CONF_SCHEDULE, {})),
+        name=data.get(CONF_NAME),
     )
 
 
+def _hvac_modes(cooling_switches, heating_switches):
+    """Return the HVAC modes available with the configured switches."""
+    hvac_modes = [HVACMode.OFF]
+    if cooling_switches:
+        hvac_modes.append(HVACMode.COOL)
+    if heating_switches:
+        hvac_modes.append(HVACMode.HEAT)
+    # If no switches configured, still allow both modes (fan-only operation)
+    if not cooling_switches and not heating_switches:
+        hvac_modes.extend([HVACMode.HEAT, HVACMode.COOL])
+    return hvac_modes
+
+
 class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
     """Representation of a Generic Fan Coil Thermostat."""
 
     _attr_has_entity_name = True
     _attr_name = "Generic Fan Coil Thermostat"
     _attr_icon = "mdi:thermostat"
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
     _attr_hvac_modes = [HVACMode.OFF, HVACMode.HEAT, HVACMode.COOL]
     _attr_supported_features = (
@@ -89,7 +257,6 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
         | ClimateEntityFeature.TURN_OFF
     )
     _enable_turn_on_off_backwards_compatibility = False
-    _attr_fan_modes = ["off", "low", "medium", "high", "auto"]
 
     def __init__(
         self,
@@ -103,33 +270,56 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
         max_temp,
         target_temp,
         temp_step,
+        debounce_mode=DEFAULT_DEBOUNCE_MODE,
+        debounce_interval=DEFAULT_DEBOUNCE_INTERVAL,
+        batch_window=DEFAULT_BATCH_WINDOW,
+        fleet_engine=DEFAULT_FLEET_ENGINE,
+        hysteresis=DEFAULT_HYSTERESIS,
+        min_on_time=DEFAULT_MIN_ON_TIME,
+        min_off_time=DEFAULT_MIN_OFF_TIME,
+        speed_table=None,
+        temperature_filter=DEFAULT_TEMP_FILTER,
+        filter_alpha=DEFAULT_FILTER_ALPHA,
+        filter_window=DEFAULT_FILTER_WINDOW,
+        temperature_sensors=None,
+        sensor_aggregation=DEFAULT_SENSOR_AGGREGATION,
+        sensor_stale_timeout=DEFAULT_SENSOR_STALE_TIMEOUT,
+        control_mode=DEFAULT_CONTROL_MODE,
+        pid_gains=(DEFAULT_PID_KP, DEFAULT_PID_KI, DEFAULT_PID_KD),
+        pid_sample_interval=DEFAULT_PID_SAMPLE_INTERVAL,
+        resync_interval=DEFAULT_RESYNC_INTERVAL,
+        schedule=None,
+        name=None,
     ):
         """Initialize the thermostat."""
         self.hass = hass
         self._attr_unique_id = unique_id
+        if name is not None:
+            self._attr_name = name
         self._current_temp_entity_id = current_temp_entity_id
+        self._temp_sensors = list(
+            dict.fromkeys([current_temp_entity_id, *(temperature_sensors or [])])
+        )
         self._fan_entity_id = fan_entity_id
         self._cooling_switches = cooling_switches or []
         self._heating_switches = heating_switches or []
 
-        # Determine available HVAC modes based on configured switches
-        hvac_modes = [HVACMode.OFF]
-        if self._cooling_switches:
-            hvac_modes.append(HVACMode.COOL)
-        if self._heating_switches:
-            hvac_modes.append(HVACMode.HEAT)
-        # If no switches configured, still allow both modes (fan-only operation)
-        if not self._cooling_switches and not self._heating_switches:
-            hvac_modes.extend([HVACMode.HEAT, HVACMode.COOL])
+        hvac_modes = _hvac_modes(self._cooling_switches, self._heating_switches)
         self._attr_hvac_modes = hvac_modes
 
-        _LOGGER.debug(
-            f"Initializing thermostat with cooling switches: {self._cooling_switches}"
+        # Fan speeds and the demand bands that select them
+        self._speeds = speed_table or SpeedTable(
+            DEFAULT_BAND_THRESHOLDS, DEFAULT_SPEED_PERCENTAGES
         )
+        self._attr_fan_modes = [*self._speeds.modes, "auto"]
+
         _LOGGER.debug(
-            f"Initializing thermostat with heating switches: {self._heating_switches}"
+            "Initializing thermostat with cooling switches: %s, heating switches: %s,"
+            " HVAC modes: %s",
+            self._cooling_switches,
+            self._heating_switches,
+            hvac_modes,
         )
-        _LOGGER.debug(f"Available HVAC modes: {hvac_modes}")
 
         self._attr_min_temp = min_temp
         self._attr_max_temp = max_temp
@@ -137,10 +327,214 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
         self._attr_target_temperature_step = temp_step
         self._attr_hvac_mode = HVACMode.OFF
         self._attr_current_temperature = None
+        self._raw_temperature = None
         self._attr_fan_mode = "auto"
         self._attr_hvac_action = HVACAction.OFF
         self._current_fan_mode = FAN_OFF
 
+        # Last commanded states, used to skip redundant service calls
+        self._commanded_fan_mode = None
+        self._commanded_switches = {}
+        self._skipped_commands = 0
+
+        # Seconds run per fan speed and switch group, from the commanded state
+        self._runtime = RuntimeMeter()
+
+        # Last target per actuator, re-asserted by the periodic resync
+        self._desired = {}
+        self._resync_interval = resync_interval
+        self._resync_offset = phase_offset(str(unique_id), resync_interval or 1)
+        self._unsub_resync = None
+
+        # Setpoint schedule, its next transition and the last one applied
+        self._schedule = schedule or SetpointSchedule()
+        self._unsub_schedule = None
+        self._schedule_applied = None
+
+        # The first control run waits for startup and valid inputs
+        self._awaiting_first_run = False
+        self._hass_started = False
+        self._unsub_first_run = None
+
+        # Last written state, and the write merging this loop iteration's updates
+        self._written_state = None
+        self._write_task = None
+
+        # Serialize fan and switch commands so they cannot finish out of order
+        self._actuators = ActuatorQueue(
+            hass, f"{DOMAIN}.{unique_id}", on_idle=self._async_actuators_idle
+        )
+
+        # What the fan and switches report, compared with what they were sent
+        self._readback = ReadbackTracker()
+        self._switch_listeners = {}
+
+        # Switches that keep failing are skipped until their retry window
+        self._breaker = CircuitBreaker()
+        self._fallback_slots = asyncio.Semaphore(FALLBACK_CONCURRENCY)
+
+        # Merge identical service calls across thermostats within the window
+        self._batch_window = batch_window / 1000
+        self._batcher = async_get_batcher(hass) if batch_window > 0 else None
+
+        # Optional periodic re-evaluation by the vectorized fleet engine
+        self._use_fleet_engine = fleet_engine
+        self._fleet = None
+        self._level = 0
+
+        # Band state machine with hysteresis, and minimum on/off times
+        self._bands = BandStateMachine(self._speeds.thresholds, hysteresis)
+        self._fan_dwell = DwellTimer(min_on_time, min_off_time)
+        self._switch_dwell = {
+            "cooling": DwellTimer(min_on_time, min_off_time),
+            "heating": DwellTimer(min_on_time, min_off_time),
+        }
+        self._unsub_dwell_recheck = None
+
+        # Optional PID control, evaluated on its own sample clock
+        self._pid = None
+        self._pid_interval = pid_sample_interval
+        if control_mode == CONTROL_PID:
+            self._pid = PidController(
+                *pid_gains, len(self._speeds), derivative_alpha=PID_DERIVATIVE_ALPHA
+            )
+
+        # Combine the zone's sensors as each one reports
+        self._stale_timeout = sensor_stale_timeout
+        self._sensors = SensorAggregate(
+            sensor_aggregation,
+            timedelta(seconds=sensor_stale_timeout) if sensor_stale_timeout else None,
+        )
+
+        # Optional smoothing of the sensor readings before they are used
+        self._temp_filter = create_filter(
+            temperature_filter, filter_alpha, int(filter_window)
+        )
+
+        # Recent control decisions, kept for diagnostics
+        self._decisions = DecisionTrace(DECISION_TRACE_SIZE)
+
+        # Coalesce bursts of temperature updates into one control evaluation
+        self._temp_debouncer = None
+        if debounce_mode != DEBOUNCE_OFF and debounce_interval > 0:
+            self._temp_debouncer = Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=debounce_interval,
+                immediate=debounce_mode == DEBOUNCE_LEADING,
+                function=self._async_evaluate_temperature,
+            )
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes of the thermostat."""
+        attributes = {
+            ATTR_SKIPPED_COMMANDS: self._skipped_commands,
+            ATTR_COMMAND_QUEUE_DEPTH: self._actuators.depth,
+            ATTR_PENDING_COMMANDS: self._actuators.pending_tasks,
+            ATTR_SUPERSEDED_COMMANDS: self._actuators.superseded,
+            ATTR_TRIPPED_SWITCHES: self._breaker.tripped,
+            ATTR_DRIFTED_ACTUATORS: self._readback.drifted,
+            ATTR_DRIFT_EVENTS: self._readback.drift_events,
+            ATTR_CONVERGENCE_TIME: self._readback.convergence_time,
+        }
+        if self._temp_filter is not None:
+            # current_temperature holds the filtered value
+            attributes[ATTR_RAW_TEMPERATURE] = self._raw_temperature
+        if self._pid is not None:
+            attributes[ATTR_CONTROL_OUTPUT] = round(self._pid.output, 2)
+        return attributes
+
+    @property
+    def circuit_breakers(self):
+        """Return the switches being skipped after failures."""
+        return self._breaker.as_dict()
+
+    @property
+    def decision_trace(self):
+        """Return the most recent control decisions, oldest first."""
+        return self._decisions.as_list()
+
+    @property
+    def runtime_keys(self):
+        """Return the fan speeds and switch groups whose runtime is counted."""
+        return [
+            *self._speeds.modes[1:],
+            *(
+                group
+                for group, switches in (
+                    ("cooling", self._cooling_switches),
+                    ("heating", self._heating_switches),
+                )
+                if switches
+            ),
+        ]
+
+    def runtime(self, key):
+        """Return the seconds the fan speed or switch group key has run."""
+        return self._runtime.total(key, dt_util.utcnow())
+
+    @property
+    def extra_restore_state_data(self):
+        """Return the controller state to carry across a restart."""
+        return RestoredExtraData(self._snapshot())
+
+    def _snapshot(self):
+        """Return a compact, JSON-serializable copy of the controller state."""
+        snapshot = {
+            "level": self._level,
+            "fan": self._commanded_fan_mode,
+            "switches": dict(self._commanded_switches),
+            "desired": dict(self._desired),
+            "dwell": {
+                ACTUATOR_FAN: self._fan_dwell.as_dict(),
+                **{
+                    group: timer.as_dict()
+                    for group, timer in self._switch_dwell.items()
+                },
+            },
+        }
+        snapshot["runtime"] = self._runtime.as_dict(dt_util.utcnow())
+        if self._schedule_applied is not None:
+            snapshot["schedule"] = self._schedule_applied.isoformat()
+        if self._temp_filter is not None:
+            snapshot["filter"] = self._temp_filter.as_dict()
+        if self._pid is not None:
+            snapshot["pid"] = self._pid.as_dict()
+        return snapshot
+
+    def _restore_snapshot(self, snapshot):
+        """Resume from a stored snapshot, dropping what no longer applies."""
+        self._level = min(max(int(snapshot["level"]), 0), len(self._speeds))
+        if snapshot.get("fan") in self._speeds.modes:
+            self._commanded_fan_mode = snapshot["fan"]
+
+        switches = {*self._cooling_switches, *self._heating_switches}
+        self._commanded_switches = {
+            entity_id: target
+            for entity_id, target in snapshot.get("switches", {}).items()
+            if entity_id in switches
+        }
+        self._desired = {
+            key: target
+            for key, target in snapshot.get("desired", {}).items()
+            if (key == ACTUATOR_FAN and target in self._speeds.modes)
+            or (key in self._switch_dwell and target in (STATE_ON, STATE_OFF))
+        }
+
+        dwell = snapshot.get("dwell", {})
+        self._fan_dwell.restore(dwell.get(ACTUATOR_FAN, {}))
+        for group, timer in self._switch_dwell.items():
+            timer.restore(dwell.get(group, {}))
+
+        self._runtime.restore(snapshot.get("runtime", {}))
+        if "schedule" in snapshot:
+            self._schedule_applied = datetime.fromisoformat(snapshot["schedule"])
+        if self._temp_filter is not None and "filter" in snapshot:
+            self._temp_filter.restore(snapshot["filter"])
+        if self._pid is not None and "pid" in snapshot:
+            self._pid.restore(snapshot["pid"])
+
     async def async_added_to_hass(self):
         """Run when entity about to be added."""
         await super().async_added_to_hass()
@@ -153,70 +547,437 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
                 self._attr_target_temperature = last_state.attributes.get(
                     ATTR_TEMPERATURE
                 )
-            if last_state.attributes.get("fan_mode") is not None:
+            if last_state.attributes.get("fan_mode") in self._attr_fan_modes:
                 self._attr_fan_mode = last_state.attributes.get("fan_mode")
 
+        # Restore what was last sent, so commands the devices still satisfy
+        # are skipped after a restart
+        last_extra_data = await self.async_get_last_extra_data()
+        if last_extra_data is not None:
+            try:
+                self._restore_snapshot(last_extra_data.as_dict())
+            except (KeyError, TypeError, ValueError) as ex:
+                _LOGGER.warning("Ignoring unreadable stored controller state: %s", ex)
+
         # Add listeners
-        self.async_on_remove(
-            async_track_state_change_event(
-                self.hass, [self._current_temp_entity_id], self._async_temp_changed
+        self.async_on_remove(self._actuators.async_shutdown)
+        self.async_on_remove(self._async_cancel_dwell_recheck)
+        self.async_on_remove(self._async_cancel_resync)
+        self.async_on_remove(self._async_cancel_schedule)
+        self.async_on_remove(self._async_cancel_first_run)
+        self.async_on_remove(self._async_cancel_state_write)
+        if self._temp_debouncer is not None:
+            self.async_on_remove(self._temp_debouncer.async_shutdown)
+
+        coordinator = async_get_coordinator(self.hass)
+        for entity_id in self._temp_sensors:
+            self.async_on_remove(
+                coordinator.async_track_temperature(
+                    entity_id, partial(self._async_sensor_changed, entity_id)
+                )
+            )
+        if self._stale_timeout:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_expire_sensors,
+                    timedelta(seconds=self._stale_timeout),
+                )
             )
+        self.async_on_remove(
+            coordinator.async_track_state(self._fan_entity_id, self._async_fan_changed)
         )
+        self._async_track_switches()
+        self.async_on_remove(self._async_untrack_switches)
 
-        self.async_on_remove(
-            async_track_state_change_event(
-                self.hass, [self._fan_entity_id], self._async_fan_changed
+        if self._pid is not None:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_pid_sample,
+                    timedelta(seconds=self._pid_interval),
+                )
             )
-        )
+
+        if self._use_fleet_engine and self._pid is not None:
+            _LOGGER.warning("Fleet engine does not apply in PID mode, not joining")
+        elif self._use_fleet_engine:
+            if numpy_available():
+                self._fleet = async_get_engine(self.hass)
+                self.async_on_remove(
+                    self._fleet.async_register(
+                        self.unique_id,
+                        self._async_fleet_level_changed,
+                        self._speeds.thresholds,
+                    )
+                )
+            else:
+                _LOGGER.warning("numpy is not installed, fleet engine disabled")
+
+        if self._resync_interval:
+            self._async_schedule_resync()
 
         # Get initial temperature
-        current_temp_state = self.hass.states.get(self._current_temp_entity_id)
-        if current_temp_state and current_temp_state.state not in (
-            STATE_UNKNOWN,
-            STATE_UNAVAILABLE,
+        now = dt_util.utcnow()
+        for entity_id in self._temp_sensors:
+            temperature = parse_temperature(self.hass.states.get(entity_id))
+            if temperature is not None:
+                self._sensors.update(entity_id, temperature, now)
+        if self._sensors.value is not None:
+            self._set_temperature(self._sensors.value)
+
+        # Run control logic once Home Assistant has started and the fan and
+        # sensors report, in a slot shared out across the fleet
+        self._awaiting_first_run = True
+        self._async_start_schedule()
+        self.async_on_remove(async_at_started(self.hass, self._async_hass_started))
+
+    @callback
+    def _async_hass_started(self, _hass):
+        """Allow the first control run now that Home Assistant has started."""
+        self._hass_started = True
+        self._async_check_ready()
+
+    @callback
+    def _async_check_ready(self):
+        """Queue the first control run once its inputs are valid."""
+        if (
+            not self._awaiting_first_run
+            or not self._hass_started
+            or self._unsub_first_run is not None
         ):
-            self._attr_current_temperature = float(current_temp_state.state)
+            return
+
+        fan_state = self.hass.states.get(self._fan_entity_id)
+        if (
+            self._attr_current_temperature is None
+            or fan_state is None
+            or fan_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+        ):
+            _LOGGER.debug("Waiting for fan and temperature before first control run")
+            return
+
+        unsub = async_get_stagger(self.hass).async_schedule(self._async_first_run)
+        if self._awaiting_first_run:
+            # A free slot runs the first run before the handle is returned
+            self._unsub_first_run = unsub
+
+    @callback
+    def _async_first_run(self):
+        """Run the control logic for the first time."""
+        self._unsub_first_run = None
+        self._awaiting_first_run = False
+
+        # Follow the readback of restored commands the devices still satisfy
+        restored = dict(self._commanded_switches)
+        if self._commanded_fan_mode is not None:
+            restored[self._fan_entity_id] = self._commanded_fan_mode
+        for entity_id, target in restored.items():
+            state = self.hass.states.get(entity_id)
+            if state is not None and self._reports(entity_id, state, target):
+                self._readback.assume(entity_id, target)
+        self._async_update_runtime()
 
-        # Run control logic on startup
         self.async_control_fan()
+        self._async_write_state()
 
     @callback
-    def _async_temp_changed(self, event):
-        """Handle temperature changes."""
-        new_state = event.data.get("new_state")
-        if new_state is None or new_state.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
-            return
+    def _async_cancel_first_run(self):
+        """Give up a queued first control run."""
+        if self._unsub_first_run is not None:
+            self._unsub_first_run()
+            self._unsub_first_run = None
 
-        try:
-            self._attr_current_temperature = float(new_state.state)
-            self.async_control_fan()
-            self.async_write_ha_state()
-        except ValueError as ex:
-            _LOGGER.error("Unable to update from temperature sensor: %s", ex)
+    @callback
+    def _async_sensor_changed(self, entity_id, temperature):
+        """Fold one sensor's reading into the zone temperature."""
+        temperature = self._sensors.update(entity_id, temperature, dt_util.utcnow())
+        self._async_temp_changed(temperature)
 
     @callback
-    def _async_fan_changed(self, event):
-        """Handle fan state changes."""
-        new_state = event.data.get("new_state")
-        if new_state is None:
+    def _async_expire_sensors(self, now):
+        """Drop sensors that stopped reporting and re-evaluate if that matters."""
+        if not self._sensors:
             return
 
+        previous = self._sensors.value
+        temperature = self._sensors.expire(now)
+        if temperature == previous:
+            return
+
+        if temperature is None:
+            _LOGGER.warning(
+                "No temperature sensor reported within %s seconds, pausing control",
+                self._stale_timeout,
+            )
+            self._attr_current_temperature = None
+            self._async_sync_engine()
+            self._async_write_state()
+            return
+
+        self._async_temp_changed(temperature)
+
+    @callback
+    def _async_temp_changed(self, temperature):
+        """Handle temperature changes."""
+        self._set_temperature(temperature)
+        self._async_sync_engine()
+
+        if self._awaiting_first_run:
+            self._async_check_ready()
+            self._async_write_state()
+        elif self._pid is not None:
+            # The PID sample clock picks the reading up
+            self._async_write_state()
+        elif self._temp_debouncer is None:
+            self._async_evaluate_temperature()
+        else:
+            self._temp_debouncer.async_schedule_call()
+
+    def _set_temperature(self, temperature):
+        """Store a sensor reading and the filtered value control uses."""
+        self._raw_temperature = temperature
+        if self._temp_filter is not None:
+            temperature = round(self._temp_filter.update(temperature), 2)
+        self._attr_current_temperature = temperature
+
+    @callback
+    def _async_evaluate_temperature(self):
+        """Run the control logic on the latest temperature."""
+        self.async_control_fan()
+        self._async_write_state()
+
+    @callback
+    def _async_fan_changed(self, new_state):
+        """Handle fan state changes."""
         # Update our internal state to match the fan state
         if new_state.state == STATE_OFF:
             self._current_fan_mode = FAN_OFF
         else:
             # Get the current fan mode from the fan entity
-            preset_mode = new_state.attributes.get("preset_mode", FAN_LOW)
+            preset_mode = new_state.attributes.get("preset_mode", self._speeds.modes[1])
             self._current_fan_mode = preset_mode
 
-        self.async_write_ha_state()
+        self._async_readback(ACTUATOR_FAN, self._fan_entity_id, new_state)
+        self._async_check_ready()
+        self._async_write_state()
+
+    @callback
+    def _async_track_switches(self):
+        """Follow the readback of every configured switch."""
+        coordinator = async_get_coordinator(self.hass)
+        groups = {
+            **{entity_id: "heating" for entity_id in self._heating_switches},
+            **{entity_id: "cooling" for entity_id in self._cooling_switches},
+        }
+        for entity_id in set(self._switch_listeners) - set(groups):
+            self._switch_listeners.pop(entity_id)()
+        for entity_id, group in groups.items():
+            if entity_id not in self._switch_listeners:
+                self._switch_listeners[entity_id] = coordinator.async_track_state(
+                    entity_id, partial(self._async_switch_changed, group, entity_id)
+                )
+
+    @callback
+    def _async_untrack_switches(self):
+        """Stop following the switches."""
+        while self._switch_listeners:
+            self._switch_listeners.popitem()[1]()
+
+    @callback
+    def _async_switch_changed(self, group, entity_id, new_state):
+        """Handle a cooling or heating switch reporting a new state."""
+        if self._async_readback(group, entity_id, new_state):
+            self._async_write_state()
+
+    @callback
+    def _async_readback(self, key, entity_id, state):
+        """Compare a readback with its target, correcting it if it drifted.
+
+        Return True if the readback changed the drift attributes.
+        """
+        target = self._readback.target(entity_id)
+        if target is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return False
+
+        before = (self._readback.drifted, self._readback.convergence_time)
+        if self._readback.observe(
+            entity_id, self._reports(entity_id, state, target), dt_util.utcnow()
+        ):
+            _LOGGER.info("%s drifted from %s", entity_id, target)
+            desired = self._desired.get(key)
+            if desired is not None:
+                self._async_correct_drift(key, desired)
+            return True
+        return (self._readback.drifted, self._readback.convergence_time) != before
+
+    def _reports(self, entity_id, state, target):
+        """Return True if an actuator's state shows it at target."""
+        if entity_id == self._fan_entity_id:
+            return self._fan_reports(state, target)
+        return state.state == target
+
+    @callback
+    def _async_record_command(self, entity_id, target):
+        """Record a target sent to an actuator and check its readback."""
+        now = dt_util.utcnow()
+        self._readback.command(entity_id, target, now)
+        state = self.hass.states.get(entity_id)
+        if state is not None and state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            self._readback.observe(
+                entity_id, self._reports(entity_id, state, target), now
+            )
+        self._async_update_runtime()
+
+    @callback
+    def _async_update_runtime(self):
+        """Start and stop the runtime of the fan speeds and switch groups."""
+        running = set()
+        if self._commanded_fan_mode not in (None, FAN_OFF):
+            running.add(self._commanded_fan_mode)
+        for group, switches in (
+            ("cooling", self._cooling_switches),
+            ("heating", self._heating_switches),
+        ):
+            if any(self._commanded_switches.get(s) == STATE_ON for s in switches):
+                running.add(group)
+        self._runtime.update(running, dt_util.utcnow())
+
+    def options_need_reload(self, changed, options):
+        """Return True if the changed option keys cannot be applied live."""
+        if not changed <= LIVE_OPTIONS:
+            return True
+
+        # The runtime sensors are created for the speeds and switch groups
+        speeds = options.get(CONF_SPEED_PERCENTAGES, DEFAULT_SPEED_PERCENTAGES)
+        groups = (
+            bool(options.get(CONF_COOLING_SWITCHES)),
+            bool(options.get(CONF_HEATING_SWITCHES)),
+        )
+        if len(speeds) != len(self._speeds) or groups != (
+            bool(self._cooling_switches),
+            bool(self._heating_switches),
+        ):
+            return True
+
+        # The fleet engine and the PID controller are sized for the speed table
+        return bool(changed & {CONF_BAND_THRESHOLDS, CONF_SPEED_PERCENTAGES}) and (
+            self._fleet is not None or self._pid is not None
+        )
+
+    @callback
+    def async_apply_options(self, options):
+        """Apply new options in place, re-running control if the decision moves."""
+        rerun = False
+
+        self._attr_min_temp = options.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP)
+        self._attr_max_temp = options.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP)
+        self._attr_target_temperature_step = options.get(
+            CONF_TEMP_STEP, DEFAULT_TEMP_STEP
+        )
+        target = self._attr_target_temperature
+        if target is not None:
+            clamped = min(max(target, self._attr_min_temp), self._attr_max_temp)
+            if clamped != target:
+                self._attr_target_temperature = clamped
+                rerun = True
+
+        # Fan speeds and bands: re-run only if the level or its speed changes
+        speeds = SpeedTable(
+            options.get(CONF_BAND_THRESHOLDS, DEFAULT_BAND_THRESHOLDS),
+            options.get(CONF_SPEED_PERCENTAGES, DEFAULT_SPEED_PERCENTAGES),
+        )
+        hysteresis = options.get(CONF_HYSTERESIS, DEFAULT_HYSTERESIS)
+        if (
+            speeds.thresholds != self._speeds.thresholds
+            or speeds.percentages != self._speeds.percentages
+            or hysteresis != self._bands.hysteresis
+        ):
+            old_percentage = self._speeds.percentage(self._speeds.modes[self._level])
+            self._speeds = speeds
+            self._attr_fan_modes = [*speeds.modes, "auto"]
+            if self._attr_fan_mode not in self._attr_fan_modes:
+                self._attr_fan_mode = "auto"
+                rerun = True
+            self._bands = BandStateMachine(speeds.thresholds, hysteresis)
+            self._level = min(self._level, len(speeds))
+
+            demand = self._current_demand()
+            if demand is not None and (
+                self._bands.next_level(self._level, demand) != self._level
+                or speeds.percentage(speeds.modes[self._level]) != old_percentage
+            ):
+                rerun = True
+
+        # Dwell times: a held output may be free to switch now
+        min_on = options.get(CONF_MIN_ON_TIME, DEFAULT_MIN_ON_TIME)
+        min_off = options.get(CONF_MIN_OFF_TIME, DEFAULT_MIN_OFF_TIME)
+        if (min_on, min_off) != (self._fan_dwell.min_on, self._fan_dwell.min_off):
+            for timer in (self._fan_dwell, *self._switch_dwell.values()):
+                timer.min_on = min_on
+                timer.min_off = min_off
+            if self._unsub_dwell_recheck is not None:
+                rerun = True
+
+        # Switch lists: switches dropped from a group are left as they are
+        cooling = options.get(CONF_COOLING_SWITCHES, [])
+        heating = options.get(CONF_HEATING_SWITCHES, [])
+        if cooling != self._cooling_switches or heating != self._heating_switches:
+            for switch_entity in {*self._cooling_switches, *self._heating_switches}:
+                if switch_entity not in cooling and switch_entity not in heating:
+                    self._commanded_switches.pop(switch_entity, None)
+                    self._readback.forget(switch_entity)
+            self._cooling_switches = cooling
+            self._heating_switches = heating
+            self._async_track_switches()
+            self._attr_hvac_modes = _hvac_modes(cooling, heating)
+            if self._attr_hvac_mode not in self._attr_hvac_modes:
+                self.hass.async_create_task(self.async_set_hvac_mode(HVACMode.OFF))
+            else:
+                rerun = True
+
+        resync_interval = options.get(CONF_RESYNC_INTERVAL, DEFAULT_RESYNC_INTERVAL)
+        if resync_interval != self._resync_interval:
+            self._async_cancel_resync()
+            self._resync_interval = resync_interval
+            self._resync_offset = phase_offset(
+                str(self.unique_id), resync_interval or 1
+            )
+            if resync_interval:
+                self._async_schedule_resync()
+
+        schedule = SetpointSchedule.from_config(options.get(CONF_SCHEDULE, {}))
+        if schedule != self._schedule:
+            # A new schedule takes over from the setpoint in effect now
+            self._schedule = schedule
+            self._schedule_applied = None
+            self._async_start_schedule()
+
+        if rerun:
+            self.async_control_fan()
+        self._async_write_state()
+
+    def _current_demand(self):
+        """Return the heating or cooling demand, None if control is idle."""
+        if (
+            self._attr_current_temperature is None
+            or self._attr_target_temperature is None
+        ):
+            return None
+
+        temp_diff = self._attr_current_temperature - self._attr_target_temperature
+        if self._attr_hvac_mode == HVACMode.COOL:
+            return temp_diff
+        if self._attr_hvac_mode == HVACMode.HEAT:
+            return -temp_diff
+        return None
 
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         if ATTR_TEMPERATURE in kwargs:
             self._attr_target_temperature = kwargs[ATTR_TEMPERATURE]
             self.async_control_fan()
-            self.async_write_ha_state()
+            self._async_write_state_if_changed()
 
     async def async_set_fan_mode(self, fan_mode):
         """Set the fan mode."""
@@ -230,36 +991,46 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
             self.async_control_fan()
         else:
             # Otherwise directly set the fan mode
-            await self.async_update_fan(fan_mode)
+            self._async_command_fan(fan_mode)
+            await self._actuators.async_wait()
 
-        self.async_write_ha_state()
+        self._async_write_state_if_changed()
 
     async def async_set_hvac_mode(self, hvac_mode):
         """Set the HVAC mode."""
         if hvac_mode not in self.hvac_modes:
             raise ValueError(f"Invalid hvac mode: {hvac_mode}")
 
+        if hvac_mode != self._attr_hvac_mode:
+            # Start the band state machine and PID afresh in the new mode
+            self._level = 0
+            if self._pid is not None:
+                self._pid.reset()
         self._attr_hvac_mode = hvac_mode
 
         if hvac_mode == HVACMode.OFF:
             # Turn off all switches but only turn off fan if it's in auto mode
-            await self.async_turn_off_cooling_switches()
-            await self.async_turn_off_heating_switches()
+            self._async_command_switches("cooling", STATE_OFF)
+            self._async_command_switches("heating", STATE_OFF)
             if self._attr_fan_mode == "auto":
-                await self.hass.services.async_call(
-                    "fan", "turn_off", {"entity_id": self._fan_entity_id}
-                )
+                self._async_command_fan(FAN_OFF)
             self._attr_hvac_action = HVACAction.OFF
+            await self._actuators.async_wait()
         else:
             # Run control logic
             self.async_control_fan()
 
-        self.async_write_ha_state()
+        self._async_write_state_if_changed()
 
     def async_control_fan(self):
         """Control the fan based on temperature difference."""
+        if self._awaiting_first_run:
+            _LOGGER.debug("First control run not released yet, skipping fan control")
+            return
+
         if self._attr_hvac_mode == HVACMode.OFF:
             _LOGGER.debug("HVAC mode is OFF, skipping fan control")
+            self._async_sync_engine()
             return
 
         if (
@@ -272,7 +1043,10 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
         # Calculate temperature difference
         temp_diff = self._attr_current_temperature - self._attr_target_temperature
         _LOGGER.debug(
-            f"Temperature difference: {temp_diff}°C (current: {self._attr_current_temperature}°C, target: {self._attr_target_temperature}°C)"
+            "Temperature difference: %s°C (current: %s°C, target: %s°C)",
+            temp_diff,
+            self._attr_current_temperature,
+            self._attr_target_temperature,
         )
 
         if self._attr_hvac_mode == HVACMode.COOL:
@@ -280,230 +1054,538 @@ class GenericFanCoilThermostat(ClimateEntity, RestoreEntity):
         elif self._attr_hvac_mode == HVACMode.HEAT:
             self._control_heating(temp_diff)
 
+        self._async_sync_engine()
+
+    def _next_level(self, demand):
+        """Return the fan level for demand under the configured control mode."""
+        if self._pid is not None:
+            return self._pid.level()
+        return self._bands.next_level(self._level, demand)
+
+    @callback
+    def _async_pid_sample(self, _now=None):
+        """Advance the PID controller by one sample and apply its level."""
+        if (
+            self._awaiting_first_run
+            or self._attr_hvac_mode not in (HVACMode.COOL, HVACMode.HEAT)
+            or self._attr_current_temperature is None
+            or self._attr_target_temperature is None
+        ):
+            return
+
+        # Cooling acts on the temperature, heating on its negation
+        sign = 1 if self._attr_hvac_mode == HVACMode.COOL else -1
+        measurement = sign * self._attr_current_temperature
+        demand = measurement - sign * self._attr_target_temperature
+        self._pid.update(demand, measurement, self._pid_interval)
+        self.async_control_fan()
+        self._async_write_state()
+
     def _control_cooling(self, temp_diff):
         """Control cooling based on temperature difference."""
-        # Determine the desired fan state based on temperature difference
-        if temp_diff < THRESHOLD_LOW:
-            # Temperature below threshold, turn off cooling switches and fan (if auto)
-            _LOGGER.debug(
-                f"Temperature difference {temp_diff}°C < {THRESHOLD_LOW}°C, turning off cooling"
-            )
-            self._attr_hvac_action = HVACAction.IDLE
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_OFF))
-            self.hass.async_create_task(self.async_turn_off_cooling_switches())
-        elif temp_diff < THRESHOLD_MEDIUM:
-            # Small difference, use low speed and turn on cooling switches
-            _LOGGER.debug(
-                f"Temperature difference {temp_diff}°C, using LOW fan speed for cooling"
-            )
-            self._attr_hvac_action = HVACAction.COOLING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_LOW))
-            self.hass.async_create_task(self.async_turn_on_cooling_switches())
-        elif temp_diff < THRESHOLD_HIGH:
-            # Medium difference, use medium speed and turn on cooling switches
-            _LOGGER.debug(
-                f"Temperature difference {temp_diff}°C, using MEDIUM fan speed for cooling"
-            )
-            self._attr_hvac_action = HVACAction.COOLING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_MED))
-            self.hass.async_create_task(self.async_turn_on_cooling_switches())
-        else:
-            # Large difference, use high speed and turn on cooling switches
-            _LOGGER.debug(
-                f"Temperature difference {temp_diff}°C, using HIGH fan speed for cooling"
-            )
-            self._attr_hvac_action = HVACAction.COOLING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_HIGH))
-            self.hass.async_create_task(self.async_turn_on_cooling_switches())
+        level = self._next_level(temp_diff)
+        _LOGGER.debug(
+            "Temperature difference %s°C, using fan level %s for cooling",
+            temp_diff,
+            level,
+        )
+        self._async_apply_level(level, temp_diff)
 
     def _control_heating(self, temp_diff):
         """Control heating based on temperature difference."""
         # For heating, we need negative temperature difference (current < target)
         heating_diff = -temp_diff  # Convert to positive value for heating need
+        level = self._next_level(heating_diff)
+        _LOGGER.debug(
+            "Heating difference %s°C, using fan level %s for heating",
+            heating_diff,
+            level,
+        )
+        self._async_apply_level(level, heating_diff)
 
-        if heating_diff < THRESHOLD_LOW:
-            # Temperature above threshold, turn off heating switches and fan (if auto)
-            _LOGGER.debug(
-                f"Heating difference {heating_diff}°C < {THRESHOLD_LOW}°C, turning off heating"
-            )
-            self._attr_hvac_action = HVACAction.IDLE
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_OFF))
-            self.hass.async_create_task(self.async_turn_off_heating_switches())
-        elif heating_diff < THRESHOLD_MEDIUM:
-            # Small difference, use low speed and turn on heating switches
-            _LOGGER.debug(
-                f"Heating difference {heating_diff}°C, using LOW fan speed for heating"
-            )
-            self._attr_hvac_action = HVACAction.HEATING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_LOW))
-            self.hass.async_create_task(self.async_turn_on_heating_switches())
-        elif heating_diff < THRESHOLD_HIGH:
-            # Medium difference, use medium speed and turn on heating switches
-            _LOGGER.debug(
-                f"Heating difference {heating_diff}°C, using MEDIUM fan speed for heating"
-            )
-            self._attr_hvac_action = HVACAction.HEATING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_MED))
-            self.hass.async_create_task(self.async_turn_on_heating_switches())
+    @callback
+    def _async_apply_level(self, level, demand=None):
+        """Apply a fan level to the fan and the active mode's switches."""
+        if self._attr_hvac_mode == HVACMode.COOL:
+            group, action = "cooling", HVACAction.COOLING
+        elif self._attr_hvac_mode == HVACMode.HEAT:
+            group, action = "heating", HVACAction.HEATING
         else:
-            # Large difference, use high speed and turn on heating switches
-            _LOGGER.debug(
-                f"Heating difference {heating_diff}°C, using HIGH fan speed for heating"
-            )
-            self._attr_hvac_action = HVACAction.HEATING
-            if self._attr_fan_mode == "auto":
-                self.hass.async_create_task(self.async_update_fan(FAN_HIGH))
-            self.hass.async_create_task(self.async_turn_on_heating_switches())
+            return
 
-    async def async_update_fan(self, mode):
-        """Update the fan state."""
-        if mode == FAN_OFF:
-            await self.hass.services.async_call(
-                "fan", "turn_off", {"entity_id": self._fan_entity_id}
-            )
+        self._level = level
+        self._decisions.record(
+            self._attr_current_temperature,
+            demand,
+            level,
+            self._speeds.modes[level] if self._attr_fan_mode == "auto" else None,
+            f"{group}:{STATE_ON if level else STATE_OFF}",
+        )
+
+        # Outputs that switched on or off too recently keep their state
+        now = dt_util.utcnow()
+        active = level > 0
+        holds = []
+
+        if self._attr_fan_mode == "auto":
+            wait = self._fan_dwell.remaining(active, now)
+            if wait:
+                holds.append(wait)
+                self._decisions.note("fan:hold", sent=False)
+            else:
+                self._async_command_fan(self._speeds.modes[level])
+
+        switch_dwell = self._switch_dwell[group]
+        wait = switch_dwell.remaining(active, now)
+        if wait:
+            holds.append(wait)
+            self._decisions.note(f"{group}:hold", sent=False)
         else:
-            # Turn on fan and set its speed using percentage
-            await self.hass.services.async_call(
-                "fan", "turn_on", {"entity_id": self._fan_entity_id}
-            )
+            self._async_command_switches(group, STATE_ON if active else STATE_OFF)
 
-            # Map fan modes to percentage values for KNX fan with max_step: 3
-            percentage_map = {
-                FAN_LOW: 33,  # Step 1 of 3 = ~33%
-                FAN_MED: 66,  # Step 2 of 3 = ~66%
-                FAN_HIGH: 100,  # Step 3 of 3 = 100%
-            }
+        self._attr_hvac_action = (
+            action if active or switch_dwell.is_on else HVACAction.IDLE
+        )
 
-            percentage = percentage_map.get(mode, 33)  # Default to low speed
+        if holds:
+            self._async_schedule_dwell_recheck(min(holds))
 
-            await self.hass.services.async_call(
-                "fan",
-                "set_percentage",
-                {"entity_id": self._fan_entity_id, "percentage": percentage},
-            )
+    @callback
+    def _async_schedule_dwell_recheck(self, delay):
+        """Re-run the control logic once a held output may switch."""
+        self._async_cancel_dwell_recheck()
+        self._unsub_dwell_recheck = async_call_later(
+            self.hass, delay, self._async_dwell_expired
+        )
 
-    async def async_turn_on_cooling_switches(self):
-        """Turn on all cooling switches."""
-        if not self._cooling_switches:
-            _LOGGER.debug("No cooling switches configured")
+    @callback
+    def _async_cancel_dwell_recheck(self):
+        """Cancel a pending dwell re-check."""
+        if self._unsub_dwell_recheck is not None:
+            self._unsub_dwell_recheck()
+            self._unsub_dwell_recheck = None
+
+    @callback
+    def _async_dwell_expired(self, _now):
+        """Re-evaluate after a minimum on or off time has passed."""
+        self._unsub_dwell_recheck = None
+        self.async_control_fan()
+        self._async_write_state()
+
+    @callback
+    def _async_start_schedule(self):
+        """Apply the scheduled setpoint if a transition was missed, then arm."""
+        self._async_cancel_schedule()
+        now = dt_util.now()
+        current = self._schedule.current(now)
+        if current is not None and (
+            self._schedule_applied is None or current[0] > self._schedule_applied
+        ):
+            self._async_apply_setpoint(*current)
+        self._async_arm_schedule(now)
+
+    @callback
+    def _async_arm_schedule(self, after):
+        """Arm the one timer for the first transition after the given time."""
+        transition = self._schedule.next_transition(after)
+        if transition is None:
             return
+        when, temperature = transition
+        self._unsub_schedule = async_track_point_in_time(
+            self.hass, partial(self._async_transition, when, temperature), when
+        )
 
-        _LOGGER.debug(f"Turning ON cooling switches: {self._cooling_switches}")
+    @callback
+    def _async_cancel_schedule(self):
+        """Cancel the pending schedule transition."""
+        if self._unsub_schedule is not None:
+            self._unsub_schedule()
+            self._unsub_schedule = None
 
-        # Turn on all switches in a single service call if possible
-        try:
-            await self.hass.services.async_call(
-                "switch", "turn_on", {"entity_id": self._cooling_switches}
+    @callback
+    def _async_transition(self, when, temperature, _now):
+        """Apply a scheduled setpoint and arm the following transition."""
+        self._unsub_schedule = None
+        self._async_apply_setpoint(when, temperature)
+        self._async_arm_schedule(when)
+
+    @callback
+    def _async_apply_setpoint(self, when, temperature):
+        """Set the target temperature of the transition at when.
+
+        The setpoint holds until the next transition, unless it is changed by
+        hand in between.
+        """
+        self._schedule_applied = when
+        self._attr_target_temperature = min(
+            max(temperature, self._attr_min_temp), self._attr_max_temp
+        )
+        _LOGGER.debug(
+            "Scheduled setpoint %s for %s",
+            self._attr_target_temperature,
+            self.entity_id,
+        )
+        if self._awaiting_first_run:
+            # The first control run picks it up and writes the state
+            return
+        self.async_control_fan()
+        self._async_write_state()
+
+    @callback
+    def _async_schedule_resync(self):
+        """Schedule the next resync in this thermostat's slot of the period."""
+        delay = seconds_until_slot(
+            dt_util.utcnow(), self._resync_interval, self._resync_offset
+        )
+        self._unsub_resync = async_call_later(self.hass, delay, self._async_resync)
+
+    @callback
+    def _async_cancel_resync(self):
+        """Cancel the pending resync."""
+        if self._unsub_resync is not None:
+            self._unsub_resync()
+            self._unsub_resync = None
+
+    @callback
+    def _async_resync(self, _now):
+        """Re-send targets the fan or switches drifted away from."""
+        self._async_schedule_resync()
+
+        for key, target in tuple(self._desired.items()):
+            self._async_correct_drift(key, target)
+
+    @callback
+    def _async_correct_drift(self, key, target):
+        """Re-send target to the actuators behind key that report otherwise."""
+        if self._awaiting_first_run:
+            # Nothing is sent before the first control run's slot
+            return
+        if self._actuators.is_busy(key):
+            # A command for this actuator is already on its way
+            return
+
+        if key == ACTUATOR_FAN:
+            if self._fan_drifted(target):
+                _LOGGER.info(
+                    "Fan %s drifted from %s, resending", self._fan_entity_id, target
+                )
+                self._commanded_fan_mode = None
+                self._async_command_fan(target)
+            return
+
+        drifted = self._switches_drifted(key, target)
+        if drifted:
+            _LOGGER.info("Switches %s drifted from %s, resending", drifted, target)
+            for switch_entity in drifted:
+                self._commanded_switches.pop(switch_entity, None)
+            self._async_command_switches(key, target)
+
+    def _fan_drifted(self, mode):
+        """Return True if the fan reports a state other than mode."""
+        fan_state = self.hass.states.get(self._fan_entity_id)
+        if fan_state is None or fan_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            # Nothing to correct until the fan reports again
+            return False
+        return not self._fan_reports(fan_state, mode)
+
+    def _switches_drifted(self, group, target):
+        """Return the switches of group that report a state other than target."""
+        switches = (
+            self._cooling_switches if group == "cooling" else self._heating_switches
+        )
+        drifted = []
+        for switch_entity in switches:
+            switch_state = self.hass.states.get(switch_entity)
+            if switch_state is None or switch_state.state in (
+                STATE_UNAVAILABLE,
+                STATE_UNKNOWN,
+            ):
+                continue
+            if switch_state.state != target:
+                drifted.append(switch_entity)
+        return drifted
+
+    @callback
+    def _async_sync_engine(self):
+        """Copy this zone's inputs and applied level into the fleet engine."""
+        if self._fleet is None:
+            return
+        self._fleet.engine.update_zone(
+            self.unique_id,
+            self._attr_current_temperature,
+            self._attr_target_temperature,
+            self._attr_hvac_mode,
+            self._level,
+            self._bands.hysteresis,
+        )
+
+    @callback
+    def _async_fleet_level_changed(self, level):
+        """Apply a level computed by the fleet engine sweep."""
+        if self._awaiting_first_run:
+            return
+        self._async_apply_level(level)
+        self._async_write_state()
+
+    @callback
+    def _async_actuators_idle(self):
+        """Publish the command counters once the actuator queue has drained."""
+        if self.entity_id is not None:
+            self._async_write_state()
+
+    @callback
+    def _async_write_state(self):
+        """Write the state once, after the updates of this event loop iteration."""
+        if self._write_task is None:
+            self._write_task = self.hass.async_create_task(
+                self._async_flush_state(), eager_start=False
             )
-            _LOGGER.debug("Successfully turned ON all cooling switches")
-        except Exception as ex:
-            _LOGGER.error(f"Error turning on cooling switches: {ex}")
-            # Fallback to individual calls
-            for switch_entity in self._cooling_switches:
-                try:
-                    _LOGGER.debug(f"Turning ON switch individually: {switch_entity}")
-                    await self.hass.services.async_call(
-                        "switch", "turn_on", {"entity_id": switch_entity}
-                    )
-                except Exception as switch_ex:
-                    _LOGGER.error(
-                        f"Error turning on switch {switch_entity}: {switch_ex}"
-                    )
 
-    async def async_turn_off_cooling_switches(self):
-        """Turn off all cooling switches."""
-        if not self._cooling_switches:
-            _LOGGER.debug("No cooling switches configured")
+    async def _async_flush_state(self):
+        """Run the merged state write."""
+        self._write_task = None
+        self._async_write_state_if_changed()
+
+    @callback
+    def _async_cancel_state_write(self):
+        """Drop a pending merged state write."""
+        if self._write_task is not None:
+            self._write_task.cancel()
+            self._write_task = None
+
+    @callback
+    def _async_write_state_if_changed(self):
+        """Write the state unless it would show nothing new."""
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._written_state:
             return
+        self._written_state = fingerprint
+        self.async_write_ha_state()
 
-        _LOGGER.debug(f"Turning OFF cooling switches: {self._cooling_switches}")
+    def _state_fingerprint(self):
+        """Return everything the entity's state and attributes are built from.
 
-        # Turn off all switches in a single service call if possible
-        try:
-            await self.hass.services.async_call(
-                "switch", "turn_off", {"entity_id": self._cooling_switches}
+        Command counters are left out: they are shown with the next write but
+        never cause one.
+        """
+        return (
+            self._attr_hvac_mode,
+            self._attr_hvac_action,
+            self._attr_current_temperature,
+            self._attr_target_temperature,
+            self._attr_fan_mode,
+            self._attr_min_temp,
+            self._attr_max_temp,
+            self._attr_target_temperature_step,
+            tuple(self._attr_hvac_modes),
+            tuple(self._attr_fan_modes),
+            {
+                key: value
+                for key, value in self.extra_state_attributes.items()
+                if key not in COUNTER_ATTRIBUTES
+            },
+        )
+
+    @callback
+    def _async_command_fan(self, mode):
+        """Queue a fan speed change."""
+        self._fan_dwell.mark(mode != FAN_OFF, dt_util.utcnow())
+        self._desired[ACTUATOR_FAN] = mode
+        self._actuators.async_submit(ACTUATOR_FAN, mode, self.async_update_fan)
+
+    @callback
+    def _async_command_switches(self, group, target):
+        """Queue a cooling or heating switch group change."""
+        self._switch_dwell[group].mark(target == STATE_ON, dt_util.utcnow())
+        self._desired[group] = target
+
+        async def _async_apply(switch_target):
+            switches = (
+                self._cooling_switches if group == "cooling" else self._heating_switches
             )
-            _LOGGER.debug("Successfully turned OFF all cooling switches")
-        except Exception as ex:
-            _LOGGER.error(f"Error turning off cooling switches: {ex}")
-            # Fallback to individual calls
-            for switch_entity in self._cooling_switches:
-                try:
-                    _LOGGER.debug(f"Turning OFF switch individually: {switch_entity}")
-                    await self.hass.services.async_call(
-                        "switch", "turn_off", {"entity_id": switch_entity}
-                    )
-                except Exception as switch_ex:
-                    _LOGGER.error(
-                        f"Error turning off switch {switch_entity}: {switch_ex}"
-                    )
+            await self._async_set_switches(switches, switch_target, group)
 
-    async def async_turn_on_heating_switches(self):
-        """Turn on all heating switches."""
-        if not self._heating_switches:
-            _LOGGER.debug("No heating switches configured")
+        self._actuators.async_submit(group, target, _async_apply)
+
+    async def async_update_fan(self, mode):
+        """Update the fan state with the fewest service calls."""
+        if self._fan_matches(mode):
+            self._skipped_commands += 1
+            self._decisions.note(f"fan:{mode}", sent=False)
+            _LOGGER.debug("Fan %s already at %s, skipping", self._fan_entity_id, mode)
             return
 
-        _LOGGER.debug(f"Turning ON heating switches: {self._heating_switches}")
+        # Forget the previous command until the new one has been sent
+        self._commanded_fan_mode = None
+
+        if mode == FAN_OFF:
+            await self._async_call_service("fan", "turn_off", [self._fan_entity_id])
+        else:
+            percentage = self._speeds.percentage(mode) or self._speeds.percentages[0]
+            fan_state = self.hass.states.get(self._fan_entity_id)
+
+            # A running fan only needs its speed changed, a stopped one is
+            # turned on at the new speed in the same call
+            service = (
+                "set_percentage"
+                if fan_state is not None and fan_state.state == STATE_ON
+                else "turn_on"
+            )
+            await self._async_call_service(
+                "fan", service, [self._fan_entity_id], {ATTR_PERCENTAGE: percentage}
+            )
+
+        self._commanded_fan_mode = mode
+        self._async_record_command(self._fan_entity_id, mode)
+        self._decisions.note(f"fan:{mode}", sent=True)
+
+    async def _async_call_service(self, domain, service, entity_ids, data=None):
+        """Call a service, merged with other thermostats' calls if batching."""
+        data = data or {}
+        async with asyncio.timeout(SERVICE_CALL_TIMEOUT):
+            if self._batcher is not None:
+                await self._batcher.async_call(
+                    domain, service, entity_ids, data, self._batch_window
+                )
+                return
 
-        # Turn on all switches in a single service call if possible
-        try:
             await self.hass.services.async_call(
-                "switch", "turn_on", {"entity_id": self._heating_switches}
+                domain, service, {**data, "entity_id": entity_ids}, blocking=True
             )
-            _LOGGER.debug("Successfully turned ON all heating switches")
-        except Exception as ex:
-            _LOGGER.error(f"Error turning on heating switches: {ex}")
-            # Fallback to individual calls
-            for switch_entity in self._heating_switches:
-                try:
-                    _LOGGER.debug(
-                        f"Turning ON heating switch individually: {switch_entity}"
-                    )
-                    await self.hass.services.async_call(
-                        "switch", "turn_on", {"entity_id": switch_entity}
-                    )
-                except Exception as switch_ex:
-                    _LOGGER.error(
-                        f"Error turning on heating switch {switch_entity}: {switch_ex}"
-                    )
 
-    async def async_turn_off_heating_switches(self):
-        """Turn off all heating switches."""
-        if not self._heating_switches:
-            _LOGGER.debug("No heating switches configured")
+    def _fan_matches(self, mode):
+        """Return True if the fan was last commanded to mode and still reports it."""
+        if self._commanded_fan_mode != mode:
+            return False
+
+        fan_state = self.hass.states.get(self._fan_entity_id)
+        return fan_state is not None and self._fan_reports(fan_state, mode)
+
+    def _fan_reports(self, fan_state, mode):
+        """Return True if fan_state shows the fan running at mode."""
+        if mode == FAN_OFF:
+            return fan_state.state == STATE_OFF
+
+        return (
+            fan_state.state == STATE_ON
+            and self._speeds.nearest_mode(fan_state.attributes.get(ATTR_PERCENTAGE))
+            == mode
+        )
+
+    def _switches_needing_command(self, switches, target):
+        """Return the switches whose commanded or actual state differs from target."""
+        pending = []
+        for switch_entity in switches:
+            switch_state = self.hass.states.get(switch_entity)
+            if (
+                self._commanded_switches.get(switch_entity) == target
+                and switch_state is not None
+                and switch_state.state == target
+            ):
+                continue
+            pending.append(switch_entity)
+        return pending
+
+    async def _async_set_switches(self, switches, target, label):
+        """Turn a group of switches on or off, skipping those already in place."""
+        if not switches:
+            _LOGGER.debug("No %s switches configured", label)
+            return
+
+        pending = self._switches_needing_command(switches, target)
+        if not pending:
+            self._skipped_commands += 1
+            self._decisions.note(f"{label}:{target}", sent=False)
+            _LOGGER.debug("All %s switches already %s, skipping", label, target)
             return
 
-        _LOGGER.debug(f"Turning OFF heating switches: {self._heating_switches}")
+        # Known-bad switches wait for their retry window
+        now = dt_util.utcnow()
+        tripped = [
+            entity for entity in pending if not self._breaker.allows(entity, now)
+        ]
+        if tripped:
+            _LOGGER.debug("Skipping tripped %s switches: %s", label, tripped)
+            pending = [entity for entity in pending if entity not in tripped]
+            if not pending:
+                self._decisions.note(f"{label}:{target}", sent=False)
+                return
+
+        service = "turn_on" if target == STATE_ON else "turn_off"
+        _LOGGER.debug("Turning %s %s switches: %s", target.upper(), label, pending)
 
-        # Turn off all switches in a single service call if possible
+        # Turn all switches in a single service call if possible
         try:
-            await self.hass.services.async_call(
-                "switch", "turn_off", {"entity_id": self._heating_switches}
-            )
-            _LOGGER.debug("Successfully turned OFF all heating switches")
+            await self._async_call_service("switch", service, pending)
         except Exception as ex:
-            _LOGGER.error(f"Error turning off heating switches: {ex}")
-            # Fallback to individual calls
-            for switch_entity in self._heating_switches:
-                try:
-                    _LOGGER.debug(
-                        f"Turning OFF heating switch individually: {switch_entity}"
-                    )
+            _LOGGER.debug("Error turning %s %s switches: %s", target, label, ex)
+            # Fall back to individual calls, a few at a time
+            results = await asyncio.gather(
+                *(
+                    self._async_set_switch(switch_entity, service, target, label)
+                    for switch_entity in pending
+                )
+            )
+            self._decisions.note(f"{label}:{target}", sent=any(results))
+            return
+
+        for switch_entity in pending:
+            self._commanded_switches[switch_entity] = target
+            self._async_record_command(switch_entity, target)
+            self._breaker.record_success(switch_entity)
+        self._decisions.note(f"{label}:{target}", sent=True)
+        _LOGGER.debug("Successfully turned %s all %s switches", target.upper(), label)
+
+    async def _async_set_switch(self, switch_entity, service, target, label):
+        """Turn one switch on or off and return True if it succeeded.
+
+        A failure trips the switch's circuit breaker.
+        """
+        self._commanded_switches.pop(switch_entity, None)
+        async with self._fallback_slots:
+            _LOGGER.debug(
+                "Turning %s %s switch individually: %s",
+                target.upper(),
+                label,
+                switch_entity,
+            )
+            try:
+                async with asyncio.timeout(SERVICE_CALL_TIMEOUT):
                     await self.hass.services.async_call(
-                        "switch", "turn_off", {"entity_id": switch_entity}
-                    )
-                except Exception as switch_ex:
-                    _LOGGER.error(
-                        f"Error turning off heating switch {switch_entity}: {switch_ex}"
+                        "switch", service, {"entity_id": switch_entity}, blocking=True
                     )
+            except Exception as ex:
+                backoff = self._breaker.record_failure(switch_entity, dt_util.utcnow())
+                _LOGGER.error(
+                    "Error turning %s %s switch %s, retrying in %s: %s",
+                    target,
+                    label,
+                    switch_entity,
+                    backoff,
+                    ex,
+                )
+                return False
+
+        self._commanded_switches[switch_entity] = target
+        self._async_record_command(switch_entity, target)
+        self._breaker.record_success(switch_entity)
+        return True
+
+    async def async_turn_on_cooling_switches(self):
+        """Turn on all cooling switches."""
+        await self._async_set_switches(self._cooling_switches, STATE_ON, "cooling")
+
+    async def async_turn_off_cooling_switches(self):
+        """Turn off all cooling switches."""
+        await self._async_set_switches(self._cooling_switches, STATE_OFF, "cooling")
+
+    async def async_turn_on_heating_switches(self):
+        """Turn on all heating switches."""
+        await self._async_set_switches(self._heating_switches, STATE_ON, "heating")
+
+    async def async_turn_off_heating_switches(self):
+        """Turn off all heating switches."""
+        await self._async_set_switches(self._heating_switches, STATE_OFF, "heating")
 
     async def async_turn_off(self, **kwargs):
         await self.async_set_hvac_mode(HVACMode.OFF)
@@ -17,15 +17,77 @@ from .const import (
     CONF_MAX_TEMP,
     CONF_TARGET_TEMP,
     CONF_TEMP_STEP,
+    CONF_DEBOUNCE_MODE,
+    CONF_DEBOUNCE_INTERVAL,
+    CONF_BATCH_WINDOW,
+    CONF_FLEET_ENGINE,
+    CONF_HYSTERESIS,
+    CONF_MIN_ON_TIME,
+    CONF_MIN_OFF_TIME,
+    CONF_BAND_THRESHOLDS,
+    CONF_SPEED_PERCENTAGES,
+    CONF_TEMP_FILTER,
+    CONF_FILTER_ALPHA,
+    CONF_FILTER_WINDOW,
+    CONF_TEMPERATURE_SENSORS,
+    CONF_SENSOR_AGGREGATION,
+    CONF_SENSOR_STALE_TIMEOUT,
+    CONF_CONTROL_MODE,
+    CONF_PID_KP,
+    CONF_PID_KI,
+    CONF_PID_KD,
+    CONF_PID_SAMPLE_INTERVAL,
+    CONF_RESYNC_INTERVAL,
+    CONF_SCHEDULE,
+    CONF_ZONES,
+    CONTROL_MODES,
+    DEBOUNCE_MODES,
+    SENSOR_AGGREGATIONS,
+    TEMP_FILTERS,
     DEFAULT_MIN_TEMP,
     DEFAULT_MAX_TEMP,
     DEFAULT_TARGET_TEMP,
     DEFAULT_TEMP_STEP,
+    DEFAULT_DEBOUNCE_MODE,
+    DEFAULT_DEBOUNCE_INTERVAL,
+    DEFAULT_BATCH_WINDOW,
+    DEFAULT_FLEET_ENGINE,
+    DEFAULT_HYSTERESIS,
+    DEFAULT_MIN_ON_TIME,
+    DEFAULT_MIN_OFF_TIME,
+    DEFAULT_BAND_THRESHOLDS,
+    DEFAULT_SPEED_PERCENTAGES,
+    DEFAULT_TEMP_FILTER,
+    DEFAULT_FILTER_ALPHA,
+    DEFAULT_FILTER_WINDOW,
+    DEFAULT_SENSOR_AGGREGATION,
+    DEFAULT_SENSOR_STALE_TIMEOUT,
+    DEFAULT_CONTROL_MODE,
+    DEFAULT_PID_KP,
+    DEFAULT_PID_KI,
+    DEFAULT_PID_KD,
+    DEFAULT_PID_SAMPLE_INTERVAL,
+    DEFAULT_RESYNC_INTERVAL,
+    FLEET_UNIQUE_ID,
 )
+from .control import SpeedTable
+from .schedule import SCHEDULE_SCHEMA
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _split_numbers(value):
+    """Return the items of a comma separated list of numbers."""
+    if isinstance(value, str):
+        return [item for item in value.split(",") if item.strip()]
+    return list(value)
+
+
+def _join_numbers(values):
+    """Return a list of numbers as comma separated text."""
+    return ", ".join(f"{value:g}" for value in values)
+
+
 class GenericFanCoilConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Generic Fan Coil Thermostat."""
 
@@ -47,6 +109,11 @@ class GenericFanCoilConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             if not current_temp_entity:
                 errors[CONF_CURRENT_TEMPERATURE_ENTITY_ID] = "entity_not_found"
+            if not all(
+                hass.states.get(entity_id)
+                for entity_id in user_input.get(CONF_TEMPERATURE_SENSORS, [])
+            ):
+                errors[CONF_TEMPERATURE_SENSORS] = "entity_not_found"
             if not fan_entity:
                 errors[CONF_FAN_ENTITY_ID] = "entity_not_found"
 
@@ -72,6 +139,14 @@ class GenericFanCoilConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     ): selector.EntitySelector(
                         selector.EntitySelectorConfig(domain=["sensor", "climate"]),
                     ),
+                    vol.Optional(
+                        CONF_TEMPERATURE_SENSORS, default=[]
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(
+                            domain=["sensor", "climate"],
+                            multiple=True,
+                        ),
+                    ),
                     vol.Required(CONF_FAN_ENTITY_ID): selector.EntitySelector(
                         selector.EntitySelectorConfig(domain=["fan"]),
                     ),
@@ -108,6 +183,18 @@ class GenericFanCoilConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_import(self, import_data):
+        """Create the fleet entry from YAML, or update its zones."""
+        await self.async_set_unique_id(FLEET_UNIQUE_ID)
+        self._abort_if_unique_id_configured(
+            updates={CONF_ZONES: import_data[CONF_ZONES]}
+        )
+
+        return self.async_create_entry(
+            title="Generic Fan Coil Thermostat Fleet",
+            data={CONF_ZONES: import_data[CONF_ZONES]},
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -124,10 +211,69 @@ class GenericFanCoilOptionsFlowHandler(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
+        errors = {}
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            # Compile the band table and schedule now so bad ones are never stored
+            try:
+                table = SpeedTable(
+                    _split_numbers(user_input[CONF_BAND_THRESHOLDS]),
+                    _split_numbers(user_input[CONF_SPEED_PERCENTAGES]),
+                )
+            except ValueError:
+                errors["base"] = "invalid_speed_table"
+            try:
+                schedule = SCHEDULE_SCHEMA(user_input.get(CONF_SCHEDULE) or {})
+            except vol.Invalid:
+                errors["base"] = "invalid_schedule"
+            if not errors:
+                return self.async_create_entry(
+                    title="",
+                    data={
+                        **user_input,
+                        CONF_BAND_THRESHOLDS: list(table.thresholds),
+                        CONF_SPEED_PERCENTAGES: list(table.percentages),
+                        CONF_SCHEDULE: schedule,
+                    },
+                )
 
         options = {
+            vol.Optional(
+                CONF_TEMPERATURE_SENSORS,
+                default=self.config_entry.options.get(
+                    CONF_TEMPERATURE_SENSORS,
+                    self.config_entry.data.get(CONF_TEMPERATURE_SENSORS, []),
+                ),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain=["sensor", "climate"],
+                    multiple=True,
+                ),
+            ),
+            vol.Optional(
+                CONF_SENSOR_AGGREGATION,
+                default=self.config_entry.options.get(
+                    CONF_SENSOR_AGGREGATION,
+                    self.config_entry.data.get(
+                        CONF_SENSOR_AGGREGATION, DEFAULT_SENSOR_AGGREGATION
+                    ),
+                ),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=SENSOR_AGGREGATIONS,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key=CONF_SENSOR_AGGREGATION,
+                ),
+            ),
+            vol.Optional(
+                CONF_SENSOR_STALE_TIMEOUT,
+                default=self.config_entry.options.get(
+                    CONF_SENSOR_STALE_TIMEOUT,
+                    self.config_entry.data.get(
+                        CONF_SENSOR_STALE_TIMEOUT, DEFAULT_SENSOR_STALE_TIMEOUT
+                    ),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
             vol.Optional(
                 CONF_COOLING_SWITCHES,
                 default=self.config_entry.options.get(
@@ -180,6 +326,190 @@ class GenericFanCoilOptionsFlowHandler(config_entries.OptionsFlow):
                     self.config_entry.data.get(CONF_TEMP_STEP, DEFAULT_TEMP_STEP),
                 ),
             ): vol.Coerce(float),
+            vol.Optional(
+                CONF_DEBOUNCE_MODE,
+                default=self.config_entry.options.get(
+                    CONF_DEBOUNCE_MODE,
+                    self.config_entry.data.get(
+                        CONF_DEBOUNCE_MODE, DEFAULT_DEBOUNCE_MODE
+                    ),
+                ),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=DEBOUNCE_MODES,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key=CONF_DEBOUNCE_MODE,
+                ),
+            ),
+            vol.Optional(
+                CONF_DEBOUNCE_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_DEBOUNCE_INTERVAL,
+                    self.config_entry.data.get(
+                        CONF_DEBOUNCE_INTERVAL, DEFAULT_DEBOUNCE_INTERVAL
+                    ),
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_BATCH_WINDOW,
+                default=self.config_entry.options.get(
+                    CONF_BATCH_WINDOW,
+                    self.config_entry.data.get(CONF_BATCH_WINDOW, DEFAULT_BATCH_WINDOW),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+            vol.Optional(
+                CONF_FLEET_ENGINE,
+                default=self.config_entry.options.get(
+                    CONF_FLEET_ENGINE,
+                    self.config_entry.data.get(CONF_FLEET_ENGINE, DEFAULT_FLEET_ENGINE),
+                ),
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_HYSTERESIS,
+                default=self.config_entry.options.get(
+                    CONF_HYSTERESIS,
+                    self.config_entry.data.get(CONF_HYSTERESIS, DEFAULT_HYSTERESIS),
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+            vol.Optional(
+                CONF_MIN_ON_TIME,
+                default=self.config_entry.options.get(
+                    CONF_MIN_ON_TIME,
+                    self.config_entry.data.get(CONF_MIN_ON_TIME, DEFAULT_MIN_ON_TIME),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_MIN_OFF_TIME,
+                default=self.config_entry.options.get(
+                    CONF_MIN_OFF_TIME,
+                    self.config_entry.data.get(CONF_MIN_OFF_TIME, DEFAULT_MIN_OFF_TIME),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_BAND_THRESHOLDS,
+                default=_join_numbers(
+                    self.config_entry.options.get(
+                        CONF_BAND_THRESHOLDS,
+                        self.config_entry.data.get(
+                            CONF_BAND_THRESHOLDS, DEFAULT_BAND_THRESHOLDS
+                        ),
+                    )
+                ),
+            ): selector.TextSelector(),
+            vol.Optional(
+                CONF_SPEED_PERCENTAGES,
+                default=_join_numbers(
+                    self.config_entry.options.get(
+                        CONF_SPEED_PERCENTAGES,
+                        self.config_entry.data.get(
+                            CONF_SPEED_PERCENTAGES, DEFAULT_SPEED_PERCENTAGES
+                        ),
+                    )
+                ),
+            ): selector.TextSelector(),
+            vol.Optional(
+                CONF_TEMP_FILTER,
+                default=self.config_entry.options.get(
+                    CONF_TEMP_FILTER,
+                    self.config_entry.data.get(CONF_TEMP_FILTER, DEFAULT_TEMP_FILTER),
+                ),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=TEMP_FILTERS,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key=CONF_TEMP_FILTER,
+                ),
+            ),
+            vol.Optional(
+                CONF_FILTER_ALPHA,
+                default=self.config_entry.options.get(
+                    CONF_FILTER_ALPHA,
+                    self.config_entry.data.get(CONF_FILTER_ALPHA, DEFAULT_FILTER_ALPHA),
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.01, max=1)),
+            vol.Optional(
+                CONF_FILTER_WINDOW,
+                default=self.config_entry.options.get(
+                    CONF_FILTER_WINDOW,
+                    self.config_entry.data.get(
+                        CONF_FILTER_WINDOW, DEFAULT_FILTER_WINDOW
+                    ),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=30)),
+            vol.Optional(
+                CONF_CONTROL_MODE,
+                default=self.config_entry.options.get(
+                    CONF_CONTROL_MODE,
+                    self.config_entry.data.get(CONF_CONTROL_MODE, DEFAULT_CONTROL_MODE),
+                ),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=CONTROL_MODES,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key=CONF_CONTROL_MODE,
+                ),
+            ),
+            vol.Optional(
+                CONF_PID_KP,
+                default=self.config_entry.options.get(
+                    CONF_PID_KP,
+                    self.config_entry.data.get(CONF_PID_KP, DEFAULT_PID_KP),
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_PID_KI,
+                default=self.config_entry.options.get(
+                    CONF_PID_KI,
+                    self.config_entry.data.get(CONF_PID_KI, DEFAULT_PID_KI),
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_PID_KD,
+                default=self.config_entry.options.get(
+                    CONF_PID_KD,
+                    self.config_entry.data.get(CONF_PID_KD, DEFAULT_PID_KD),
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional(
+                CONF_PID_SAMPLE_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_PID_SAMPLE_INTERVAL,
+                    self.config_entry.data.get(
+                        CONF_PID_SAMPLE_INTERVAL, DEFAULT_PID_SAMPLE_INTERVAL
+                    ),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+            vol.Optional(
+                CONF_RESYNC_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_RESYNC_INTERVAL,
+                    self.config_entry.data.get(
+                        CONF_RESYNC_INTERVAL, DEFAULT_RESYNC_INTERVAL
+                    ),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+            vol.Optional(
+                CONF_SCHEDULE,
+                default=self.config_entry.options.get(
+                    CONF_SCHEDULE,
+                    self.config_entry.data.get(CONF_SCHEDULE, {}),
+                ),
+            ): selector.ObjectSelector(),
         }
 
-        return self.async_show_form(step_id="init", data_schema=vol.Schema(options))
+        if CONF_ZONES in self.config_entry.data:
+            # Sensors and switches are set per zone in YAML
+            options = {
+                key: value
+                for key, value in options.items()
+                if key.schema
+                not in (
+                    CONF_TEMPERATURE_SENSORS,
+                    CONF_COOLING_SWITCHES,
+                    CONF_HEATING_SWITCHES,
+                )
+            }
+
+        return self.async_show_form(
+            step_id="init", data_schema=vol.Schema(options), errors=errors
+        )
@@ -1,7 +1,27 @@
 """Constants for the Generic Fan Coil Thermostat integration."""
 
+from datetime import timedelta
+
 DOMAIN = "generic_fan_coil_thermostat"
-PLATFORMS = ["climate"]
+# Set up in order, the sensors read the thermostats the climate platform creates
+PLATFORMS = ["climate", "sensor"]
+
+# Key of the shared state-change coordinator in hass.data[DOMAIN]
+DATA_COORDINATOR = "coordinator"
+# Key of the shared service call batcher in hass.data[DOMAIN]
+DATA_BATCHER = "batcher"
+# Key of the shared fleet engine sweep in hass.data[DOMAIN]
+DATA_ENGINE = "engine"
+# Key of the shared startup stagger in hass.data[DOMAIN]
+DATA_STAGGER = "stagger"
+# Key of the live thermostat entities in a config entry's hass.data dict
+DATA_THERMOSTATS = "thermostats"
+
+# Number of recent control decisions kept per thermostat
+DECISION_TRACE_SIZE = 50
+
+# Unique ID of the config entry holding the zones imported from YAML
+FLEET_UNIQUE_ID = "fleet"
 
 # Configuration options
 CONF_CURRENT_TEMPERATURE_ENTITY_ID = "current_temperature_entity_id"
@@ -12,12 +32,91 @@ CONF_MIN_TEMP = "min_temp"
 CONF_MAX_TEMP = "max_temp"
 CONF_TARGET_TEMP = "target_temp"
 CONF_TEMP_STEP = "temp_step"
+CONF_DEBOUNCE_MODE = "debounce_mode"
+CONF_DEBOUNCE_INTERVAL = "debounce_interval"
+CONF_BATCH_WINDOW = "batch_window"
+CONF_FLEET_ENGINE = "fleet_engine"
+CONF_HYSTERESIS = "hysteresis"
+CONF_MIN_ON_TIME = "min_on_time"
+CONF_MIN_OFF_TIME = "min_off_time"
+CONF_BAND_THRESHOLDS = "band_thresholds"
+CONF_SPEED_PERCENTAGES = "speed_percentages"
+CONF_TEMP_FILTER = "temperature_filter"
+CONF_FILTER_ALPHA = "filter_alpha"
+CONF_FILTER_WINDOW = "filter_window"
+CONF_TEMPERATURE_SENSORS = "temperature_sensors"
+CONF_SENSOR_AGGREGATION = "sensor_aggregation"
+CONF_SENSOR_STALE_TIMEOUT = "sensor_stale_timeout"
+CONF_CONTROL_MODE = "control_mode"
+CONF_PID_KP = "pid_kp"
+CONF_PID_KI = "pid_ki"
+CONF_PID_KD = "pid_kd"
+CONF_PID_SAMPLE_INTERVAL = "pid_sample_interval"
+CONF_RESYNC_INTERVAL = "resync_interval"
+CONF_ZONES = "zones"
+CONF_SCHEDULE = "schedule"
+
+# Keys of a setpoint schedule
+CONF_SCHEDULE_WEEKLY = "weekly"
+CONF_SCHEDULE_EXCEPTIONS = "exceptions"
+CONF_SCHEDULE_DAYS = "days"
+CONF_SCHEDULE_DATE = "date"
+CONF_SCHEDULE_AT = "at"
+CONF_SCHEDULE_TEMPERATURE = "temperature"
 
 # Default settings
 DEFAULT_MIN_TEMP = 15.0
 DEFAULT_MAX_TEMP = 30.0
 DEFAULT_TARGET_TEMP = 22.0
 DEFAULT_TEMP_STEP = 0.5
+DEFAULT_DEBOUNCE_MODE = "off"
+DEFAULT_DEBOUNCE_INTERVAL = 10.0
+DEFAULT_BATCH_WINDOW = 0  # Milliseconds, 0 disables cross-thermostat batching
+DEFAULT_FLEET_ENGINE = False
+DEFAULT_HYSTERESIS = 0.0  # °C below each band's on threshold before it turns off
+DEFAULT_MIN_ON_TIME = 0  # Seconds an output stays on before it may turn off
+DEFAULT_MIN_OFF_TIME = 0  # Seconds an output stays off before it may turn on
+DEFAULT_TEMP_FILTER = "off"
+DEFAULT_FILTER_ALPHA = 0.3  # Weight of the newest reading in the moving average
+DEFAULT_FILTER_WINDOW = 5  # Readings in the rolling median window
+DEFAULT_SENSOR_AGGREGATION = "mean"
+DEFAULT_SENSOR_STALE_TIMEOUT = 0  # Seconds without a report, 0 keeps readings
+DEFAULT_CONTROL_MODE = "bands"
+DEFAULT_PID_KP = 1.0  # Fan levels per °C of demand
+DEFAULT_PID_KI = 0.002  # Fan levels per °C per second of demand
+DEFAULT_PID_KD = 0.0  # Fan levels per °C per second of temperature change
+DEFAULT_PID_SAMPLE_INTERVAL = 60  # Seconds between PID evaluations
+DEFAULT_RESYNC_INTERVAL = 0  # Seconds between state reconciliations, 0 disables
+
+# Temperature update debounce modes
+DEBOUNCE_OFF = "off"
+DEBOUNCE_LEADING = "leading"  # Run on the first update, then at most once per interval
+DEBOUNCE_TRAILING = "trailing"  # Run once per interval on the latest update
+DEBOUNCE_MODES = [DEBOUNCE_OFF, DEBOUNCE_LEADING, DEBOUNCE_TRAILING]
+
+# Temperature input filters
+FILTER_OFF = "off"
+FILTER_EMA = "ema"  # Exponential moving average
+FILTER_MEDIAN = "median"  # Rolling median over a fixed window
+TEMP_FILTERS = [FILTER_OFF, FILTER_EMA, FILTER_MEDIAN]
+
+# Control strategies
+CONTROL_BANDS = "bands"  # Fan level from fixed demand bands, on every reading
+CONTROL_PID = "pid"  # PI/PID on a fixed sample timer
+CONTROL_MODES = [CONTROL_BANDS, CONTROL_PID]
+
+# Weekdays of a setpoint schedule, in datetime.weekday() order
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+# Weight of the newest reading in the filtered PID derivative measurement
+PID_DERIVATIVE_ALPHA = 0.5
+
+# How the readings of several temperature sensors are combined
+AGGREGATE_MEAN = "mean"
+AGGREGATE_MIN = "min"
+AGGREGATE_MAX = "max"
+AGGREGATE_MEDIAN = "median"
+SENSOR_AGGREGATIONS = [AGGREGATE_MEAN, AGGREGATE_MIN, AGGREGATE_MAX, AGGREGATE_MEDIAN]
 
 # Fan modes
 FAN_OFF = "off"
@@ -25,7 +124,109 @@ FAN_LOW = "low"
 FAN_MED = "medium"
 FAN_HIGH = "high"
 
-# Threshold for fan speed
+# Default fan speed bands, for a KNX fan with max_step: 3
 THRESHOLD_LOW = 0.5  # Temperature difference for activating low speed
 THRESHOLD_MEDIUM = 1.5  # Temperature difference for activating medium speed
 THRESHOLD_HIGH = 2.5  # Temperature difference for activating high speed
+DEFAULT_BAND_THRESHOLDS = [THRESHOLD_LOW, THRESHOLD_MEDIUM, THRESHOLD_HIGH]
+DEFAULT_SPEED_PERCENTAGES = [33, 66, 100]  # Step n of 3 = ~n * 33%
+
+# Fan mode names by number of speeds, other fans use speed_1 ... speed_n
+FAN_SPEED_NAMES = {
+    1: [FAN_HIGH],
+    2: [FAN_LOW, FAN_HIGH],
+    3: [FAN_LOW, FAN_MED, FAN_HIGH],
+}
+
+# Effective value of each option that has not been stored yet
+OPTION_DEFAULTS = {
+    CONF_TEMPERATURE_SENSORS: [],
+    CONF_COOLING_SWITCHES: [],
+    CONF_HEATING_SWITCHES: [],
+    CONF_MIN_TEMP: DEFAULT_MIN_TEMP,
+    CONF_MAX_TEMP: DEFAULT_MAX_TEMP,
+    CONF_TARGET_TEMP: DEFAULT_TARGET_TEMP,
+    CONF_TEMP_STEP: DEFAULT_TEMP_STEP,
+    CONF_DEBOUNCE_MODE: DEFAULT_DEBOUNCE_MODE,
+    CONF_DEBOUNCE_INTERVAL: DEFAULT_DEBOUNCE_INTERVAL,
+    CONF_BATCH_WINDOW: DEFAULT_BATCH_WINDOW,
+    CONF_FLEET_ENGINE: DEFAULT_FLEET_ENGINE,
+    CONF_HYSTERESIS: DEFAULT_HYSTERESIS,
+    CONF_MIN_ON_TIME: DEFAULT_MIN_ON_TIME,
+    CONF_MIN_OFF_TIME: DEFAULT_MIN_OFF_TIME,
+    CONF_BAND_THRESHOLDS: DEFAULT_BAND_THRESHOLDS,
+    CONF_SPEED_PERCENTAGES: DEFAULT_SPEED_PERCENTAGES,
+    CONF_TEMP_FILTER: DEFAULT_TEMP_FILTER,
+    CONF_FILTER_ALPHA: DEFAULT_FILTER_ALPHA,
+    CONF_FILTER_WINDOW: DEFAULT_FILTER_WINDOW,
+    CONF_SENSOR_AGGREGATION: DEFAULT_SENSOR_AGGREGATION,
+    CONF_SENSOR_STALE_TIMEOUT: DEFAULT_SENSOR_STALE_TIMEOUT,
+    CONF_CONTROL_MODE: DEFAULT_CONTROL_MODE,
+    CONF_PID_KP: DEFAULT_PID_KP,
+    CONF_PID_KI: DEFAULT_PID_KI,
+    CONF_PID_KD: DEFAULT_PID_KD,
+    CONF_PID_SAMPLE_INTERVAL: DEFAULT_PID_SAMPLE_INTERVAL,
+    CONF_RESYNC_INTERVAL: DEFAULT_RESYNC_INTERVAL,
+    CONF_SCHEDULE: {},
+}
+
+# How often the fleet engine re-evaluates every zone
+FLEET_SWEEP_INTERVAL = timedelta(seconds=60)
+
+# First control runs released together after startup, and the seconds between
+STARTUP_RELEASE_SIZE = 4
+STARTUP_RELEASE_INTERVAL = 1.0
+
+# How often the runtime sensors report their totals
+RUNTIME_UPDATE_INTERVAL = timedelta(seconds=60)
+
+# Extra state attributes
+ATTR_SKIPPED_COMMANDS = "skipped_commands"
+ATTR_COMMAND_QUEUE_DEPTH = "command_queue_depth"
+ATTR_PENDING_COMMANDS = "pending_commands"
+ATTR_SUPERSEDED_COMMANDS = "superseded_commands"
+ATTR_TRIPPED_SWITCHES = "tripped_switches"
+ATTR_RAW_TEMPERATURE = "raw_temperature"
+ATTR_CONTROL_OUTPUT = "control_output"
+ATTR_DRIFTED_ACTUATORS = "drifted_actuators"
+ATTR_DRIFT_EVENTS = "drift_events"
+ATTR_CONVERGENCE_TIME = "convergence_time"
+
+# Command counters, which change without changing what the thermostat does
+COUNTER_ATTRIBUTES = frozenset(
+    {
+        ATTR_SKIPPED_COMMANDS,
+        ATTR_COMMAND_QUEUE_DEPTH,
+        ATTR_PENDING_COMMANDS,
+        ATTR_SUPERSEDED_COMMANDS,
+        ATTR_DRIFT_EVENTS,
+    }
+)
+
+# Attributes that change with nearly every update and are kept out of the
+# recorder; the tripped and drifted lists change rarely and stay recorded
+UNRECORDED_ATTRIBUTES = frozenset(
+    {
+        ATTR_SKIPPED_COMMANDS,
+        ATTR_COMMAND_QUEUE_DEPTH,
+        ATTR_PENDING_COMMANDS,
+        ATTR_SUPERSEDED_COMMANDS,
+        ATTR_RAW_TEMPERATURE,
+        ATTR_CONTROL_OUTPUT,
+        ATTR_DRIFT_EVENTS,
+        ATTR_CONVERGENCE_TIME,
+    }
+)
+
+# Seconds a fan or switch service call may take before it is abandoned
+SERVICE_CALL_TIMEOUT = 10
+
+# Switch calls run at once when a group call fails and each is retried alone
+FALLBACK_CONCURRENCY = 4
+
+# Backoff before a failing switch is tried again, doubling on every failure
+BREAKER_BASE_BACKOFF = timedelta(seconds=30)
+BREAKER_MAX_BACKOFF = timedelta(minutes=30)
+
+# Actuator queue key for the fan (switch groups use "cooling" and "heating")
+ACTUATOR_FAN = "fan"
@@ -0,0 +1,216 @@
+"""Fan speed table, level state machine, PID controller and dwell timers."""
+
+from bisect import bisect_right
+from datetime import datetime
+
+from .const import FAN_OFF, FAN_SPEED_NAMES
+
+
+def speed_modes(speeds):
+    """Return the fan mode names for a fan with the given number of speeds."""
+    if speeds in FAN_SPEED_NAMES:
+        return list(FAN_SPEED_NAMES[speeds])
+    return [f"speed_{speed}" for speed in range(1, speeds + 1)]
+
+
+class SpeedTable:
+    """Fan speeds and the demand bands that select them.
+
+    Compiled once per thermostat from the configured band thresholds and
+    speed percentages. Level 0 is off; level n runs the fan at the n-th
+    percentage and is entered once the demand reaches the n-th threshold.
+    """
+
+    def __init__(self, thresholds, percentages):
+        """Initialize the table, raising ValueError if it is inconsistent."""
+        thresholds = tuple(float(threshold) for threshold in thresholds)
+        percentages = tuple(int(percentage) for percentage in percentages)
+
+        if not thresholds or len(thresholds) != len(percentages):
+            raise ValueError("Need one band threshold per fan speed")
+        if thresholds[0] < 0 or any(
+            high <= low for low, high in zip(thresholds, thresholds[1:])
+        ):
+            raise ValueError("Band thresholds must be positive and increasing")
+        if (
+            percentages[0] < 1
+            or percentages[-1] > 100
+            or any(high <= low for low, high in zip(percentages, percentages[1:]))
+        ):
+            raise ValueError("Speed percentages must increase within 1-100")
+
+        self.thresholds = thresholds
+        self.percentages = percentages
+        self.modes = (FAN_OFF, *speed_modes(len(percentages)))
+        self._percentage_by_mode = dict(zip(self.modes[1:], percentages))
+
+    def __len__(self):
+        """Return the number of fan speeds."""
+        return len(self.percentages)
+
+    def percentage(self, mode):
+        """Return the fan percentage for a speed mode, None if it is not one."""
+        return self._percentage_by_mode.get(mode)
+
+    def nearest_mode(self, percentage):
+        """Return the speed mode closest to a reported fan percentage.
+
+        Fans round a requested percentage to their own steps, so the value
+        they report back rarely equals the configured one exactly.
+        """
+        if not percentage:
+            return None
+        index = min(
+            range(len(self.percentages)),
+            key=lambda index: abs(self.percentages[index] - percentage),
+        )
+        return self.modes[index + 1]
+
+
+class BandStateMachine:
+    """Pick a fan level from the heating or cooling demand.
+
+    Each band has an on threshold, which the demand must reach to move up
+    into the band, and an off threshold (hysteresis lower), which the demand
+    must drop below to leave it. Between the two the current level is kept,
+    so a reading hovering around a band edge does not toggle the outputs.
+    """
+
+    def __init__(self, on_thresholds, hysteresis=0.0):
+        """Initialize the state machine."""
+        self.on_thresholds = tuple(on_thresholds)
+        self.off_thresholds = tuple(
+            threshold - hysteresis for threshold in self.on_thresholds
+        )
+        self.hysteresis = hysteresis
+
+    def next_level(self, level, demand):
+        """Return the level to move to from level for demand."""
+        up = bisect_right(self.on_thresholds, demand)
+        if up > level:
+            return up
+
+        down = bisect_right(self.off_thresholds, demand)
+        if down < level:
+            return down
+
+        return level
+
+
+class DwellTimer:
+    """Minimum on-time and off-time for one output."""
+
+    def __init__(self, min_on, min_off):
+        """Initialize the timer with dwell times in seconds."""
+        self.min_on = min_on
+        self.min_off = min_off
+        self.is_on = None
+        self.changed_at = None
+
+    def remaining(self, on, now):
+        """Return seconds until the output may switch to on (0 if it may now)."""
+        if self.is_on is None or self.is_on == on:
+            return 0.0
+
+        hold = self.min_on if self.is_on else self.min_off
+        return max(0.0, hold - (now - self.changed_at).total_seconds())
+
+    def mark(self, on, now):
+        """Record that the output was switched to on at now."""
+        if self.is_on != on:
+            self.is_on = on
+            self.changed_at = now
+
+    def as_dict(self):
+        """Return the last switch for storage."""
+        return {
+            "on": self.is_on,
+            "changed_at": (
+                self.changed_at.isoformat() if self.changed_at is not None else None
+            ),
+        }
+
+    def restore(self, data):
+        """Resume from a stored last switch."""
+        changed_at = data.get("changed_at")
+        if data.get("on") is None or changed_at is None:
+            return
+        self.is_on = bool(data["on"])
+        self.changed_at = datetime.fromisoformat(changed_at)
+
+
+class PidController:
+    """PI/PID controller turning heating or cooling demand into a fan level.
+
+    The output is in fan levels, from 0 up to output_max. The integral only
+    grows while the output is not pinned against a limit in the same
+    direction (conditional integration), so a long spell at full speed does
+    not wind it up. The derivative acts on an exponentially filtered
+    measurement rather than the error, so setpoint changes cause no kick
+    and sensor noise is damped.
+    """
+
+    def __init__(self, kp, ki, kd, output_max, derivative_alpha=0.5):
+        """Initialize the controller."""
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.output_max = output_max
+        self.derivative_alpha = derivative_alpha
+        self.integral = 0.0
+        self.output = 0.0
+        self._measurement = None
+
+    def reset(self):
+        """Forget the integral and the measurement history."""
+        self.integral = 0.0
+        self.output = 0.0
+        self._measurement = None
+
+    def update(self, demand, measurement, dt):
+        """Return the output for demand after dt seconds.
+
+        measurement is the signed process value demand is computed from
+        (the temperature when cooling, its negation when heating).
+        """
+        derivative = 0.0
+        if self._measurement is None:
+            self._measurement = measurement
+        else:
+            filtered = self._measurement + self.derivative_alpha * (
+                measurement - self._measurement
+            )
+            derivative = (filtered - self._measurement) / dt
+            self._measurement = filtered
+
+        proportional = self.kp * demand + self.kd * derivative
+        integral = self.integral + self.ki * demand * dt
+        output = proportional + integral
+
+        # Conditional integration: hold the integral while saturated
+        if not (
+            (output > self.output_max and demand > 0) or (output < 0 and demand < 0)
+        ):
+            self.integral = min(max(integral, 0.0), self.output_max)
+
+        self.output = min(max(proportional + self.integral, 0.0), self.output_max)
+        return self.output
+
+    def level(self):
+        """Return the output quantized to the nearest fan level."""
+        return min(int(self.output + 0.5), self.output_max)
+
+    def as_dict(self):
+        """Return the controller state for storage."""
+        return {
+            "integral": self.integral,
+            "output": self.output,
+            "measurement": self._measurement,
+        }
+
+    def restore(self, data):
+        """Resume from a stored controller state, clamped to the output range."""
+        self.integral = min(max(float(data["integral"]), 0.0), self.output_max)
+        self.output = min(max(float(data["output"]), 0.0), self.output_max)
+        measurement = data.get("measurement")
+        self._measurement = None if measurement is None else float(measurement)
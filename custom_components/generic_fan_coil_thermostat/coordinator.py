@@ -0,0 +1,111 @@
+"""Shared state-change coordinator for Generic Fan Coil Thermostat."""
+
+import logging
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import DATA_COORDINATOR, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_temperature(state: State | None):
+    """Return the temperature of a sensor state, or None if it has none."""
+    if state is None or state.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+        return None
+
+    try:
+        return float(state.state)
+    except ValueError as ex:
+        _LOGGER.error("Unable to update from temperature sensor: %s", ex)
+        return None
+
+
+@callback
+def async_get_coordinator(hass: HomeAssistant):
+    """Return the coordinator shared by all thermostats, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_COORDINATOR not in domain_data:
+        domain_data[DATA_COORDINATOR] = StateChangeCoordinator(hass)
+    return domain_data[DATA_COORDINATOR]
+
+
+class StateChangeCoordinator:
+    """Route state changes of shared source entities to thermostats.
+
+    Each source entity is subscribed once, however many thermostats use it,
+    and a temperature sensor's state is parsed once per event before being
+    handed to every thermostat that reads it.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the coordinator."""
+        self.hass = hass
+        self._temperature_listeners = {}
+        self._state_listeners = {}
+        self._unsubscribers = {}
+
+    @property
+    def subscriptions(self):
+        """Return the number of source entities currently subscribed."""
+        return len(self._unsubscribers)
+
+    @callback
+    def async_track_temperature(self, entity_id, handler):
+        """Call handler(temperature) when a temperature sensor changes."""
+        return self._async_add_listener(self._temperature_listeners, entity_id, handler)
+
+    @callback
+    def async_track_state(self, entity_id, handler):
+        """Call handler(new_state) when an entity changes."""
+        return self._async_add_listener(self._state_listeners, entity_id, handler)
+
+    @callback
+    def _async_add_listener(self, index, entity_id, handler):
+        """Add handler to index and subscribe to entity_id if needed."""
+        index.setdefault(entity_id, []).append(handler)
+
+        if entity_id not in self._unsubscribers:
+            self._unsubscribers[entity_id] = async_track_state_change_event(
+                self.hass, [entity_id], self._async_state_changed
+            )
+
+        @callback
+        def _async_remove():
+            handlers = index.get(entity_id)
+            if handlers is None or handler not in handlers:
+                return
+            handlers.remove(handler)
+            if not handlers:
+                del index[entity_id]
+            if (
+                entity_id not in self._temperature_listeners
+                and entity_id not in self._state_listeners
+            ):
+                self._unsubscribers.pop(entity_id)()
+
+        return _async_remove
+
+    @callback
+    def _async_state_changed(self, event):
+        """Dispatch a state change to the thermostats using the entity."""
+        entity_id = event.data["entity_id"]
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            return
+
+        for handler in tuple(self._state_listeners.get(entity_id, ())):
+            handler(new_state)
+
+        temperature_handlers = self._temperature_listeners.get(entity_id)
+        if not temperature_handlers:
+            return
+
+        temperature = parse_temperature(new_state)
+        if temperature is None:
+            return
+
+        for handler in tuple(temperature_handlers):
+            handler(temperature)
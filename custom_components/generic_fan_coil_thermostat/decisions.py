@@ -0,0 +1,79 @@
+"""Bounded in-memory trace of control decisions."""
+
+from collections import deque
+import time
+
+from homeassistant.util import dt as dt_util
+
+
+class Decision:
+    """One control decision and the commands that followed it."""
+
+    __slots__ = (
+        "timestamp",
+        "temperature",
+        "diff",
+        "level",
+        "fan",
+        "switches",
+        "sent",
+        "skipped",
+    )
+
+    def __init__(self, temperature, diff, level, fan, switches):
+        """Initialize the decision."""
+        self.timestamp = time.time()
+        self.temperature = temperature
+        self.diff = diff
+        self.level = level
+        self.fan = fan
+        self.switches = switches
+        self.sent = []
+        self.skipped = []
+
+    def as_dict(self):
+        """Return the decision as plain data."""
+        return {
+            "timestamp": dt_util.utc_from_timestamp(self.timestamp).isoformat(),
+            "temperature": self.temperature,
+            "diff": self.diff,
+            "level": self.level,
+            "fan": self.fan,
+            "switches": self.switches,
+            "sent": list(self.sent),
+            "skipped": list(self.skipped),
+        }
+
+
+class DecisionTrace:
+    """Fixed-size ring buffer of the most recent control decisions.
+
+    Recording a decision costs one object and one deque append, and old
+    decisions fall off the end, so tracing can stay on for a whole fleet.
+    Commands are noted against the latest decision when they run.
+    """
+
+    def __init__(self, size):
+        """Initialize the trace."""
+        self._decisions = deque(maxlen=size)
+
+    def __len__(self):
+        """Return the number of decisions held."""
+        return len(self._decisions)
+
+    def record(self, temperature, diff, level, fan, switches):
+        """Record a decision and return it."""
+        decision = Decision(temperature, diff, level, fan, switches)
+        self._decisions.append(decision)
+        return decision
+
+    def note(self, command, sent):
+        """Note a command as sent or skipped against the latest decision."""
+        if not self._decisions:
+            return
+        decision = self._decisions[-1]
+        (decision.sent if sent else decision.skipped).append(command)
+
+    def as_list(self):
+        """Return the held decisions, oldest first."""
+        return [decision.as_dict() for decision in self._decisions]
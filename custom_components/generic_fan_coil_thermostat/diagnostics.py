@@ -0,0 +1,32 @@
+"""Diagnostics support for Generic Fan Coil Thermostat."""
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_THERMOSTATS, DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "data": dict(entry.data),
+        "options": dict(entry.options),
+        "thermostats": {
+            thermostat.entity_id: {
+                "state": thermostat.hvac_mode,
+                "hvac_action": thermostat.hvac_action,
+                "current_temperature": thermostat.current_temperature,
+                "target_temperature": thermostat.target_temperature,
+                "fan_mode": thermostat.fan_mode,
+                "attributes": thermostat.extra_state_attributes,
+                "circuit_breakers": thermostat.circuit_breakers,
+                "decisions": thermostat.decision_trace,
+                "runtime": {
+                    key: thermostat.runtime(key) for key in thermostat.runtime_keys
+                },
+            }
+            for thermostat in data.get(DATA_THERMOSTATS, [])
+        },
+    }
@@ -0,0 +1,213 @@
+"""Vectorized fleet control engine for Generic Fan Coil Thermostat."""
+
+import logging
+
+from homeassistant.components.climate.const import HVACMode
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DATA_ENGINE,
+    DEFAULT_BAND_THRESHOLDS,
+    DOMAIN,
+    FLEET_SWEEP_INTERVAL,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with Home Assistant
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+MODE_OFF = 0
+MODE_HEAT = 1
+MODE_COOL = 2
+
+_MODE_CODES = {HVACMode.HEAT: MODE_HEAT, HVACMode.COOL: MODE_COOL}
+
+
+def numpy_available():
+    """Return True if the vectorized engine can be used."""
+    return np is not None
+
+
+class FleetControlEngine:
+    """Compute fan levels for many zones in one vectorized pass.
+
+    Zone inputs live in contiguous arrays indexed by slot, and each zone's
+    band thresholds in a row of a matrix padded with infinity, so zones
+    with different numbers of fan speeds share one pass. evaluate() counts
+    the thresholds every zone's temperature difference has reached and
+    returns only the zones whose level differs from the one last applied,
+    so callers only act on the deltas. Level 0 means idle (fan off, switches
+    off); any higher level means the zone's switches are on. A zone only
+    drops out of a band once its demand falls below the band's threshold
+    less the zone's hysteresis.
+    """
+
+    def __init__(self, capacity=64, bands=len(DEFAULT_BAND_THRESHOLDS)):
+        """Initialize the engine."""
+        if np is None:
+            raise ImportError("The fleet control engine requires numpy")
+
+        self._slots = {}
+        self._zone_ids = []
+        self._free = []
+        self._size = 0
+        self._bands = bands
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        """Allocate (or grow) the zone arrays to capacity slots."""
+        size = self._size
+        thresholds = np.full((capacity, self._bands), np.inf)
+        current = np.full(capacity, np.nan)
+        target = np.full(capacity, np.nan)
+        mode = np.zeros(capacity, dtype=np.int8)
+        level = np.zeros(capacity, dtype=np.int8)
+        hysteresis = np.zeros(capacity)
+        if size:
+            current[:size] = self.current[:size]
+            target[:size] = self.target[:size]
+            mode[:size] = self.mode[:size]
+            level[:size] = self.level[:size]
+            hysteresis[:size] = self.hysteresis[:size]
+            thresholds[:size, : self.thresholds.shape[1]] = self.thresholds[:size]
+        self.thresholds = thresholds
+        self.current = current
+        self.target = target
+        self.mode = mode
+        self.level = level
+        self.hysteresis = hysteresis
+
+    def __len__(self):
+        """Return the number of zones."""
+        return len(self._slots)
+
+    def add_zone(self, zone_id, thresholds=DEFAULT_BAND_THRESHOLDS):
+        """Add a zone with its band thresholds and return its slot."""
+        if zone_id in self._slots:
+            return self._slots[zone_id]
+
+        if len(thresholds) > self._bands:
+            # Widen the threshold matrix for a fan with more speeds
+            self._bands = len(thresholds)
+            self._allocate(len(self.current))
+
+        if self._free:
+            slot = self._free.pop()
+            self._zone_ids[slot] = zone_id
+        else:
+            slot = self._size
+            if slot == len(self.current):
+                self._allocate(2 * len(self.current))
+            self._zone_ids.append(zone_id)
+            self._size += 1
+
+        self._slots[zone_id] = slot
+        self._reset_slot(slot)
+        self.thresholds[slot, : len(thresholds)] = thresholds
+        return slot
+
+    def remove_zone(self, zone_id):
+        """Remove a zone, freeing its slot for reuse."""
+        slot = self._slots.pop(zone_id, None)
+        if slot is None:
+            return
+        self._zone_ids[slot] = None
+        self._reset_slot(slot)
+        self._free.append(slot)
+
+    def _reset_slot(self, slot):
+        """Clear a slot so it is never reported by evaluate()."""
+        self.current[slot] = np.nan
+        self.target[slot] = np.nan
+        self.mode[slot] = MODE_OFF
+        self.level[slot] = 0
+        self.hysteresis[slot] = 0.0
+        self.thresholds[slot] = np.inf
+
+    def update_zone(self, zone_id, current, target, hvac_mode, level, hysteresis=0.0):
+        """Store a zone's inputs and the level it last applied."""
+        slot = self._slots[zone_id]
+        self.current[slot] = np.nan if current is None else current
+        self.target[slot] = np.nan if target is None else target
+        self.mode[slot] = _MODE_CODES.get(hvac_mode, MODE_OFF)
+        self.level[slot] = level
+        self.hysteresis[slot] = hysteresis
+
+    def compute_levels(self):
+        """Return the fan level and a validity mask for every slot."""
+        size = self._size
+        mode = self.mode[:size]
+        diff = self.current[:size] - self.target[:size]
+        demand = np.where(mode == MODE_COOL, diff, -diff)
+        applied = self.level[:size]
+        on_thresholds = self.thresholds[:size]
+        off_thresholds = on_thresholds - self.hysteresis[:size, np.newaxis]
+        up = np.count_nonzero(demand[:, np.newaxis] >= on_thresholds, axis=1)
+        down = np.count_nonzero(demand[:, np.newaxis] >= off_thresholds, axis=1)
+        levels = np.where(
+            up > applied, up, np.where(down < applied, down, applied)
+        ).astype(np.int8)
+        valid = (mode != MODE_OFF) & ~np.isnan(demand)
+        return levels, valid
+
+    def evaluate(self):
+        """Return (zone_id, level) for zones whose level changed, and apply it."""
+        levels, valid = self.compute_levels()
+        changed = np.flatnonzero(valid & (levels != self.level[: self._size]))
+        self.level[changed] = levels[changed]
+        return [(self._zone_ids[slot], int(levels[slot])) for slot in changed]
+
+
+@callback
+def async_get_engine(hass: HomeAssistant):
+    """Return the fleet sweep shared by all thermostats, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_ENGINE not in domain_data:
+        domain_data[DATA_ENGINE] = FleetSweep(hass)
+    return domain_data[DATA_ENGINE]
+
+
+class FleetSweep:
+    """Periodically re-evaluate every registered zone with one engine pass."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize the sweep."""
+        self.hass = hass
+        self.engine = FleetControlEngine()
+        self._appliers = {}
+        self._unsub_timer = None
+
+    @callback
+    def async_register(self, zone_id, apply_level, thresholds=DEFAULT_BAND_THRESHOLDS):
+        """Register a zone; apply_level(level) is called when its level changes."""
+        self.engine.add_zone(zone_id, thresholds)
+        self._appliers[zone_id] = apply_level
+
+        if self._unsub_timer is None:
+            self._unsub_timer = async_track_time_interval(
+                self.hass, self._async_sweep, FLEET_SWEEP_INTERVAL
+            )
+
+        @callback
+        def _async_unregister():
+            self.engine.remove_zone(zone_id)
+            self._appliers.pop(zone_id, None)
+            if not self._appliers and self._unsub_timer is not None:
+                self._unsub_timer()
+                self._unsub_timer = None
+
+        return _async_unregister
+
+    @callback
+    def _async_sweep(self, now=None):
+        """Evaluate all zones and apply the levels that changed."""
+        changed = self.engine.evaluate()
+        _LOGGER.debug(
+            "Fleet sweep over %d zones, %d changed", len(self.engine), len(changed)
+        )
+        for zone_id, level in changed:
+            self._appliers[zone_id](level)
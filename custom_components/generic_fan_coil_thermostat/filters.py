@@ -0,0 +1,99 @@
+"""Streaming temperature filters for Generic Fan Coil Thermostat."""
+
+from bisect import bisect_left, insort
+from collections import deque
+
+from .const import FILTER_EMA, FILTER_MEDIAN
+
+
+class EmaFilter:
+    """Exponential moving average of the readings.
+
+    Keeps only the running average, so memory does not grow with the
+    number of readings. A higher alpha follows new readings more closely.
+    """
+
+    def __init__(self, alpha):
+        """Initialize the filter."""
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.value = None
+
+    def update(self, reading):
+        """Add a reading and return the filtered value."""
+        if self.value is None:
+            self.value = reading
+        else:
+            self.value += self.alpha * (reading - self.value)
+        return self.value
+
+    def reset(self):
+        """Forget all readings."""
+        self.value = None
+
+    def as_dict(self):
+        """Return the filter state for storage."""
+        return {"value": self.value}
+
+    def restore(self, data):
+        """Resume from a stored filter state."""
+        value = data.get("value")
+        self.value = None if value is None else float(value)
+
+
+class MedianFilter:
+    """Median of the last window readings.
+
+    Readings are held in a fixed-size ring buffer alongside a sorted copy,
+    so one outlier in the window has no effect on the output.
+    """
+
+    def __init__(self, window):
+        """Initialize the filter."""
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self._readings = deque(maxlen=window)
+        self._sorted = []
+        self.value = None
+
+    def update(self, reading):
+        """Add a reading and return the filtered value."""
+        if len(self._readings) == self._readings.maxlen:
+            oldest = self._readings[0]
+            del self._sorted[bisect_left(self._sorted, oldest)]
+        self._readings.append(reading)
+        insort(self._sorted, reading)
+
+        count = len(self._sorted)
+        middle = count // 2
+        if count % 2:
+            self.value = self._sorted[middle]
+        else:
+            self.value = (self._sorted[middle - 1] + self._sorted[middle]) / 2
+        return self.value
+
+    def reset(self):
+        """Forget all readings."""
+        self._readings.clear()
+        self._sorted.clear()
+        self.value = None
+
+    def as_dict(self):
+        """Return the filter state for storage."""
+        return {"readings": list(self._readings)}
+
+    def restore(self, data):
+        """Resume from a stored filter state."""
+        self.reset()
+        for reading in data.get("readings", [])[-self._readings.maxlen :]:
+            self.update(float(reading))
+
+
+def create_filter(mode, alpha, window):
+    """Return the filter for mode, or None if filtering is off."""
+    if mode == FILTER_EMA:
+        return EmaFilter(alpha)
+    if mode == FILTER_MEDIAN:
+        return MedianFilter(window)
+    return None
@@ -0,0 +1,44 @@
+"""Runtime accounting for fan speeds and switch groups."""
+
+
+class RuntimeMeter:
+    """Integrate the seconds each key has spent running.
+
+    Keys start and stop as the commanded state changes, so keeping the totals
+    costs one update per command instead of a scan of the state history.
+    """
+
+    def __init__(self):
+        """Initialize the meter with nothing running."""
+        self._totals = {}
+        self._started = {}
+
+    def update(self, running, now):
+        """Set the keys running from now on."""
+        for key in self._started.keys() - running:
+            started = self._started.pop(key)
+            self._totals[key] = self._totals.get(key, 0.0) + max(
+                (now - started).total_seconds(), 0.0
+            )
+        for key in running - self._started.keys():
+            self._started[key] = now
+
+    def total(self, key, now):
+        """Return the seconds key has run, including a run still going."""
+        total = self._totals.get(key, 0.0)
+        if key in self._started:
+            total += max((now - self._started[key]).total_seconds(), 0.0)
+        return total
+
+    def as_dict(self, now):
+        """Return the totals up to now, for storage."""
+        return {key: self.total(key, now) for key in {*self._totals, *self._started}}
+
+    def restore(self, data):
+        """Resume the totals from as_dict().
+
+        Runs in progress are not restored; the time the thermostat was down
+        is not counted.
+        """
+        self._totals = {str(key): max(float(total), 0.0) for key, total in data.items()}
+        self._started = {}
@@ -0,0 +1,161 @@
+"""Setpoint schedules compiled into a timeline of transitions."""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from operator import itemgetter
+
+import voluptuous as vol
+
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    CONF_SCHEDULE_AT,
+    CONF_SCHEDULE_DATE,
+    CONF_SCHEDULE_DAYS,
+    CONF_SCHEDULE_EXCEPTIONS,
+    CONF_SCHEDULE_TEMPERATURE,
+    CONF_SCHEDULE_WEEKLY,
+    WEEKDAYS,
+)
+
+_AT = itemgetter(0)
+
+
+def _time_string(value):
+    """Validate a time of day, keeping it as a string for storage."""
+    return cv.time(value).isoformat()
+
+
+def _date_string(value):
+    """Validate a date, keeping it as a string for storage."""
+    return cv.date(value).isoformat()
+
+
+_TRANSITION = {
+    vol.Required(CONF_SCHEDULE_AT): _time_string,
+    vol.Required(CONF_SCHEDULE_TEMPERATURE): vol.Coerce(float),
+}
+
+# A weekly profile, and dates whose transitions replace that day's profile
+SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_SCHEDULE_WEEKLY, default=[]): [
+            {
+                vol.Required(CONF_SCHEDULE_DAYS): vol.All(
+                    cv.ensure_list, [vol.In(WEEKDAYS)]
+                ),
+                **_TRANSITION,
+            }
+        ],
+        vol.Optional(CONF_SCHEDULE_EXCEPTIONS, default=[]): [
+            {vol.Required(CONF_SCHEDULE_DATE): _date_string, **_TRANSITION}
+        ],
+    }
+)
+
+
+class SetpointSchedule:
+    """Target temperatures by weekday and time, with dated exceptions.
+
+    Each day's transitions are kept sorted, so the setpoint in effect and the
+    next transition are found with a binary search instead of by polling.
+    """
+
+    def __init__(self, weekly=None, exceptions=None):
+        """Initialize from transitions.
+
+        weekly maps a weekday number to (time, temperature) pairs, exceptions
+        maps a date to the pairs that replace that day's weekly ones.
+        """
+        weekly = weekly or {}
+        exceptions = exceptions or {}
+        self._weekly = [sorted(weekly.get(day, []), key=_AT) for day in range(7)]
+        self._exceptions = {
+            day: sorted(entries, key=_AT)
+            for day, entries in exceptions.items()
+            if entries
+        }
+        self._exception_dates = sorted(self._exceptions)
+
+    @classmethod
+    def from_config(cls, config):
+        """Compile a schedule validated by SCHEDULE_SCHEMA."""
+        weekly = {}
+        for entry in config.get(CONF_SCHEDULE_WEEKLY, []):
+            transition = (
+                time.fromisoformat(entry[CONF_SCHEDULE_AT]),
+                float(entry[CONF_SCHEDULE_TEMPERATURE]),
+            )
+            for day in entry[CONF_SCHEDULE_DAYS]:
+                weekly.setdefault(WEEKDAYS.index(day), []).append(transition)
+
+        exceptions = {}
+        for entry in config.get(CONF_SCHEDULE_EXCEPTIONS, []):
+            exceptions.setdefault(
+                date.fromisoformat(entry[CONF_SCHEDULE_DATE]), []
+            ).append(
+                (
+                    time.fromisoformat(entry[CONF_SCHEDULE_AT]),
+                    float(entry[CONF_SCHEDULE_TEMPERATURE]),
+                )
+            )
+        return cls(weekly, exceptions)
+
+    def __bool__(self):
+        """Return True if the schedule has any transitions."""
+        return any(self._weekly) or bool(self._exceptions)
+
+    def __eq__(self, other):
+        """Return True if other has the same transitions."""
+        if not isinstance(other, SetpointSchedule):
+            return NotImplemented
+        return (self._weekly, self._exceptions) == (other._weekly, other._exceptions)
+
+    def current(self, now):
+        """Return the last (datetime, temperature) transition at or before now.
+
+        now is an aware local datetime; None is returned for an empty schedule.
+        """
+        today = now.date()
+        for day in self._days_back(today):
+            entries = self._entries(day)
+            if day == today:
+                entries = entries[: bisect_right(entries, now.time(), key=_AT)]
+            if entries:
+                at, temperature = entries[-1]
+                return datetime.combine(day, at, now.tzinfo), temperature
+        return None
+
+    def next_transition(self, now):
+        """Return the first (datetime, temperature) transition after now."""
+        today = now.date()
+        for day in self._days_ahead(today):
+            entries = self._entries(day)
+            if day == today:
+                entries = entries[bisect_right(entries, now.time(), key=_AT) :]
+            if entries:
+                at, temperature = entries[0]
+                return datetime.combine(day, at, now.tzinfo), temperature
+        return None
+
+    def _entries(self, day):
+        """Return the sorted transitions of day."""
+        return self._exceptions.get(day, self._weekly[day.weekday()])
+
+    def _days_back(self, day):
+        """Yield the days to search for the transition in effect, newest first.
+
+        A week back always reaches every weekday; before that only exception
+        dates can hold a transition.
+        """
+        for offset in range(8):
+            yield day - timedelta(days=offset)
+        index = bisect_left(self._exception_dates, day - timedelta(days=7))
+        yield from reversed(self._exception_dates[:index])
+
+    def _days_ahead(self, day):
+        """Yield the days to search for the next transition, soonest first."""
+        for offset in range(8):
+            yield day + timedelta(days=offset)
+        index = bisect_right(self._exception_dates, day + timedelta(days=7))
+        yield from self._exception_dates[index:]
@@ -0,0 +1,117 @@
+"""Fleet-wide spreading of thermostat work over time."""
+
+from collections import deque
+from contextlib import suppress
+from datetime import datetime, timezone
+from functools import partial
+import zlib
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DATA_STAGGER,
+    DOMAIN,
+    STARTUP_RELEASE_INTERVAL,
+    STARTUP_RELEASE_SIZE,
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def phase_offset(key, period):
+    """Return a stable offset in [0, period) seconds for key.
+
+    The offset comes from a hash of the key, so it is the same after every
+    restart, and a fleet of keys lands evenly across the period.
+    """
+    return zlib.crc32(key.encode()) / 2**32 * period
+
+
+def seconds_until_slot(now, period, offset):
+    """Return the seconds from now until the next time at offset in the period.
+
+    Slots are aligned to the epoch, so thermostats with different offsets stay
+    apart however far apart they were started.
+    """
+    elapsed = ((now - _EPOCH).total_seconds() - offset) % period
+    return period - elapsed
+
+
+@callback
+def async_get_stagger(hass: HomeAssistant):
+    """Return the startup stagger shared by all thermostats."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_STAGGER not in domain_data:
+        domain_data[DATA_STAGGER] = StaggeredRelease(
+            hass, STARTUP_RELEASE_SIZE, STARTUP_RELEASE_INTERVAL
+        )
+    return domain_data[DATA_STAGGER]
+
+
+class StaggeredRelease:
+    """Run callbacks a few at a time, one group per slot.
+
+    Callbacks run straight away until the current slot holds a full group.
+    The rest wait for the following slots, so a fleet coming up together
+    sends its commands in waves instead of all at once.
+    """
+
+    def __init__(self, hass: HomeAssistant, size, interval):
+        """Initialize the stagger."""
+        self.hass = hass
+        self._size = size
+        self._interval = interval
+        self._queue = deque()
+        self._slot_start = None
+        self._slot_used = 0
+        self._unsub_slot = None
+
+    @callback
+    def async_schedule(self, action):
+        """Run action in the next free slot and return a cancel callable."""
+        now = dt_util.utcnow()
+        if (
+            self._slot_start is None
+            or (now - self._slot_start).total_seconds() >= self._interval
+        ):
+            self._slot_start = now
+            self._slot_used = 0
+
+        if not self._queue and self._slot_used < self._size:
+            self._slot_used += 1
+            action()
+            return partial(self._async_cancel, action)
+
+        self._queue.append(action)
+        if self._unsub_slot is None:
+            delay = self._interval - (now - self._slot_start).total_seconds()
+            self._unsub_slot = async_call_later(
+                self.hass, max(delay, 0), self._async_release
+            )
+        return partial(self._async_cancel, action)
+
+    @callback
+    def _async_cancel(self, action):
+        """Drop action if it has not run yet, and the slot timer with the last."""
+        with suppress(ValueError):
+            self._queue.remove(action)
+        if not self._queue and self._unsub_slot is not None:
+            self._unsub_slot()
+            self._unsub_slot = None
+
+    @callback
+    def _async_release(self, _now=None):
+        """Run the next group and wait for the following slot if any are left."""
+        self._unsub_slot = None
+        self._slot_start = dt_util.utcnow()
+        self._slot_used = 0
+        while self._queue and self._slot_used < self._size:
+            self._slot_used += 1
+            self._queue.popleft()()
+
+        if self._queue:
+            self._unsub_slot = async_call_later(
+                self.hass, self._interval, self._async_release
+            )
@@ -0,0 +1,55 @@
+"""Runtime sensors for the Generic Fan Coil Thermostat."""
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DATA_THERMOSTATS, DOMAIN, RUNTIME_UPDATE_INTERVAL
+
+# The totals are read from the thermostats, so polling bounds the write rate
+SCAN_INTERVAL = RUNTIME_UPDATE_INTERVAL
+PARALLEL_UPDATES = 0
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the runtime sensors of the entry's thermostats."""
+    thermostats = hass.data[DOMAIN][config_entry.entry_id][DATA_THERMOSTATS]
+    async_add_entities(
+        RuntimeSensor(thermostat, key)
+        for thermostat in thermostats
+        for key in thermostat.runtime_keys
+    )
+
+
+class RuntimeSensor(SensorEntity):
+    """Total hours a thermostat's fan speed or switch group has been running."""
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 2
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, thermostat, key):
+        """Initialize the sensor."""
+        self._thermostat = thermostat
+        self._key = key
+        self._attr_unique_id = f"{thermostat.unique_id}_{key}_runtime"
+        self._attr_name = f"{thermostat.name} {key.replace('_', ' ')} runtime"
+
+    @property
+    def native_value(self):
+        """Return the hours run so far."""
+        return round(self._thermostat.runtime(self._key) / 3600, 3)
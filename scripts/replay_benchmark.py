@@ -0,0 +1,295 @@
+"""Replay temperature traces through the thermostat controller offline.
+
+The harness builds a GenericFanCoilThermostat against a small in-memory
+stand-in for Home Assistant, feeds it every sample of a temperature trace and
+records the service calls it makes. Devices follow the commands they get, so
+the controller sees the same readback it would on a live install.
+
+Traces are CSV files with a ``timestamp`` and a ``temperature`` column (and an
+optional ``target`` column), or JSON lists of objects with the same keys.
+Timestamps are seconds or ISO 8601 strings.
+
+Run from the repository root:
+
+    python -m scripts.replay_benchmark trace.csv --mode cool --switches 2
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+from pathlib import Path
+import time
+
+from homeassistant.components.climate.const import HVACMode
+from homeassistant.const import ATTR_ENTITY_ID, STATE_OFF, STATE_ON
+from homeassistant.core import State
+
+from custom_components.generic_fan_coil_thermostat.climate import (
+    GenericFanCoilThermostat,
+)
+from custom_components.generic_fan_coil_thermostat.const import (
+    DEFAULT_MAX_TEMP,
+    DEFAULT_MIN_TEMP,
+    DEFAULT_TARGET_TEMP,
+    DEFAULT_TEMP_STEP,
+)
+
+FAN_ENTITY_ID = "fan.replay"
+SENSOR_ENTITY_ID = "sensor.replay_temperature"
+
+
+def load_trace(path):
+    """Return [(timestamp_seconds, temperature, target_or_None)] from a trace file."""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        rows = json.loads(path.read_text())
+    else:
+        with path.open(newline="") as trace_file:
+            rows = list(csv.DictReader(trace_file))
+
+    samples = []
+    for row in rows:
+        target = row.get("target")
+        samples.append(
+            (
+                _parse_timestamp(row["timestamp"]),
+                float(row["temperature"]),
+                float(target) if target not in (None, "") else None,
+            )
+        )
+    samples.sort(key=lambda sample: sample[0])
+    return samples
+
+
+def _parse_timestamp(value):
+    """Return a timestamp in seconds from a number or an ISO 8601 string."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(value).timestamp()
+
+
+class _ReplayServices:
+    """Record service calls and move the fake devices to the commanded state."""
+
+    def __init__(self, hass):
+        self._hass = hass
+        self.calls = Counter()
+
+    async def async_call(self, domain, service, data, blocking=False, **kwargs):
+        self.calls[f"{domain}.{service}"] += 1
+        entity_ids = data.get(ATTR_ENTITY_ID, [])
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+
+        for entity_id in entity_ids:
+            attributes = dict(self._hass.states.get_attributes(entity_id))
+            if service == "turn_off":
+                state = STATE_OFF
+            else:
+                state = STATE_ON
+                if "percentage" in data:
+                    attributes["percentage"] = data["percentage"]
+            self._hass.states.async_set(entity_id, state, attributes)
+
+
+class _ReplayStates:
+    """Minimal state machine holding the fake device states."""
+
+    def __init__(self):
+        self._states = {}
+
+    def get(self, entity_id):
+        return self._states.get(entity_id)
+
+    def get_attributes(self, entity_id):
+        state = self._states.get(entity_id)
+        return state.attributes if state is not None else {}
+
+    def async_set(self, entity_id, new_state, attributes=None):
+        self._states[entity_id] = State(entity_id, new_state, attributes)
+
+
+class ReplayHass:
+    """The parts of Home Assistant the thermostat uses, kept in memory."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.data = {}
+        self.states = _ReplayStates()
+        self.services = _ReplayServices(self)
+
+    def async_create_task(self, target, name=None, eager_start=True):
+        return self.loop.create_task(target, name=name)
+
+
+@dataclass
+class ReplayReport:
+    """Load figures from one trace replay."""
+
+    samples: int
+    simulated_hours: float
+    wall_seconds: float
+    state_writes: int
+    skipped_commands: int
+    calls_by_service: Counter = field(default_factory=Counter)
+    latencies: list = field(default_factory=list, repr=False)
+
+    @property
+    def evaluations_per_second(self):
+        """Return control evaluations per second of wall time."""
+        return self.samples / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def service_calls(self):
+        """Return the total number of service calls."""
+        return sum(self.calls_by_service.values())
+
+    @property
+    def calls_per_hour(self):
+        """Return service calls per hour of simulated time."""
+        if not self.simulated_hours:
+            return float(self.service_calls)
+        return self.service_calls / self.simulated_hours
+
+    def latency_percentile(self, percentile):
+        """Return a handler latency percentile in milliseconds."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+        return ordered[index] * 1000
+
+    def as_dict(self):
+        """Return the report as plain data."""
+        return {
+            "samples": self.samples,
+            "simulated_hours": self.simulated_hours,
+            "evaluations_per_second": self.evaluations_per_second,
+            "service_calls": self.service_calls,
+            "calls_per_hour": self.calls_per_hour,
+            "calls_by_service": dict(self.calls_by_service),
+            "skipped_commands": self.skipped_commands,
+            "state_writes": self.state_writes,
+            "latency_p50_ms": self.latency_percentile(50),
+            "latency_p99_ms": self.latency_percentile(99),
+        }
+
+    def format(self):
+        """Return the report as readable text."""
+        lines = [
+            f"samples:              {self.samples}",
+            f"simulated time:       {self.simulated_hours:.2f} h",
+            f"evaluations/s:        {self.evaluations_per_second:.0f}",
+            f"service calls:        {self.service_calls}"
+            f" ({self.calls_per_hour:.1f} per simulated hour)",
+        ]
+        lines.extend(
+            f"  {service:<20}{count}"
+            for service, count in self.calls_by_service.most_common()
+        )
+        lines.extend(
+            [
+                f"skipped commands:     {self.skipped_commands}",
+                f"state writes:         {self.state_writes}",
+                f"handler p50:          {self.latency_percentile(50):.3f} ms",
+                f"handler p99:          {self.latency_percentile(99):.3f} ms",
+            ]
+        )
+        return "\n".join(lines)
+
+
+async def async_replay(
+    samples,
+    hvac_mode=HVACMode.COOL,
+    target=DEFAULT_TARGET_TEMP,
+    switches=1,
+    **options,
+):
+    """Replay samples through a thermostat and return a ReplayReport."""
+    hass = ReplayHass(asyncio.get_running_loop())
+    hass.states.async_set(FAN_ENTITY_ID, STATE_OFF)
+    cooling = [f"switch.replay_cooling_{index}" for index in range(switches)]
+    heating = [f"switch.replay_heating_{index}" for index in range(switches)]
+    for switch_entity in cooling + heating:
+        hass.states.async_set(switch_entity, STATE_OFF)
+
+    thermostat = GenericFanCoilThermostat(
+        hass,
+        "replay",
+        SENSOR_ENTITY_ID,
+        FAN_ENTITY_ID,
+        cooling,
+        heating,
+        DEFAULT_MIN_TEMP,
+        DEFAULT_MAX_TEMP,
+        target,
+        DEFAULT_TEMP_STEP,
+        **options,
+    )
+    state_writes = 0
+
+    def _count_write():
+        nonlocal state_writes
+        state_writes += 1
+
+    thermostat.async_write_ha_state = _count_write
+    thermostat._attr_hvac_mode = hvac_mode
+
+    latencies = []
+    started = time.perf_counter()
+    for _timestamp, temperature, sample_target in samples:
+        if sample_target is not None:
+            thermostat._attr_target_temperature = sample_target
+        handler_start = time.perf_counter()
+        thermostat._async_temp_changed(temperature)
+        latencies.append(time.perf_counter() - handler_start)
+        await thermostat._actuators.async_wait()
+        # Let the merged state write of this event run
+        await asyncio.sleep(0)
+    wall_seconds = time.perf_counter() - started
+    thermostat._actuators.async_shutdown()
+
+    span = samples[-1][0] - samples[0][0] if samples else 0
+    return ReplayReport(
+        samples=len(samples),
+        simulated_hours=span / 3600,
+        wall_seconds=wall_seconds,
+        state_writes=state_writes,
+        skipped_commands=thermostat._skipped_commands,
+        calls_by_service=hass.services.calls,
+        latencies=latencies,
+    )
+
+
+def main(argv=None):
+    """Run the replay from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="CSV or JSON temperature trace")
+    parser.add_argument(
+        "--mode", choices=[HVACMode.COOL, HVACMode.HEAT], default=HVACMode.COOL
+    )
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET_TEMP)
+    parser.add_argument(
+        "--switches", type=int, default=1, help="switches per heating/cooling group"
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(
+        async_replay(
+            load_trace(args.trace),
+            hvac_mode=HVACMode(args.mode),
+            target=args.target,
+            switches=args.switches,
+        )
+    )
+    print(json.dumps(report.as_dict(), indent=2) if args.json else report.format())
+
+
+if __name__ == "__main__":
+    main()
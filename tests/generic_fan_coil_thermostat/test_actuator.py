@@ -0,0 +1,189 @@
+"""Test the Generic Fan Coil Thermostat actuator queue."""
+
+import asyncio
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_mock_service
+
+from custom_components.generic_fan_coil_thermostat.actuator import (
+    ActuatorQueue,
+    CircuitBreaker,
+    ServiceCallBatcher,
+)
+
+
+async def test_latest_target_wins(hass: HomeAssistant):
+    """Test a newer target replaces a stale pending one."""
+    applied = []
+
+    async def apply(target):
+        applied.append(target)
+
+    queue = ActuatorQueue(hass, "test")
+    queue.async_submit("fan", "low", apply)
+    queue.async_submit("fan", "high", apply)
+    queue.async_submit("fan", "off", apply)
+
+    assert queue.depth == 1
+    await hass.async_block_till_done()
+
+    assert applied == ["off"]
+    assert queue.superseded == 2
+    assert queue.depth == 0
+    assert queue.pending_tasks == 0
+
+
+async def test_flip_flop_collapses(hass: HomeAssistant):
+    """Test a switch returning to its applied state sends nothing."""
+    applied = []
+
+    async def apply(target):
+        applied.append(target)
+
+    queue = ActuatorQueue(hass, "test")
+    queue.async_submit("cooling", "off", apply)
+    await hass.async_block_till_done()
+    assert applied == ["off"]
+
+    queue.async_submit("cooling", "on", apply)
+    queue.async_submit("cooling", "off", apply)
+    assert queue.depth == 0
+    await hass.async_block_till_done()
+
+    assert applied == ["off"]
+
+
+async def test_commands_run_in_order_per_key(hass: HomeAssistant):
+    """Test commands for one key run in order while other keys do not wait."""
+    applied = []
+    release = asyncio.Event()
+
+    async def slow_apply(target):
+        await release.wait()
+        applied.append(("fan", target))
+
+    async def apply(target):
+        applied.append(("cooling", target))
+
+    queue = ActuatorQueue(hass, "test")
+    queue.async_submit("fan", "low", slow_apply)
+    await asyncio.sleep(0)
+    assert queue.pending_tasks == 1
+
+    queue.async_submit("cooling", "on", apply)
+    queue.async_submit("fan", "high", slow_apply)
+    assert queue.depth == 2
+    assert queue.pending_tasks == 3
+
+    # The switch group is applied while the fan command is still running
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert applied == [("cooling", "on")]
+    assert queue.pending_tasks == 2
+
+    release.set()
+    await queue.async_wait()
+
+    assert applied == [("cooling", "on"), ("fan", "low"), ("fan", "high")]
+    assert queue.pending_tasks == 0
+
+
+async def test_failed_command_is_not_applied(hass: HomeAssistant):
+    """Test a failing command does not count as applied."""
+    applied = []
+
+    async def failing_apply(target):
+        raise RuntimeError("bus error")
+
+    async def apply(target):
+        applied.append(target)
+
+    queue = ActuatorQueue(hass, "test")
+    queue.async_submit("cooling", "on", failing_apply)
+    await hass.async_block_till_done()
+
+    # The failed command left no baseline, so a later "on" is still sent
+    queue.async_submit("cooling", "off", apply)
+    queue.async_submit("cooling", "on", apply)
+    await hass.async_block_till_done()
+
+    assert applied == ["on"]
+
+
+async def test_batched_calls_are_merged(hass: HomeAssistant):
+    """Test identical calls inside the window become one service call."""
+    calls = async_mock_service(hass, "switch", "turn_on")
+    batcher = ServiceCallBatcher(hass)
+
+    await asyncio.gather(
+        batcher.async_call("switch", "turn_on", ["switch.a"], {}, 0.01),
+        batcher.async_call("switch", "turn_on", ["switch.b", "switch.a"], {}, 0.01),
+    )
+
+    assert len(calls) == 1
+    assert calls[0].data["entity_id"] == ["switch.a", "switch.b"]
+    assert batcher.merged_calls == 1
+
+
+async def test_batched_calls_split_by_parameters(hass: HomeAssistant):
+    """Test calls with different parameters are not merged."""
+    calls = async_mock_service(hass, "fan", "set_percentage")
+    batcher = ServiceCallBatcher(hass)
+
+    await asyncio.gather(
+        batcher.async_call("fan", "set_percentage", ["fan.a"], {"percentage": 33}, 0),
+        batcher.async_call("fan", "set_percentage", ["fan.b"], {"percentage": 33}, 0),
+        batcher.async_call("fan", "set_percentage", ["fan.c"], {"percentage": 66}, 0),
+    )
+
+    assert len(calls) == 2
+    by_percentage = {call.data["percentage"]: call.data["entity_id"] for call in calls}
+    assert by_percentage == {33: ["fan.a", "fan.b"], 66: ["fan.c"]}
+
+
+async def test_failed_batch_is_retried_per_caller(hass: HomeAssistant):
+    """Test a failing merged call only fails the caller whose call fails."""
+    calls = []
+
+    async def turn_on(call: ServiceCall):
+        calls.append(call.data["entity_id"])
+        if "switch.bad" in call.data["entity_id"]:
+            raise HomeAssistantError("relay offline")
+
+    hass.services.async_register("switch", "turn_on", turn_on)
+    batcher = ServiceCallBatcher(hass)
+
+    results = await asyncio.gather(
+        batcher.async_call("switch", "turn_on", ["switch.good"], {}, 0),
+        batcher.async_call("switch", "turn_on", ["switch.bad"], {}, 0),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], HomeAssistantError)
+    assert calls[0] == ["switch.good", "switch.bad"]
+    assert sorted(map(tuple, calls[1:])) == [("switch.bad",), ("switch.good",)]
+
+
+def test_circuit_breaker_backs_off_exponentially():
+    """Test a failing entity is skipped for twice as long after each failure."""
+    breaker = CircuitBreaker(timedelta(seconds=30), timedelta(seconds=100))
+    now = dt_util.utcnow()
+
+    assert breaker.allows("switch.bad", now)
+
+    assert breaker.record_failure("switch.bad", now) == timedelta(seconds=30)
+    assert not breaker.allows("switch.bad", now + timedelta(seconds=29))
+    assert breaker.allows("switch.bad", now + timedelta(seconds=30))
+    assert breaker.tripped == ["switch.bad"]
+
+    assert breaker.record_failure("switch.bad", now) == timedelta(seconds=60)
+    assert breaker.record_failure("switch.bad", now) == timedelta(seconds=100)
+    assert breaker.as_dict()["switch.bad"]["failures"] == 3
+
+    breaker.record_success("switch.bad")
+    assert breaker.allows("switch.bad", now)
+    assert breaker.tripped == []
@@ -0,0 +1,42 @@
+"""Test the Generic Fan Coil Thermostat sensor aggregation."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.generic_fan_coil_thermostat.aggregate import SensorAggregate
+
+
+@pytest.mark.parametrize(
+    ("mode", "expected"),
+    [("mean", 22.5), ("min", 21.0), ("max", 24.0), ("median", 22.5)],
+)
+def test_aggregation_modes(mode, expected):
+    """Test each aggregation mode over the latest reading of every sensor."""
+    aggregate = SensorAggregate(mode)
+    now = dt_util.utcnow()
+
+    aggregate.update("sensor.a", 20.0, now)
+    aggregate.update("sensor.b", 22.0, now)
+    aggregate.update("sensor.c", 23.0, now)
+    aggregate.update("sensor.d", 24.0, now)
+    # A new reading replaces the sensor's previous one
+    assert aggregate.update("sensor.a", 21.0, now) == expected
+    assert len(aggregate) == 4
+
+
+def test_stale_sensors_are_dropped():
+    """Test a sensor that stopped reporting no longer counts."""
+    aggregate = SensorAggregate("mean", timedelta(minutes=5))
+    now = dt_util.utcnow()
+
+    aggregate.update("sensor.a", 20.0, now)
+    aggregate.update("sensor.b", 24.0, now + timedelta(minutes=3))
+    assert aggregate.value == 22.0
+
+    assert aggregate.update("sensor.b", 23.0, now + timedelta(minutes=6)) == 23.0
+    assert len(aggregate) == 1
+
+    assert aggregate.expire(now + timedelta(minutes=12)) is None
+    assert len(aggregate) == 0
@@ -1,19 +1,56 @@
 """Test the Generic Fan Coil Thermostat climate platform."""
 
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
 from homeassistant.components.climate import HVACMode, HVACAction
-from homeassistant.const import STATE_OFF
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STARTED,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import CoreState, HomeAssistant, ServiceCall, State
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import json_bytes
 from homeassistant.setup import async_setup_component
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+    mock_restore_cache,
+    mock_restore_cache_with_extra_data,
+)
 
 from custom_components.generic_fan_coil_thermostat.const import (
     DOMAIN,
+    DATA_THERMOSTATS,
+    CONF_BATCH_WINDOW,
     CONF_CURRENT_TEMPERATURE_ENTITY_ID,
     CONF_FAN_ENTITY_ID,
     CONF_COOLING_SWITCHES,
+    CONF_DEBOUNCE_INTERVAL,
+    CONF_DEBOUNCE_MODE,
     CONF_HEATING_SWITCHES,
+    CONF_HYSTERESIS,
+    CONF_MIN_ON_TIME,
     CONF_MIN_TEMP,
     CONF_MAX_TEMP,
+    CONF_BAND_THRESHOLDS,
+    CONF_SPEED_PERCENTAGES,
+    CONF_TEMP_FILTER,
+    CONF_FILTER_WINDOW,
+    CONF_TEMPERATURE_SENSORS,
+    CONF_SENSOR_AGGREGATION,
+    CONF_SENSOR_STALE_TIMEOUT,
+    CONF_CONTROL_MODE,
+    CONF_PID_SAMPLE_INTERVAL,
+    CONF_RESYNC_INTERVAL,
+    CONF_SCHEDULE,
+    UNRECORDED_ATTRIBUTES,
 )
 
 
@@ -397,3 +434,1219 @@ async def test_turn_off_service(hass: HomeAssistant):
 
     state = hass.states.get("climate.generic_fan_coil_thermostat")
     assert state.state == HVACMode.OFF
+
+
+async def test_unchanged_decision_skips_service_calls(hass: HomeAssistant):
+    """Test repeated decisions are not re-sent when devices already match."""
+    fan_on = async_mock_service(hass, "fan", "turn_on")
+    fan_percentage = async_mock_service(hass, "fan", "set_percentage")
+    switch_on = async_mock_service(hass, "switch", "turn_on")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.cool1"],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "23")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    hass.states.async_set("switch.cool1", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    # The stopped fan is turned on at its speed in one call
+    assert len(fan_on) == 1
+    assert fan_on[0].data["percentage"] == 33
+    assert fan_percentage == []
+    assert len(switch_on) == 1
+
+    # Devices report the commanded state
+    hass.states.async_set("fan.test_fan", STATE_ON, {"percentage": 33})
+    hass.states.async_set("switch.cool1", STATE_ON)
+    await hass.async_block_till_done()
+
+    # Still in the low band, nothing should be sent again
+    hass.states.async_set("sensor.temperature", "23.2")
+    await hass.async_block_till_done()
+
+    assert len(fan_on) == 1
+    assert fan_percentage == []
+    assert len(switch_on) == 1
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["skipped_commands"] == 2
+
+
+async def test_drifted_device_is_commanded_again(hass: HomeAssistant):
+    """Test a device that no longer matches the cached command is re-sent."""
+    switch_on = async_mock_service(hass, "switch", "turn_on")
+    async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "set_percentage")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.cool1"],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "23")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    hass.states.async_set("switch.cool1", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert len(switch_on) == 1
+
+    # Switch was never turned on, so the next evaluation re-sends it
+    hass.states.async_set("sensor.temperature", "23.2")
+    await hass.async_block_till_done()
+
+    assert len(switch_on) == 2
+    assert switch_on[1].data["entity_id"] == ["switch.cool1"]
+
+
+async def _setup_debounced_cooling(hass: HomeAssistant, mode: str):
+    """Set up a cooling thermostat with debounced temperature updates."""
+    percentages = async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "turn_off")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+        options={CONF_DEBOUNCE_MODE: mode, CONF_DEBOUNCE_INTERVAL: 5},
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "20")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    return percentages
+
+
+async def test_trailing_debounce_coalesces_burst(hass: HomeAssistant):
+    """Test a burst of sensor updates is evaluated once on the latest value."""
+    percentages = await _setup_debounced_cooling(hass, "trailing")
+
+    for value in ("23", "24", "25"):
+        hass.states.async_set("sensor.temperature", value)
+        await hass.async_block_till_done()
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["current_temperature"] == 20.0
+    assert percentages == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["current_temperature"] == 25.0
+    assert len(percentages) == 1
+    assert percentages[0].data["percentage"] == 100
+
+
+async def test_leading_debounce_runs_first_update_immediately(hass: HomeAssistant):
+    """Test leading debounce evaluates at once, then the latest value later."""
+    percentages = await _setup_debounced_cooling(hass, "leading")
+
+    hass.states.async_set("sensor.temperature", "23")
+    await hass.async_block_till_done()
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["current_temperature"] == 23.0
+    assert len(percentages) == 1
+
+    hass.states.async_set("sensor.temperature", "24")
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.temperature", "25")
+    await hass.async_block_till_done()
+    assert len(percentages) == 1
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["current_temperature"] == 25.0
+    assert len(percentages) == 2
+    assert percentages[1].data["percentage"] == 100
+
+
+async def test_hysteresis_and_min_on_time_limit_cycling(hass: HomeAssistant, freezer):
+    """Test a hovering reading and a quick drop do not toggle the outputs."""
+    switch_on = async_mock_service(hass, "switch", "turn_on")
+    switch_off = async_mock_service(hass, "switch", "turn_off")
+    async_mock_service(hass, "fan", "turn_on")
+    fan_off = async_mock_service(hass, "fan", "turn_off")
+    async_mock_service(hass, "fan", "set_percentage")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.cool1"],
+        },
+        options={CONF_HYSTERESIS: 0.2, CONF_MIN_ON_TIME: 300},
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "22.5")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    hass.states.async_set("switch.cool1", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert len(switch_on) == 1
+    hass.states.async_set("switch.cool1", STATE_ON)
+
+    # Hovering just under the on threshold keeps the low band
+    for value in ("22.45", "22.5", "22.4", "22.35"):
+        hass.states.async_set("sensor.temperature", value)
+        await hass.async_block_till_done()
+    assert switch_off == []
+    assert fan_off == []
+
+    # Below the off threshold, but the switch and fan have not run long enough
+    hass.states.async_set("sensor.temperature", "22.0")
+    await hass.async_block_till_done()
+    assert switch_off == []
+    assert fan_off == []
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["hvac_action"] == HVACAction.COOLING
+
+    freezer.tick(timedelta(seconds=301))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert len(switch_off) == 1
+    assert len(fan_off) == 1
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["hvac_action"] == HVACAction.IDLE
+
+
+async def test_batch_window_merges_switch_calls_across_zones(hass: HomeAssistant):
+    """Test zones reacting to the same event share one switch call."""
+    switch_on = async_mock_service(hass, "switch", "turn_on")
+    async_mock_service(hass, "switch", "turn_off")
+    async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "turn_off")
+    async_mock_service(hass, "fan", "set_percentage")
+
+    for zone in ("1", "2"):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Zone {zone}",
+            data={
+                CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+                CONF_FAN_ENTITY_ID: f"fan.zone_{zone}",
+                CONF_COOLING_SWITCHES: [f"switch.cool_{zone}"],
+            },
+            options={CONF_BATCH_WINDOW: 20},
+        )
+        entry.add_to_hass(hass)
+        hass.states.async_set(f"fan.zone_{zone}", STATE_OFF)
+        hass.states.async_set(f"switch.cool_{zone}", STATE_OFF)
+
+    hass.states.async_set("sensor.temperature", "20")
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {"entity_id": "all", "hvac_mode": HVACMode.COOL},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.temperature", "23")
+    await hass.async_block_till_done()
+
+    assert len(switch_on) == 1
+    assert sorted(switch_on[0].data["entity_id"]) == ["switch.cool_1", "switch.cool_2"]
+
+
+async def test_configured_speed_table(hass: HomeAssistant):
+    """Test a four-speed fan gets its own modes, bands and percentages."""
+    percentages = async_mock_service(hass, "fan", "turn_on")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+        options={
+            CONF_BAND_THRESHOLDS: [0.5, 1.0, 2.0, 3.0],
+            CONF_SPEED_PERCENTAGES: [25, 50, 75, 100],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "24.5")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["fan_modes"] == [
+        "off",
+        "speed_1",
+        "speed_2",
+        "speed_3",
+        "speed_4",
+        "auto",
+    ]
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert len(percentages) == 1
+    assert percentages[0].data["percentage"] == 75
+
+
+async def test_running_fan_only_changes_speed(hass: HomeAssistant):
+    """Test a speed change on a running fan is a single set_percentage call."""
+    fan_on = async_mock_service(hass, "fan", "turn_on")
+    fan_percentage = async_mock_service(hass, "fan", "set_percentage")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "25")
+    hass.states.async_set("fan.test_fan", STATE_ON, {"percentage": 33})
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert fan_on == []
+    assert len(fan_percentage) == 1
+    assert fan_percentage[0].data["percentage"] == 100
+
+
+async def test_failing_switch_trips_circuit_breaker(hass: HomeAssistant, freezer):
+    """Test a dead switch is skipped until its retry window comes round."""
+    calls = []
+
+    async def turn_on(call: ServiceCall):
+        calls.append(call.data["entity_id"])
+        if "switch.bad" in call.data["entity_id"]:
+            raise HomeAssistantError("relay offline")
+
+    hass.services.async_register("switch", "turn_on", turn_on)
+    async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "set_percentage")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.good", "switch.bad"],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "23")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    hass.states.async_set("switch.good", STATE_OFF)
+    hass.states.async_set("switch.bad", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    # The group call fails, then each switch is tried on its own
+    assert calls[0] == ["switch.good", "switch.bad"]
+    assert sorted(calls[1:]) == ["switch.bad", "switch.good"]
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["tripped_switches"] == ["switch.bad"]
+
+    # The next reading does not call the tripped switch again
+    hass.states.async_set("switch.good", STATE_ON)
+    hass.states.async_set("sensor.temperature", "23.1")
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+    # Once the retry window has passed it is tried again
+    freezer.tick(timedelta(seconds=31))
+    hass.states.async_set("sensor.temperature", "23.2")
+    await hass.async_block_till_done()
+    assert calls[3] == ["switch.bad"]
+
+
+async def test_median_filter_ignores_sensor_spike(hass: HomeAssistant):
+    """Test control uses the filtered temperature and both values are exposed."""
+    fan_on = async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "turn_off")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+        options={CONF_TEMP_FILTER: "median", CONF_FILTER_WINDOW: 3},
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "22.0")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+
+    for value in ("22.1", "25.0"):
+        hass.states.async_set("sensor.temperature", value)
+        await hass.async_block_till_done()
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["raw_temperature"] == 25.0
+    assert state.attributes["current_temperature"] == 22.1
+    assert fan_on == []
+
+
+async def test_multiple_sensors_are_aggregated(hass: HomeAssistant, freezer):
+    """Test the zone temperature combines its sensors and drops silent ones."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_TEMPERATURE_SENSORS: ["sensor.window", "sensor.door"],
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+        options={CONF_SENSOR_AGGREGATION: "max", CONF_SENSOR_STALE_TIMEOUT: 600},
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "21")
+    hass.states.async_set("sensor.window", "23")
+    hass.states.async_set("sensor.door", "22")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["current_temperature"] == 23.0
+
+    hass.states.async_set("sensor.door", "24")
+    await hass.async_block_till_done()
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["current_temperature"] == 24.0
+
+    # Only the main sensor keeps reporting
+    for value in ("21.5", "21.6", "21.7"):
+        freezer.tick(timedelta(seconds=300))
+        hass.states.async_set("sensor.temperature", value)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["current_temperature"] == 21.7
+
+
+async def test_pid_mode_acts_on_sample_clock(hass: HomeAssistant, freezer):
+    """Test PID mode only changes the fan speed when its sample timer runs."""
+    fan_on = async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "turn_off")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+        options={CONF_CONTROL_MODE: "pid", CONF_PID_SAMPLE_INTERVAL: 30},
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "22")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+
+    # Readings alone do not change the speed
+    hass.states.async_set("sensor.temperature", "24")
+    await hass.async_block_till_done()
+    assert fan_on == []
+
+    freezer.tick(timedelta(seconds=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert len(fan_on) == 1
+    assert fan_on[0].data["percentage"] == 66
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["control_output"] == 2.12
+
+
+async def test_pid_waits_for_first_run(hass: HomeAssistant, freezer):
+    """Test PID samples before startup do not wind up the controller."""
+    fan_on = async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "turn_off")
+    hass.set_state(CoreState.starting)
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+        options={CONF_CONTROL_MODE: "pid", CONF_PID_SAMPLE_INTERVAL: 30},
+    )
+    entry.add_to_hass(hass)
+
+    mock_restore_cache(
+        hass,
+        (
+            State(
+                "climate.generic_fan_coil_thermostat",
+                HVACMode.COOL,
+                {"temperature": 22, "fan_mode": "auto"},
+            ),
+        ),
+    )
+
+    hass.states.async_set("sensor.temperature", "24")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    for _ in range(4):
+        freezer.tick(timedelta(seconds=30))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    thermostat = hass.data[DOMAIN][entry.entry_id][DATA_THERMOSTATS][0]
+    assert thermostat.extra_state_attributes["control_output"] == 0.0
+    assert fan_on == []
+
+    hass.set_state(CoreState.running)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done()
+
+    # The first sample after startup matches a controller that never waited
+    freezer.tick(timedelta(seconds=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(fan_on) == 1
+    assert fan_on[0].data["percentage"] == 66
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["control_output"] == 2.12
+
+
+async def test_resync_resends_only_drifted_actuators(hass: HomeAssistant, freezer):
+    """Test the periodic resync corrects a switch that ignored its command."""
+    switch_on = async_mock_service(hass, "switch", "turn_on")
+    fan_on = async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "set_percentage")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.cool1", "switch.cool2"],
+        },
+        options={CONF_RESYNC_INTERVAL: 60},
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "23")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    hass.states.async_set("switch.cool1", STATE_OFF)
+    hass.states.async_set("switch.cool2", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert len(fan_on) == 1
+    assert len(switch_on) == 1
+
+    # The fan and one switch follow the commands, the other switch does not
+    hass.states.async_set("fan.test_fan", STATE_ON, {"percentage": 33})
+    hass.states.async_set("switch.cool1", STATE_ON)
+    await hass.async_block_till_done()
+    assert len(switch_on) == 1
+
+    # The next resync re-sends only the switch that is still off
+    freezer.tick(timedelta(seconds=60))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert len(fan_on) == 1
+    assert len(switch_on) == 2
+    assert switch_on[1].data["entity_id"] == ["switch.cool2"]
+
+    # Once every device follows, a resync sends nothing
+    hass.states.async_set("switch.cool2", STATE_ON)
+    freezer.tick(timedelta(seconds=60))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(fan_on) == 1
+    assert len(switch_on) == 2
+
+
+async def test_first_control_run_waits_for_fan(hass: HomeAssistant):
+    """Test no commands are sent until the fan reports a valid state."""
+    fan_on = async_mock_service(hass, "fan", "turn_on")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "24")
+    hass.states.async_set("fan.test_fan", STATE_UNAVAILABLE)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    hass.states.async_set("sensor.temperature", "24.2")
+    await hass.async_block_till_done()
+    assert fan_on == []
+
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    await hass.async_block_till_done()
+
+    assert len(fan_on) == 1
+    assert fan_on[0].data["percentage"] == 66
+
+
+async def test_live_options_rerun_control_only_when_needed(hass: HomeAssistant):
+    """Test new fan bands re-run control only if they move the fan level."""
+    fan_on = async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "set_percentage")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "23")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert len(fan_on) == 1
+    assert fan_on[0].data["percentage"] == 33
+
+    # A gap of 1°C stays in the low band, so nothing is re-sent
+    hass.config_entries.async_update_entry(entry, options={CONF_HYSTERESIS: 0.2})
+    await hass.async_block_till_done()
+    assert len(fan_on) == 1
+
+    # Lower thresholds put the same gap in the medium band
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_HYSTERESIS: 0.2, CONF_BAND_THRESHOLDS: [0.3, 0.8, 2.0]}
+    )
+    await hass.async_block_till_done()
+    assert len(fan_on) == 2
+    assert fan_on[1].data["percentage"] == 66
+
+
+async def test_restored_controller_skips_satisfied_commands(hass: HomeAssistant):
+    """Test a restart does not resend commands the devices still satisfy."""
+    fan_on = async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "set_percentage")
+    switch_on = async_mock_service(hass, "switch", "turn_on")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.cool1"],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    mock_restore_cache_with_extra_data(
+        hass,
+        (
+            (
+                State(
+                    "climate.generic_fan_coil_thermostat",
+                    HVACMode.COOL,
+                    {"temperature": 22, "fan_mode": "auto"},
+                ),
+                {
+                    "level": 1,
+                    "fan": "low",
+                    "switches": {"switch.cool1": STATE_ON},
+                    "desired": {"fan": "low", "cooling": STATE_ON},
+                    "dwell": {},
+                },
+            ),
+        ),
+    )
+
+    hass.states.async_set("sensor.temperature", "23")
+    hass.states.async_set("fan.test_fan", STATE_ON, {"percentage": 33})
+    hass.states.async_set("switch.cool1", STATE_ON)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    assert fan_on == []
+    assert switch_on == []
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.state == HVACMode.COOL
+    assert state.attributes["skipped_commands"] == 2
+
+
+async def test_restored_targets_wait_for_first_run(hass: HomeAssistant, freezer):
+    """Test restored targets are not re-sent by the resync before startup."""
+    fan_on = async_mock_service(hass, "fan", "turn_on")
+    switch_on = async_mock_service(hass, "switch", "turn_on")
+    hass.set_state(CoreState.starting)
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.cool1"],
+        },
+        options={CONF_RESYNC_INTERVAL: 30},
+    )
+    entry.add_to_hass(hass)
+
+    mock_restore_cache_with_extra_data(
+        hass,
+        (
+            (
+                State(
+                    "climate.generic_fan_coil_thermostat",
+                    HVACMode.COOL,
+                    {"temperature": 22, "fan_mode": "auto"},
+                ),
+                {
+                    "level": 3,
+                    "fan": "high",
+                    "switches": {"switch.cool1": STATE_ON},
+                    "desired": {"fan": "high", "cooling": STATE_ON},
+                    "dwell": {},
+                },
+            ),
+        ),
+    )
+
+    hass.states.async_set("sensor.temperature", "25")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    hass.states.async_set("switch.cool1", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(seconds=31))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert fan_on == []
+    assert switch_on == []
+
+    # The first control run sends them once Home Assistant has started
+    hass.set_state(CoreState.running)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done()
+    assert len(fan_on) == 1
+    assert len(switch_on) == 1
+
+    # The run took a free slot at once, leaving no cancel handle behind
+    thermostat = hass.data[DOMAIN][entry.entry_id][DATA_THERMOSTATS][0]
+    assert thermostat._unsub_first_run is None
+
+
+async def test_readback_drift_is_corrected_and_counted(hass: HomeAssistant, freezer):
+    """Test a switch turned off by hand is turned back on and counted."""
+    switch_on = async_mock_service(hass, "switch", "turn_on")
+    async_mock_service(hass, "fan", "turn_on")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.cool1"],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "23")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    hass.states.async_set("switch.cool1", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert len(switch_on) == 1
+
+    # The switch takes two seconds to report the command
+    freezer.tick(timedelta(seconds=2))
+    hass.states.async_set("switch.cool1", STATE_ON)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["convergence_time"] == 2
+    assert state.attributes["drift_events"] == 0
+
+    # Turned off by hand, it is drifted until the command brings it back
+    hass.states.async_set("switch.cool1", STATE_OFF)
+    await hass.async_block_till_done()
+
+    assert len(switch_on) == 2
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["drifted_actuators"] == []
+
+    # The counter alone does not write the state, it shows with the next write
+    thermostat = hass.data[DOMAIN][entry.entry_id][DATA_THERMOSTATS][0]
+    assert thermostat.extra_state_attributes["drift_events"] == 1
+
+
+async def test_state_writes_are_merged_and_skipped(hass: HomeAssistant):
+    """Test updates that change nothing are not written, and bursts write once."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "20")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    thermostat = hass.data[DOMAIN][entry.entry_id][DATA_THERMOSTATS][0]
+    with patch.object(
+        thermostat, "async_write_ha_state", wraps=thermostat.async_write_ha_state
+    ) as write:
+        # Fan attributes the thermostat does not expose
+        for step in range(5):
+            hass.states.async_set("fan.test_fan", STATE_OFF, {"step": step})
+            await hass.async_block_till_done()
+        assert write.call_count == 0
+
+        # Several updates in one loop iteration are written once
+        thermostat._async_temp_changed(20.5)
+        thermostat._async_temp_changed(20.6)
+        await hass.async_block_till_done()
+        assert write.call_count == 1
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["current_temperature"] == 20.6
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {CONF_TEMP_FILTER: "ema"},
+        {CONF_CONTROL_MODE: "pid", CONF_PID_SAMPLE_INTERVAL: 30},
+    ],
+)
+async def test_recorded_attribute_size(hass: HomeAssistant, freezer, options):
+    """Test the recorded bytes per write stay flat while volatile values churn."""
+    async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "set_percentage")
+    async_mock_service(hass, "switch", "turn_on")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.cool1"],
+        },
+        options=options,
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "23.0")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    hass.states.async_set("switch.cool1", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    hass.states.async_set("switch.cool1", STATE_ON)
+
+    recorded_sizes = set()
+    volatile = []
+    for temperature in ("23.4", "23.1", "23.8", "23.3", "23.6"):
+        freezer.tick(timedelta(seconds=31))
+        hass.states.async_set("sensor.temperature", temperature)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+        state = hass.states.get("climate.generic_fan_coil_thermostat")
+        assert state.attributes["hvac_action"] == HVACAction.COOLING
+        excluded = state.state_info["unrecorded_attributes"]
+        assert UNRECORDED_ATTRIBUTES <= excluded
+        recorded = {
+            key: value for key, value in state.attributes.items() if key not in excluded
+        }
+        assert not recorded.keys() & UNRECORDED_ATTRIBUTES
+
+        recorded_sizes.add(len(json_bytes(recorded)))
+        volatile.append(
+            {key: state.attributes.get(key) for key in UNRECORDED_ATTRIBUTES}
+        )
+
+    # The volatile attributes changed between writes, the recorded bytes did not
+    assert any(before != after for before, after in zip(volatile, volatile[1:]))
+    assert len(recorded_sizes) == 1
+
+
+async def test_schedule_sets_target_at_transitions(hass: HomeAssistant, freezer):
+    """Test scheduled setpoints apply at their time and hold manual changes."""
+    monday = datetime(2026, 10, 19, 6, 0, tzinfo=dt_util.get_default_time_zone())
+    freezer.move_to(monday)
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+        options={
+            CONF_SCHEDULE: {
+                "weekly": [
+                    {"days": ["mon"], "at": "06:30:00", "temperature": 21.0},
+                    {"days": ["mon"], "at": "22:00:00", "temperature": 18.0},
+                ],
+                "exceptions": [],
+            },
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "20")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    # Last Monday evening's setpoint is in effect
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["temperature"] == 18.0
+
+    freezer.move_to(monday.replace(minute=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["temperature"] == 21.0
+
+    # A manual change holds until the next transition
+    await hass.services.async_call(
+        "climate",
+        "set_temperature",
+        {"entity_id": "climate.generic_fan_coil_thermostat", "temperature": 23.0},
+        blocking=True,
+    )
+    freezer.move_to(monday.replace(hour=21))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["temperature"] == 23.0
+
+    freezer.move_to(monday.replace(hour=22))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["temperature"] == 18.0
+
+
+async def test_repeated_reading_with_nothing_to_send_is_not_written(
+    hass: HomeAssistant,
+):
+    """Test a control run that only skips commands does not write the state."""
+    async_mock_service(hass, "switch", "turn_on")
+    async_mock_service(hass, "fan", "turn_on")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.cool1"],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "25")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    hass.states.async_set("switch.cool1", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    hass.states.async_set("fan.test_fan", STATE_ON, {"percentage": 100})
+    hass.states.async_set("switch.cool1", STATE_ON)
+    await hass.async_block_till_done()
+
+    thermostat = hass.data[DOMAIN][entry.entry_id][DATA_THERMOSTATS][0]
+    with patch.object(
+        thermostat, "async_write_ha_state", wraps=thermostat.async_write_ha_state
+    ) as write:
+        for step in range(5):
+            hass.states.async_set("sensor.temperature", "25", {"step": step})
+            await hass.async_block_till_done()
+
+    assert write.call_count == 0
+    assert thermostat.extra_state_attributes["skipped_commands"] == 10
+
+
+async def test_fan_rounding_its_percentage_is_not_resent(hass: HomeAssistant):
+    """Test a fan reporting its own step for the commanded speed is left alone."""
+    fan_on = async_mock_service(hass, "fan", "turn_on")
+    set_percentage = async_mock_service(hass, "fan", "set_percentage")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "22.6")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert fan_on[0].data["percentage"] == 33
+
+    # A four-step fan runs the requested 33% at 25%
+    hass.states.async_set("fan.test_fan", STATE_ON, {"percentage": 25})
+    await hass.async_block_till_done()
+    for value in ("22.7", "22.8", "22.9", "23.0"):
+        hass.states.async_set("sensor.temperature", value)
+        await hass.async_block_till_done()
+
+    assert len(fan_on) == 1
+    assert set_percentage == []
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["drifted_actuators"] == []
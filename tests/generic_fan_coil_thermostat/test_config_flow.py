@@ -15,10 +15,53 @@ from custom_components.generic_fan_coil_thermostat.const import (
     CONF_MAX_TEMP,
     CONF_TARGET_TEMP,
     CONF_TEMP_STEP,
+    CONF_DEBOUNCE_MODE,
+    CONF_DEBOUNCE_INTERVAL,
+    CONF_BATCH_WINDOW,
+    CONF_FLEET_ENGINE,
+    CONF_HYSTERESIS,
+    CONF_MIN_ON_TIME,
+    CONF_MIN_OFF_TIME,
+    CONF_BAND_THRESHOLDS,
+    CONF_SPEED_PERCENTAGES,
+    CONF_TEMP_FILTER,
+    CONF_FILTER_ALPHA,
+    CONF_FILTER_WINDOW,
+    CONF_TEMPERATURE_SENSORS,
+    CONF_SENSOR_AGGREGATION,
+    CONF_SENSOR_STALE_TIMEOUT,
+    CONF_CONTROL_MODE,
+    CONF_PID_KP,
+    CONF_PID_KI,
+    CONF_PID_KD,
+    CONF_PID_SAMPLE_INTERVAL,
+    CONF_RESYNC_INTERVAL,
+    CONF_SCHEDULE,
+    CONF_ZONES,
     DEFAULT_MIN_TEMP,
     DEFAULT_MAX_TEMP,
     DEFAULT_TARGET_TEMP,
     DEFAULT_TEMP_STEP,
+    DEFAULT_DEBOUNCE_MODE,
+    DEFAULT_DEBOUNCE_INTERVAL,
+    DEFAULT_BATCH_WINDOW,
+    DEFAULT_FLEET_ENGINE,
+    DEFAULT_HYSTERESIS,
+    DEFAULT_MIN_ON_TIME,
+    DEFAULT_MIN_OFF_TIME,
+    DEFAULT_BAND_THRESHOLDS,
+    DEFAULT_SPEED_PERCENTAGES,
+    DEFAULT_TEMP_FILTER,
+    DEFAULT_FILTER_ALPHA,
+    DEFAULT_FILTER_WINDOW,
+    DEFAULT_SENSOR_AGGREGATION,
+    DEFAULT_SENSOR_STALE_TIMEOUT,
+    DEFAULT_CONTROL_MODE,
+    DEFAULT_PID_KP,
+    DEFAULT_PID_KI,
+    DEFAULT_PID_KD,
+    DEFAULT_PID_SAMPLE_INTERVAL,
+    DEFAULT_RESYNC_INTERVAL,
 )
 
 
@@ -52,6 +95,7 @@ async def test_user_flow_minimum_config(hass: HomeAssistant):
     assert result["title"] == "Generic Fan Coil Thermostat - fan.test_fan"
     assert result["data"] == {
         CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+        CONF_TEMPERATURE_SENSORS: [],
         CONF_FAN_ENTITY_ID: "fan.test_fan",
         CONF_COOLING_SWITCHES: [],
         CONF_HEATING_SWITCHES: [],
@@ -171,6 +215,38 @@ async def test_user_flow_duplicate_entry(hass: HomeAssistant):
     assert result["reason"] == "already_configured"
 
 
+async def test_import_flow_creates_and_updates_fleet(hass: HomeAssistant):
+    """Test YAML zones go into one fleet entry that later imports update."""
+    zones = [
+        {
+            "name": "Office",
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.office",
+            CONF_FAN_ENTITY_ID: "fan.office",
+        }
+    ]
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_IMPORT},
+        data={CONF_ZONES: zones},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_ZONES: zones}
+
+    zones = [*zones, {**zones[0], "name": "Lab", CONF_FAN_ENTITY_ID: "fan.lab"}]
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={"source": config_entries.SOURCE_IMPORT},
+        data={CONF_ZONES: zones},
+    )
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert len(entries) == 1
+    assert entries[0].data[CONF_ZONES] == zones
+
+
 async def test_options_flow(hass: HomeAssistant):
     """Test options flow."""
     from homeassistant.config_entries import ConfigEntry
@@ -214,10 +290,167 @@ async def test_options_flow(hass: HomeAssistant):
 
     assert result["type"] == FlowResultType.CREATE_ENTRY
     assert result["data"] == {
+        CONF_TEMPERATURE_SENSORS: [],
+        CONF_SENSOR_AGGREGATION: DEFAULT_SENSOR_AGGREGATION,
+        CONF_SENSOR_STALE_TIMEOUT: DEFAULT_SENSOR_STALE_TIMEOUT,
         CONF_COOLING_SWITCHES: ["switch.cool2"],
         CONF_HEATING_SWITCHES: ["switch.heat1"],
         CONF_MIN_TEMP: 18.0,
         CONF_MAX_TEMP: 26.0,
         CONF_TARGET_TEMP: 22.0,
         CONF_TEMP_STEP: 0.5,
+        CONF_DEBOUNCE_MODE: DEFAULT_DEBOUNCE_MODE,
+        CONF_DEBOUNCE_INTERVAL: DEFAULT_DEBOUNCE_INTERVAL,
+        CONF_BATCH_WINDOW: DEFAULT_BATCH_WINDOW,
+        CONF_FLEET_ENGINE: DEFAULT_FLEET_ENGINE,
+        CONF_HYSTERESIS: DEFAULT_HYSTERESIS,
+        CONF_MIN_ON_TIME: DEFAULT_MIN_ON_TIME,
+        CONF_MIN_OFF_TIME: DEFAULT_MIN_OFF_TIME,
+        CONF_BAND_THRESHOLDS: DEFAULT_BAND_THRESHOLDS,
+        CONF_SPEED_PERCENTAGES: DEFAULT_SPEED_PERCENTAGES,
+        CONF_TEMP_FILTER: DEFAULT_TEMP_FILTER,
+        CONF_FILTER_ALPHA: DEFAULT_FILTER_ALPHA,
+        CONF_FILTER_WINDOW: DEFAULT_FILTER_WINDOW,
+        CONF_CONTROL_MODE: DEFAULT_CONTROL_MODE,
+        CONF_PID_KP: DEFAULT_PID_KP,
+        CONF_PID_KI: DEFAULT_PID_KI,
+        CONF_PID_KD: DEFAULT_PID_KD,
+        CONF_PID_SAMPLE_INTERVAL: DEFAULT_PID_SAMPLE_INTERVAL,
+        CONF_RESYNC_INTERVAL: DEFAULT_RESYNC_INTERVAL,
+        CONF_SCHEDULE: {"weekly": [], "exceptions": []},
+    }
+
+
+async def test_options_flow_debounce(hass: HomeAssistant):
+    """Test options flow stores the debounce settings."""
+    from homeassistant.config_entries import ConfigEntry
+
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Test",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temp",
+            CONF_FAN_ENTITY_ID: "fan.test",
+        },
+        options={},
+        source="user",
+        entry_id="test_entry",
+        unique_id="test_unique",
+        discovery_keys={},
+    )
+
+    hass.config_entries._entries[entry.entry_id] = entry
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_DEBOUNCE_MODE: "trailing",
+            CONF_DEBOUNCE_INTERVAL: 30,
+        },
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_DEBOUNCE_MODE] == "trailing"
+    assert result["data"][CONF_DEBOUNCE_INTERVAL] == 30.0
+
+
+async def test_options_flow_speed_table(hass: HomeAssistant):
+    """Test options flow compiles the band table and rejects a bad one."""
+    from homeassistant.config_entries import ConfigEntry
+
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Test",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temp",
+            CONF_FAN_ENTITY_ID: "fan.test",
+        },
+        options={},
+        source="user",
+        entry_id="test_entry",
+        unique_id="test_unique",
+        discovery_keys={},
+    )
+
+    hass.config_entries._entries[entry.entry_id] = entry
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_BAND_THRESHOLDS: "0.5, 1.5, 1.0",
+            CONF_SPEED_PERCENTAGES: "50, 100",
+        },
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_speed_table"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_BAND_THRESHOLDS: "0.5, 1, 2, 3",
+            CONF_SPEED_PERCENTAGES: "25, 50, 75, 100",
+        },
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_BAND_THRESHOLDS] == [0.5, 1.0, 2.0, 3.0]
+    assert result["data"][CONF_SPEED_PERCENTAGES] == [25, 50, 75, 100]
+
+
+async def test_options_flow_schedule(hass: HomeAssistant):
+    """Test options flow normalizes the schedule and rejects a bad one."""
+    from homeassistant.config_entries import ConfigEntry
+
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Test",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temp",
+            CONF_FAN_ENTITY_ID: "fan.test",
+        },
+        options={},
+        source="user",
+        entry_id="test_entry",
+        unique_id="test_unique",
+        discovery_keys={},
+    )
+
+    hass.config_entries._entries[entry.entry_id] = entry
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_SCHEDULE: {
+                "weekly": [{"days": "mon", "at": "25:00", "temperature": 21}]
+            },
+        },
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_schedule"}
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_SCHEDULE: {
+                "weekly": [{"days": "mon", "at": "6:30", "temperature": 21}],
+                "exceptions": [{"date": "2026-12-25", "at": "0:00", "temperature": 18}],
+            },
+        },
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_SCHEDULE] == {
+        "weekly": [{"days": ["mon"], "at": "06:30:00", "temperature": 21.0}],
+        "exceptions": [{"date": "2026-12-25", "at": "00:00:00", "temperature": 18.0}],
     }
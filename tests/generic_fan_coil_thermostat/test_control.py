@@ -0,0 +1,173 @@
+"""Test the Generic Fan Coil Thermostat control building blocks."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.generic_fan_coil_thermostat.control import (
+    BandStateMachine,
+    DwellTimer,
+    PidController,
+    SpeedTable,
+)
+
+THRESHOLDS = (0.5, 1.5, 2.5)
+
+
+def test_speed_table_names_modes_by_speed_count():
+    """Test 1-3 speed fans get named modes and larger ones numbered modes."""
+    assert SpeedTable(THRESHOLDS, (33, 66, 100)).modes == (
+        "off",
+        "low",
+        "medium",
+        "high",
+    )
+    assert SpeedTable((0.5, 2.0), (50, 100)).modes == ("off", "low", "high")
+
+    table = SpeedTable((0.5, 1.0, 1.5, 2.0, 2.5, 3.0), range(15, 105, 15))
+    assert table.modes[1:] == tuple(f"speed_{speed}" for speed in range(1, 7))
+    assert table.percentage("speed_4") == 60
+    assert table.percentage("medium") is None
+    assert len(table) == 6
+
+
+def test_speed_table_nearest_mode():
+    """Test reported percentages map to the closest configured speed."""
+    table = SpeedTable(THRESHOLDS, (33, 66, 100))
+
+    assert table.nearest_mode(25) == "low"
+    assert table.nearest_mode(33) == "low"
+    assert table.nearest_mode(75) == "medium"
+    assert table.nearest_mode(90) == "high"
+    assert table.nearest_mode(0) is None
+    assert table.nearest_mode(None) is None
+
+
+@pytest.mark.parametrize(
+    ("thresholds", "percentages"),
+    [
+        ((), ()),
+        ((0.5, 1.5), (50,)),
+        ((0.5, 0.5), (50, 100)),
+        ((-0.5, 1.0), (50, 100)),
+        ((0.5, 1.5), (100, 50)),
+        ((0.5, 1.5), (50, 120)),
+        (("low", 1.5), (50, 100)),
+    ],
+)
+def test_speed_table_rejects_inconsistent_tables(thresholds, percentages):
+    """Test a table that cannot be looked up is rejected."""
+    with pytest.raises(ValueError):
+        SpeedTable(thresholds, percentages)
+
+
+def test_bands_without_hysteresis_follow_thresholds():
+    """Test the level tracks the on thresholds when hysteresis is off."""
+    bands = BandStateMachine(THRESHOLDS)
+
+    assert bands.next_level(0, 0.4) == 0
+    assert bands.next_level(0, 0.5) == 1
+    assert bands.next_level(1, 1.5) == 2
+    assert bands.next_level(0, 3.0) == 3
+    assert bands.next_level(3, 0.49) == 0
+
+
+def test_bands_hold_level_inside_hysteresis():
+    """Test a demand hovering around a band edge does not change the level."""
+    bands = BandStateMachine(THRESHOLDS, hysteresis=0.2)
+
+    level = 0
+    for demand in (0.45, 0.5, 0.45, 0.35, 0.49, 0.31):
+        level = bands.next_level(level, demand)
+    assert level == 1
+
+    assert bands.next_level(1, 0.29) == 0
+    assert bands.next_level(2, 1.35) == 2
+    assert bands.next_level(2, 1.2) == 1
+    assert bands.next_level(3, 0.1) == 0
+
+
+def test_dwell_timer_holds_recent_changes():
+    """Test an output may not switch again before its dwell time has passed."""
+    timer = DwellTimer(min_on=300, min_off=120)
+    now = dt_util.utcnow()
+
+    # Nothing commanded yet, any state may be applied
+    assert timer.remaining(True, now) == 0
+
+    timer.mark(True, now)
+    assert timer.remaining(True, now) == 0
+    assert timer.remaining(False, now + timedelta(seconds=100)) == 200
+    assert timer.remaining(False, now + timedelta(seconds=300)) == 0
+
+    off_at = now + timedelta(seconds=300)
+    timer.mark(False, off_at)
+    assert timer.remaining(True, off_at + timedelta(seconds=60)) == 60
+
+    # Marking the same state again does not restart the timer
+    timer.mark(False, off_at + timedelta(seconds=60))
+    assert timer.remaining(True, off_at + timedelta(seconds=120)) == 0
+
+
+def test_dwell_timer_and_pid_resume_from_stored_state():
+    """Test dwell timers and the PID controller survive a round trip."""
+    now = dt_util.utcnow()
+    timer = DwellTimer(min_on=300, min_off=120)
+    timer.mark(True, now)
+    restored = DwellTimer(min_on=300, min_off=120)
+    restored.restore(timer.as_dict())
+    assert restored.remaining(False, now + timedelta(seconds=100)) == 200
+
+    # A timer that never switched stores nothing to restore
+    restored = DwellTimer(min_on=300, min_off=120)
+    restored.restore(DwellTimer(300, 120).as_dict())
+    assert restored.is_on is None
+
+    pid = PidController(kp=1.0, ki=0.01, kd=0.0, output_max=3)
+    pid.update(1.0, 23.0, 60)
+    restored = PidController(kp=1.0, ki=0.01, kd=0.0, output_max=2)
+    restored.restore({**pid.as_dict(), "integral": 5.0})
+    assert restored.integral == 2
+    assert restored.output == pytest.approx(1.6)
+
+
+def test_pid_quantizes_output_to_fan_levels():
+    """Test the output is limited to the fan's levels and rounded to one."""
+    pid = PidController(kp=1.0, ki=0.0, kd=0.0, output_max=3)
+
+    assert pid.update(0.4, 22.4, 60) == pytest.approx(0.4)
+    assert pid.level() == 0
+    pid.update(1.6, 23.6, 60)
+    assert pid.level() == 2
+    assert pid.update(10.0, 32.0, 60) == 3
+    assert pid.level() == 3
+
+
+def test_pid_integral_does_not_wind_up():
+    """Test the integral stops growing while the output is saturated."""
+    pid = PidController(kp=1.0, ki=0.01, kd=0.0, output_max=3)
+
+    for _ in range(100):
+        pid.update(5.0, 27.0, 60)
+    assert pid.output == 3
+    assert pid.integral < 3
+
+    # Once the demand is met the integral alone cannot hold full speed
+    pid.update(0.0, 22.0, 60)
+    assert pid.output < 3
+
+
+def test_pid_derivative_ignores_setpoint_changes():
+    """Test the derivative follows the measurement, not the error."""
+    pid = PidController(kp=0.0, ki=0.0, kd=100.0, output_max=3)
+
+    pid.update(0.0, 22.0, 60)
+    # The setpoint dropped by 2 °C, the room did not change
+    assert pid.update(2.0, 22.0, 60) == 0
+
+    # The room warms up, the filtered derivative pushes the output up
+    assert pid.update(2.0, 23.2, 60) == pytest.approx(1.0)
+
+    pid.reset()
+    assert pid.update(2.0, 30.0, 60) == 0
@@ -0,0 +1,89 @@
+"""Test the Generic Fan Coil Thermostat state-change coordinator."""
+
+from unittest.mock import patch
+
+from homeassistant.const import STATE_OFF
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.generic_fan_coil_thermostat import coordinator
+from custom_components.generic_fan_coil_thermostat.const import (
+    CONF_CURRENT_TEMPERATURE_ENTITY_ID,
+    CONF_FAN_ENTITY_ID,
+    DATA_COORDINATOR,
+    DOMAIN,
+)
+
+
+async def _setup_shared_sensor_zones(hass: HomeAssistant):
+    """Set up two thermostats that read the same temperature sensor."""
+    entries = []
+    for fan in ("fan.zone_1", "fan.zone_2"):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"Thermostat {fan}",
+            data={
+                CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+                CONF_FAN_ENTITY_ID: fan,
+            },
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+        hass.states.async_set(fan, STATE_OFF)
+
+    hass.states.async_set("sensor.temperature", "20")
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    return entries
+
+
+async def test_shared_sensor_subscribed_once(hass: HomeAssistant):
+    """Test a sensor shared by two zones is subscribed and parsed once."""
+    await _setup_shared_sensor_zones(hass)
+
+    shared = hass.data[DOMAIN][DATA_COORDINATOR]
+    # One subscription for the sensor and one for each fan
+    assert shared.subscriptions == 3
+
+    with patch.object(
+        coordinator, "parse_temperature", wraps=coordinator.parse_temperature
+    ) as parse:
+        hass.states.async_set("sensor.temperature", "25")
+        await hass.async_block_till_done()
+
+    assert parse.call_count == 1
+    for entity_id in (
+        "climate.generic_fan_coil_thermostat",
+        "climate.generic_fan_coil_thermostat_2",
+    ):
+        state = hass.states.get(entity_id)
+        assert state.attributes["current_temperature"] == 25.0
+
+
+async def test_unload_releases_subscriptions(hass: HomeAssistant):
+    """Test the sensor subscription is kept until its last zone unloads."""
+    entries = await _setup_shared_sensor_zones(hass)
+    shared = hass.data[DOMAIN][DATA_COORDINATOR]
+
+    assert await hass.config_entries.async_unload(entries[0].entry_id)
+    await hass.async_block_till_done()
+    assert shared.subscriptions == 2
+
+    assert await hass.config_entries.async_unload(entries[1].entry_id)
+    await hass.async_block_till_done()
+    assert shared.subscriptions == 0
+
+
+async def test_unavailable_sensor_is_ignored(hass: HomeAssistant):
+    """Test unavailable or invalid sensor states leave the temperature as is."""
+    await _setup_shared_sensor_zones(hass)
+
+    hass.states.async_set("sensor.temperature", "unavailable")
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.temperature", "not a number")
+    await hass.async_block_till_done()
+
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["current_temperature"] == 20.0
@@ -0,0 +1,123 @@
+"""Test the Generic Fan Coil Thermostat diagnostics."""
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_mock_service,
+)
+
+from custom_components.generic_fan_coil_thermostat.const import (
+    CONF_COOLING_SWITCHES,
+    CONF_CURRENT_TEMPERATURE_ENTITY_ID,
+    CONF_FAN_ENTITY_ID,
+    DECISION_TRACE_SIZE,
+    DOMAIN,
+)
+from custom_components.generic_fan_coil_thermostat.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+async def test_diagnostics_decision_trace(hass: HomeAssistant):
+    """Test control decisions and their commands are traced."""
+    async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "turn_off")
+    async_mock_service(hass, "fan", "set_percentage")
+    async_mock_service(hass, "switch", "turn_on")
+    async_mock_service(hass, "switch", "turn_off")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.cool1"],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "23")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    hass.states.async_set("switch.cool1", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    # The devices follow, so the next decision skips its commands
+    hass.states.async_set("fan.test_fan", STATE_ON, {"percentage": 33})
+    hass.states.async_set("switch.cool1", STATE_ON)
+    hass.states.async_set("sensor.temperature", "23.1")
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    thermostat = diagnostics["thermostats"]["climate.generic_fan_coil_thermostat"]
+    first, second = thermostat["decisions"]
+
+    assert first["temperature"] == 23.0
+    assert first["diff"] == 1.0
+    assert first["level"] == 1
+    assert first["fan"] == "low"
+    assert first["switches"] == "cooling:on"
+    assert sorted(first["sent"]) == ["cooling:on", "fan:low"]
+    assert first["skipped"] == []
+
+    assert second["temperature"] == 23.1
+    assert second["sent"] == []
+    assert sorted(second["skipped"]) == ["cooling:on", "fan:low"]
+
+
+async def test_decision_trace_is_bounded(hass: HomeAssistant):
+    """Test the decision trace keeps a fixed number of entries."""
+    async_mock_service(hass, "fan", "turn_off")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "20")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+
+    for step in range(DECISION_TRACE_SIZE + 10):
+        hass.states.async_set("sensor.temperature", str(20 + step / 100))
+        await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    decisions = diagnostics["thermostats"]["climate.generic_fan_coil_thermostat"][
+        "decisions"
+    ]
+    assert len(decisions) == DECISION_TRACE_SIZE
+    assert decisions[-1]["temperature"] == 20 + (DECISION_TRACE_SIZE + 9) / 100
@@ -0,0 +1,152 @@
+"""Test the Generic Fan Coil Thermostat fleet control engine."""
+
+from datetime import timedelta
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.const import STATE_OFF
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.generic_fan_coil_thermostat.const import (
+    CONF_CURRENT_TEMPERATURE_ENTITY_ID,
+    CONF_DEBOUNCE_INTERVAL,
+    CONF_DEBOUNCE_MODE,
+    CONF_FAN_ENTITY_ID,
+    CONF_FLEET_ENGINE,
+    DOMAIN,
+)
+from custom_components.generic_fan_coil_thermostat.engine import FleetControlEngine
+
+
+def test_levels_match_threshold_bands():
+    """Test cooling and heating demands map onto the threshold bands."""
+    engine = FleetControlEngine()
+    cases = [
+        ("cool_idle", 22.4, HVACMode.COOL, 0),
+        ("cool_low", 22.5, HVACMode.COOL, 1),
+        ("cool_medium", 23.5, HVACMode.COOL, 2),
+        ("cool_high", 24.5, HVACMode.COOL, 3),
+        ("heat_idle", 21.6, HVACMode.HEAT, 0),
+        ("heat_low", 21.0, HVACMode.HEAT, 1),
+        ("heat_high", 18.0, HVACMode.HEAT, 3),
+    ]
+    for zone_id, current, mode, _level in cases:
+        engine.add_zone(zone_id)
+        engine.update_zone(zone_id, current, 22.0, mode, 0)
+
+    changed = dict(engine.evaluate())
+
+    assert changed == {zone_id: level for zone_id, *_, level in cases if level}
+
+
+def test_only_deltas_are_returned():
+    """Test zones already at their level, off or without data are skipped."""
+    engine = FleetControlEngine()
+    engine.add_zone("applied")
+    engine.update_zone("applied", 24.0, 22.0, HVACMode.COOL, 2)
+    engine.add_zone("off")
+    engine.update_zone("off", 30.0, 22.0, HVACMode.OFF, 0)
+    engine.add_zone("unknown")
+    engine.update_zone("unknown", None, 22.0, HVACMode.COOL, 0)
+
+    assert engine.evaluate() == []
+
+    engine.update_zone("applied", 25.0, 22.0, HVACMode.COOL, 2)
+    assert engine.evaluate() == [("applied", 3)]
+    assert engine.evaluate() == []
+
+
+def test_slots_grow_and_are_reused():
+    """Test the arrays grow past capacity and freed slots are reused."""
+    engine = FleetControlEngine(capacity=2)
+    for zone in range(5):
+        engine.add_zone(zone)
+        engine.update_zone(zone, 25.0, 22.0, HVACMode.COOL, 0)
+
+    assert len(engine) == 5
+    assert len(engine.evaluate()) == 5
+
+    engine.remove_zone(1)
+    assert engine.add_zone("new") == 1
+    assert len(engine) == 5
+
+
+async def test_sweep_applies_pending_changes(hass: HomeAssistant):
+    """Test the periodic sweep applies a level the event path has not yet."""
+    percentages = async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "turn_off")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+        },
+        options={
+            CONF_FLEET_ENGINE: True,
+            CONF_DEBOUNCE_MODE: "trailing",
+            CONF_DEBOUNCE_INTERVAL: 600,
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "20")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+
+    # The debounce holds this update back, the sweep should not
+    hass.states.async_set("sensor.temperature", "25")
+    await hass.async_block_till_done()
+    assert percentages == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=61))
+    await hass.async_block_till_done()
+
+    assert len(percentages) == 1
+    assert percentages[0].data["percentage"] == 100
+
+
+def test_hysteresis_holds_band_until_off_threshold():
+    """Test a zone keeps its band until demand drops below the off threshold."""
+    engine = FleetControlEngine()
+    engine.add_zone("zone")
+    engine.update_zone("zone", 22.4, 22.0, HVACMode.COOL, 1, hysteresis=0.2)
+
+    assert engine.evaluate() == []
+
+    engine.update_zone("zone", 22.25, 22.0, HVACMode.COOL, 1, hysteresis=0.2)
+    assert engine.evaluate() == [("zone", 0)]
+
+    engine.update_zone("zone", 22.45, 22.0, HVACMode.COOL, 0, hysteresis=0.2)
+    assert engine.evaluate() == []
+
+
+def test_zones_with_different_speed_counts_share_a_pass():
+    """Test the threshold matrix widens for a fan with more speeds."""
+    engine = FleetControlEngine()
+    engine.add_zone("three")
+    engine.add_zone("two", (1.0, 2.0))
+    engine.add_zone("five", (0.5, 1.0, 1.5, 2.0, 2.5))
+    for zone_id in ("three", "two", "five"):
+        engine.update_zone(zone_id, 23.6, 22.0, HVACMode.COOL, 0)
+
+    assert dict(engine.evaluate()) == {"three": 2, "two": 1, "five": 3}
@@ -0,0 +1,69 @@
+"""Test the Generic Fan Coil Thermostat temperature filters."""
+
+import pytest
+
+from custom_components.generic_fan_coil_thermostat.filters import (
+    EmaFilter,
+    MedianFilter,
+    create_filter,
+)
+
+
+def test_ema_filter_smooths_readings():
+    """Test the moving average starts at the first reading and follows slowly."""
+    ema = EmaFilter(0.5)
+
+    assert ema.update(22.0) == 22.0
+    assert ema.update(23.0) == 22.5
+    assert ema.update(23.0) == 22.75
+
+    ema.reset()
+    assert ema.update(20.0) == 20.0
+
+
+def test_median_filter_drops_outliers():
+    """Test a single spike inside the window does not move the median."""
+    median = MedianFilter(3)
+
+    assert median.update(22.0) == 22.0
+    assert median.update(22.4) == pytest.approx(22.2)
+    assert median.update(30.0) == 22.4
+    assert median.update(22.2) == 22.4
+    assert median.update(22.1) == 22.2
+
+    median.reset()
+    assert median.update(21.0) == 21.0
+
+
+def test_filters_resume_from_stored_state():
+    """Test a restored filter continues where the stored one left off."""
+    ema = EmaFilter(0.5)
+    for reading in (22.0, 23.0):
+        ema.update(reading)
+    restored = EmaFilter(0.5)
+    restored.restore(ema.as_dict())
+    assert restored.update(23.0) == ema.update(23.0)
+
+    median = MedianFilter(3)
+    for reading in (22.0, 30.0, 22.4):
+        median.update(reading)
+    restored = MedianFilter(3)
+    restored.restore(median.as_dict())
+    assert restored.update(22.2) == median.update(22.2) == 22.4
+
+    # A smaller window keeps only the newest readings
+    smaller = MedianFilter(1)
+    smaller.restore(median.as_dict())
+    assert smaller.value == 22.2
+
+
+def test_create_filter():
+    """Test the configured mode picks the filter."""
+    assert create_filter("off", 0.3, 5) is None
+    assert isinstance(create_filter("ema", 0.3, 5), EmaFilter)
+    assert isinstance(create_filter("median", 0.3, 5), MedianFilter)
+
+    with pytest.raises(ValueError):
+        EmaFilter(0)
+    with pytest.raises(ValueError):
+        MedianFilter(0)
@@ -1,5 +1,7 @@
 """Test the Generic Fan Coil Thermostat component setup."""
 
+from unittest.mock import patch
+
 from homeassistant.core import HomeAssistant
 from homeassistant.const import STATE_ON
 from homeassistant.setup import async_setup_component
@@ -99,7 +101,37 @@ async def test_async_unload_entry(hass: HomeAssistant):
 
 
 async def test_async_update_options(hass: HomeAssistant):
-    """Test updating options triggers reload."""
+    """Test limits and thresholds are applied without reloading the entry."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            "current_temperature_entity_id": "sensor.temp",
+            "fan_entity_id": "fan.test",
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temp", "20")
+    hass.states.async_set("fan.test", STATE_ON)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    with patch.object(hass.config_entries, "async_reload") as reload:
+        hass.config_entries.async_update_entry(
+            entry, options={"min_temp": 18.0, "temp_step": 1.0, "hysteresis": 0.2}
+        )
+        await hass.async_block_till_done()
+
+    reload.assert_not_called()
+    state = hass.states.get("climate.generic_fan_coil_thermostat")
+    assert state.attributes["min_temp"] == 18.0
+    assert state.attributes["target_temp_step"] == 1.0
+
+
+async def test_async_update_options_reloads_when_needed(hass: HomeAssistant):
+    """Test options the running thermostat cannot pick up reload the entry."""
     entry = MockConfigEntry(
         domain=DOMAIN,
         title="Test Thermostat",
@@ -116,6 +148,71 @@ async def test_async_update_options(hass: HomeAssistant):
     assert await async_setup_component(hass, DOMAIN, {})
     await hass.async_block_till_done()
 
-    # Update options should trigger reload
-    await async_update_options(hass, entry)
+    # Nothing changed, nothing to do
+    with patch.object(hass.config_entries, "async_reload") as reload:
+        await async_update_options(hass, entry)
+    reload.assert_not_called()
+
+    with patch.object(hass.config_entries, "async_reload") as reload:
+        hass.config_entries.async_update_entry(
+            entry, options={"debounce_mode": "trailing"}
+        )
+        await hass.async_block_till_done()
+
+    reload.assert_called_once_with(entry.entry_id)
+
+    # A different number of speeds or a new switch group needs new sensors
+    for options in (
+        {
+            "band_thresholds": [0.5, 1.0, 1.5, 2.0],
+            "speed_percentages": [25, 50, 75, 100],
+        },
+        {"cooling_switches": ["switch.cool1"]},
+    ):
+        with patch.object(hass.config_entries, "async_reload") as reload:
+            hass.config_entries.async_update_entry(entry, options=options)
+            await hass.async_block_till_done()
+
+        reload.assert_called_once_with(entry.entry_id)
+
+
+async def test_yaml_zones_share_one_entry(hass: HomeAssistant):
+    """Test zones listed in YAML are set up as one entry with many thermostats."""
+    hass.states.async_set("sensor.office", "20")
+    hass.states.async_set("sensor.lab", "21")
+    hass.states.async_set("fan.office", STATE_ON)
+    hass.states.async_set("fan.lab", STATE_ON)
+
+    assert await async_setup_component(
+        hass,
+        DOMAIN,
+        {
+            DOMAIN: {
+                "zones": [
+                    {
+                        "name": "Office",
+                        "current_temperature_entity_id": "sensor.office",
+                        "fan_entity_id": "fan.office",
+                        "max_temp": 26,
+                    },
+                    {
+                        "name": "Lab",
+                        "current_temperature_entity_id": "sensor.lab",
+                        "fan_entity_id": "fan.lab",
+                        "cooling_switches": ["switch.lab_valve"],
+                    },
+                ]
+            }
+        },
+    )
     await hass.async_block_till_done()
+
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert len(entries) == 1
+
+    office = hass.states.get("climate.office")
+    lab = hass.states.get("climate.lab")
+    assert office.attributes["max_temp"] == 26
+    assert office.attributes["current_temperature"] == 20
+    assert lab.attributes["max_temp"] == 30
+    assert lab.attributes["hvac_modes"] == ["off", "cool"]
@@ -0,0 +1,83 @@
+"""Test the offline trace replay benchmark harness."""
+
+import json
+
+from homeassistant.components.climate import HVACMode
+
+from scripts.replay_benchmark import async_replay, load_trace, main
+
+
+def _write_trace(path, temperatures, step=60):
+    """Write a CSV trace with one sample every step seconds."""
+    lines = ["timestamp,temperature"]
+    lines.extend(
+        f"{index * step},{temperature}"
+        for index, temperature in enumerate(temperatures)
+    )
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_load_json_trace(tmp_path):
+    """Test JSON traces with ISO timestamps are loaded in time order."""
+    trace = tmp_path / "trace.json"
+    trace.write_text(
+        json.dumps(
+            [
+                {"timestamp": "2024-01-01T00:01:00+00:00", "temperature": 23.0},
+                {
+                    "timestamp": "2024-01-01T00:00:00+00:00",
+                    "temperature": 22.0,
+                    "target": 21.5,
+                },
+            ]
+        )
+    )
+
+    samples = load_trace(trace)
+
+    assert [sample[1:] for sample in samples] == [(22.0, 21.5), (23.0, None)]
+    assert samples[1][0] - samples[0][0] == 60
+
+
+async def test_replay_counts_calls(tmp_path):
+    """Test a replay counts evaluations and calls per service."""
+    # One hour: idle, then low band, then back to idle
+    trace = _write_trace(
+        tmp_path / "trace.csv", [22.0] * 20 + [23.0] * 20 + [22.0] * 21
+    )
+
+    report = await async_replay(load_trace(trace), hvac_mode=HVACMode.COOL)
+
+    assert report.samples == 61
+    assert report.simulated_hours == 1.0
+    assert report.calls_by_service == {
+        "fan.turn_off": 2,
+        "switch.turn_off": 2,
+        "fan.turn_on": 1,
+        "switch.turn_on": 1,
+    }
+    assert report.calls_per_hour == 6.0
+    assert report.latency_percentile(50) <= report.latency_percentile(99)
+
+
+async def test_steady_trace_stays_quiet(tmp_path):
+    """Test a flat trace does not re-send commands on every sample."""
+    trace = _write_trace(tmp_path / "trace.csv", [24.0] * 600, step=10)
+
+    report = await async_replay(load_trace(trace), switches=4)
+
+    # One fan speed change and one switch call, whatever the sample count
+    assert report.service_calls == 2
+    assert report.skipped_commands > 0
+
+
+def test_cli_prints_json(tmp_path, capsys):
+    """Test the command line entry point."""
+    trace = _write_trace(tmp_path / "trace.csv", [20.0, 20.0, 21.0])
+
+    main([str(trace), "--mode", "heat", "--json"])
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["samples"] == 3
+    assert report["calls_by_service"]["switch.turn_on"] == 1
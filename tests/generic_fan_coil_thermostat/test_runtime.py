@@ -0,0 +1,36 @@
+"""Test the Generic Fan Coil Thermostat runtime accounting."""
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.generic_fan_coil_thermostat.runtime import RuntimeMeter
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_runtime_meter_integrates_running_keys():
+    """Test totals grow only while a key is running."""
+    meter = RuntimeMeter()
+
+    meter.update({"low", "cooling"}, START)
+    meter.update({"high", "cooling"}, START + timedelta(seconds=60))
+    assert meter.total("low", START + timedelta(seconds=600)) == 60
+    assert meter.total("high", START + timedelta(seconds=600)) == 540
+    assert meter.total("cooling", START + timedelta(seconds=600)) == 600
+
+    meter.update(set(), START + timedelta(seconds=600))
+    assert meter.total("cooling", START + timedelta(seconds=900)) == 600
+    assert meter.total("heating", START + timedelta(seconds=900)) == 0
+
+
+def test_runtime_meter_round_trip():
+    """Test stored totals resume without counting the time in between."""
+    meter = RuntimeMeter()
+    meter.update({"low"}, START)
+    stored = meter.as_dict(START + timedelta(seconds=120))
+
+    restored = RuntimeMeter()
+    restored.restore(stored)
+    assert restored.total("low", START + timedelta(hours=1)) == 120
+
+    restored.update({"low"}, START + timedelta(hours=1))
+    assert restored.total("low", START + timedelta(hours=1, seconds=30)) == 150
@@ -0,0 +1,88 @@
+"""Test the Generic Fan Coil Thermostat setpoint schedule."""
+
+from datetime import date, datetime, time, timezone
+
+import pytest
+import voluptuous as vol
+
+from custom_components.generic_fan_coil_thermostat.schedule import (
+    SCHEDULE_SCHEMA,
+    SetpointSchedule,
+)
+
+# A Monday
+MONDAY = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+def test_schedule_current_and_next():
+    """Test the setpoint in effect and the next transition follow the week."""
+    schedule = SetpointSchedule(
+        weekly={
+            0: [(time(22, 0), 18.0), (time(6, 30), 21.0)],
+            4: [(time(23, 0), 17.0)],
+        }
+    )
+
+    now = MONDAY.replace(hour=6)
+    # Friday's transition carries over the weekend
+    assert schedule.current(now) == (
+        datetime(2026, 10, 16, 23, tzinfo=timezone.utc),
+        17.0,
+    )
+    assert schedule.next_transition(now) == (MONDAY.replace(hour=6, minute=30), 21.0)
+
+    # A transition exactly at now is in effect and not next
+    now = MONDAY.replace(hour=22)
+    assert schedule.current(now) == (now, 18.0)
+    assert schedule.next_transition(now) == (
+        datetime(2026, 10, 23, 23, tzinfo=timezone.utc),
+        17.0,
+    )
+
+
+def test_schedule_exceptions_replace_the_day():
+    """Test a dated exception replaces that day's weekly transitions."""
+    schedule = SetpointSchedule(
+        weekly={day: [(time(7, 0), 21.0)] for day in range(7)},
+        exceptions={date(2026, 10, 20): [(time(9, 0), 19.0)]},
+    )
+
+    now = MONDAY.replace(hour=8)
+    assert schedule.next_transition(now) == (
+        datetime(2026, 10, 20, 9, tzinfo=timezone.utc),
+        19.0,
+    )
+    assert schedule.current(datetime(2026, 10, 20, 8, tzinfo=timezone.utc))[1] == 21.0
+
+
+def test_schedule_with_only_exceptions():
+    """Test exceptions far from now are still found."""
+    schedule = SetpointSchedule(
+        exceptions={
+            date(2026, 1, 1): [(time(0, 0), 16.0)],
+            date(2027, 1, 1): [(time(0, 0), 20.0)],
+        }
+    )
+
+    assert schedule.current(MONDAY)[1] == 16.0
+    assert schedule.next_transition(MONDAY)[1] == 20.0
+    assert not SetpointSchedule()
+    assert SetpointSchedule().next_transition(MONDAY) is None
+
+
+def test_schedule_from_config():
+    """Test a validated configuration compiles to the same transitions."""
+    config = SCHEDULE_SCHEMA(
+        {
+            "weekly": [{"days": ["mon", "fri"], "at": "6:30", "temperature": 21}],
+            "exceptions": [{"date": "2026-10-20", "at": "9:00", "temperature": 19}],
+        }
+    )
+
+    assert SetpointSchedule.from_config(config) == SetpointSchedule(
+        weekly={0: [(time(6, 30), 21.0)], 4: [(time(6, 30), 21.0)]},
+        exceptions={date(2026, 10, 20): [(time(9, 0), 19.0)]},
+    )
+
+    with pytest.raises(vol.Invalid):
+        SCHEDULE_SCHEMA({"weekly": [{"days": ["mo"], "at": "6:30", "temperature": 21}]})
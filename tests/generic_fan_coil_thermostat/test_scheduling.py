@@ -0,0 +1,68 @@
+"""Test the Generic Fan Coil Thermostat fleet scheduling helpers."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.generic_fan_coil_thermostat.scheduling import (
+    StaggeredRelease,
+    phase_offset,
+    seconds_until_slot,
+)
+
+
+def test_phase_offset_is_stable_and_spread():
+    """Test offsets repeat per key and spread a fleet across the period."""
+    assert phase_offset("zone_1", 300) == phase_offset("zone_1", 300)
+
+    offsets = [phase_offset(f"zone_{index}", 300) for index in range(200)]
+    assert all(0 <= offset < 300 for offset in offsets)
+
+    # Every tenth of the period gets some of the zones
+    buckets = {int(offset // 30) for offset in offsets}
+    assert buckets == set(range(10))
+
+
+def test_seconds_until_slot_aligns_to_epoch():
+    """Test the next slot does not depend on when the wait starts."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    assert seconds_until_slot(start, 60, 15) == pytest.approx(15)
+    assert seconds_until_slot(start + timedelta(seconds=10), 60, 15) == (
+        pytest.approx(5)
+    )
+    assert seconds_until_slot(start + timedelta(seconds=15), 60, 15) == (
+        pytest.approx(60)
+    )
+    assert seconds_until_slot(start + timedelta(seconds=20), 60, 15) == (
+        pytest.approx(55)
+    )
+
+
+async def test_staggered_release_runs_groups_per_slot(hass: HomeAssistant, freezer):
+    """Test queued actions run a group at a time, one slot apart."""
+    stagger = StaggeredRelease(hass, 2, 1.0)
+    ran = []
+
+    cancels = [
+        stagger.async_schedule(lambda index=index: ran.append(index))
+        for index in range(5)
+    ]
+    assert ran == [0, 1]
+
+    # A cancelled action gives up its place
+    cancels[3]()
+
+    freezer.tick(timedelta(seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert ran == [0, 1, 2, 4]
+
+    # Once the queue has drained, the next action runs straight away
+    freezer.tick(timedelta(seconds=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    stagger.async_schedule(lambda: ran.append(5))
+    assert ran == [0, 1, 2, 4, 5]
@@ -0,0 +1,75 @@
+"""Test the Generic Fan Coil Thermostat runtime sensors."""
+
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.const import STATE_OFF
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+
+from custom_components.generic_fan_coil_thermostat.const import (
+    CONF_COOLING_SWITCHES,
+    CONF_CURRENT_TEMPERATURE_ENTITY_ID,
+    CONF_FAN_ENTITY_ID,
+    DOMAIN,
+)
+
+
+async def test_runtime_sensors_count_speed_and_group(hass: HomeAssistant, freezer):
+    """Test the runtime of the running fan speed and switch group is reported."""
+    async_mock_service(hass, "fan", "turn_on")
+    async_mock_service(hass, "fan", "turn_off")
+    async_mock_service(hass, "fan", "set_percentage")
+    async_mock_service(hass, "switch", "turn_on")
+    async_mock_service(hass, "switch", "turn_off")
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Test Thermostat",
+        data={
+            CONF_CURRENT_TEMPERATURE_ENTITY_ID: "sensor.temperature",
+            CONF_FAN_ENTITY_ID: "fan.test_fan",
+            CONF_COOLING_SWITCHES: ["switch.cool1"],
+        },
+    )
+    entry.add_to_hass(hass)
+
+    hass.states.async_set("sensor.temperature", "22.6")
+    hass.states.async_set("fan.test_fan", STATE_OFF)
+    hass.states.async_set("switch.cool1", STATE_OFF)
+
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.generic_fan_coil_thermostat_low_runtime")
+    assert state.state == "0.0"
+    assert state.attributes["state_class"] == "total_increasing"
+
+    await hass.services.async_call(
+        "climate",
+        "set_hvac_mode",
+        {
+            "entity_id": "climate.generic_fan_coil_thermostat",
+            "hvac_mode": HVACMode.COOL,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(minutes=90))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    for key, hours in (("low", 1.5), ("medium", 0), ("high", 0), ("cooling", 1.5)):
+        state = hass.states.get(f"sensor.generic_fan_coil_thermostat_{key}_runtime")
+        assert float(state.state) == pytest.approx(hours, abs=0.01)
+
+    # There are no heating switches to count
+    assert hass.states.get("sensor.generic_fan_coil_thermostat_heating_runtime") is None